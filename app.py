@@ -16,21 +16,24 @@ from interface import (
     ir_para_historico,
     voltar_tela_inicial,
     exibir_contas_mes,
-    inicializar_sessao
+    avisar_dados_desatualizados,
+    editar_ajustes_periodo,
+    exibir_painel_perfil,
+    inicializar_sessao,
+    prefetch_meses_vizinhos,
+    seletor_qualidade_pdf,
 )
 
-
-from relatorio import (
-    gerar_grafico_comparativo_linha,
-    carregar_dados_conta_periodo,
-    gerar_pdf_comparativo_conta,
-    gerar_relatorio_periodo_pdf,
-)
+# Funções de relatório carregadas sob demanda (matplotlib/fpdf só no primeiro uso)
+import relatorio
 
 from supabase import (
+    PRAZO_EXPORTACAO_SEGUNDOS,
     carregar_tabela,
-    get_nomes_conta_unicos,
-    get_anos_meses_disponiveis
+    definir_tela,
+    gravar_metricas_prometheus,
+    iniciar_prazo,
+    prazo,
 )
 
 from estilo import aplicar_estilo_mockup, set_background
@@ -47,6 +50,18 @@ st.set_page_config(page_title="Controle de Contas", page_icon="💸", layout="wi
 
 inicializar_sessao()
 
+# Orçamento de tempo das requisições ao Supabase neste rerun (ver supabase_prazo.py):
+# passado o prazo, as telas usam o cache em vez de ficarem esperando
+iniciar_prazo()
+
+# Métricas das requisições deste rerun atribuídas à tela aberta (ver supabase_metricas.py);
+# com SUPABASE_METRICAS_PROMETHEUS definido, grava as métricas acumuladas até o rerun anterior
+definir_tela(st.session_state["tela_atual"])
+gravar_metricas_prometheus()
+
+# Perfil por etapa dos relatórios gerados neste rerun, ligado pela barra lateral (ver relatorio/perfil.py)
+relatorio.ativar_perfil(st.session_state["perfil_relatorios"])
+
 # ====================================
 # 🖥️ FLUXO PRINCIPAL DO APLICATIVO
 # ====================================
@@ -55,7 +70,7 @@ if st.session_state["tela_atual"] == "inicial":
     # --------------------------
     # 🏠 Tela Inicial
     # --------------------------
-    set_background("assets/bg_1.png")
+    set_background("static/bg_1.png")
     st.markdown("<h1>Controle de Contas</h1>", unsafe_allow_html=True)
 
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -80,6 +95,10 @@ if st.session_state["tela_atual"] == "inicial":
     with col3:
         st.write("")
 
+    # Aquece o mês vigente enquanto o usuário escolhe a tela
+    hoje = datetime.today()
+    prefetch_meses_vizinhos("inicial", hoje.month, hoje.year)
+
 else:
     # --------------------------
     # 🎨 Estilo aplicado fora da tela inicial
@@ -100,6 +119,7 @@ else:
         st.session_state["df_original"] = df.copy()
 
         exibir_contas_mes(df, nome_mes, ano, hoje.month)
+        prefetch_meses_vizinhos("mes_vigente", hoje.month, hoje.year)
 
     # --------------------------
     # 📚 Tela: Histórico
@@ -122,6 +142,7 @@ else:
             st.session_state["df_original"] = df.copy()
             st.session_state["nome_mes_historico"] = datetime(1900, mes_selecionado, 1).strftime("%B").capitalize()
             st.session_state["ano_historico"] = ano_selecionado
+            st.session_state["mes_historico"] = mes_selecionado
             st.session_state["historico_carregado"] = True
 
         if st.session_state.get("historico_carregado", False):
@@ -131,6 +152,11 @@ else:
                 st.session_state["ano_historico"],
                 mes_selecionado,
             )
+            prefetch_meses_vizinhos(
+                "historico",
+                st.session_state["mes_historico"],
+                st.session_state["ano_historico"],
+            )
 
     # --------------------------
     # 📊 Tela: Relatórios
@@ -144,8 +170,17 @@ else:
         # --------------------------
         st.subheader("📈 Contas por Período")
 
-        # Obter anos e meses disponíveis no banco
-        anos_disponiveis, meses_disponiveis = get_anos_meses_disponiveis() or ([], [])
+        # Anos/meses disponíveis e nomes das contas, buscados ao mesmo tempo
+        # (cliente assíncrono, importado só quando esta tela é aberta)
+        from supabase import (
+            executar_em_paralelo,
+            get_anos_meses_disponiveis_async,
+            get_nomes_conta_unicos_async,
+        )
+        (anos_disponiveis, meses_disponiveis), contas_disponiveis = executar_em_paralelo(
+            get_anos_meses_disponiveis_async(), get_nomes_conta_unicos_async(),
+        )
+        avisar_dados_desatualizados()
 
         if not anos_disponiveis or not meses_disponiveis:
             st.warning("Não há dados disponíveis para gerar comparativos.")
@@ -166,12 +201,27 @@ else:
         with col4:
             mes_fim = st.selectbox("Mês Final", meses_disponiveis, key="mes_fim_comp")
 
-        # Seletor da conta
-        contas_disponiveis = get_nomes_conta_unicos()
-        conta_escolhida = st.selectbox("Conta", contas_disponiveis, key="conta_escolhida_comp")
+        # Seletor da conta e da qualidade dos gráficos nos PDFs
+        col_conta, col_qualidade = st.columns([3, 1])
+        with col_conta:
+            conta_escolhida = st.selectbox("Conta", contas_disponiveis, key="conta_escolhida_comp")
+        with col_qualidade:
+            seletor_qualidade_pdf("qualidade_pdf_relatorios")
+        st.radio(
+            "Gráficos por conta no resumo do período",
+            ["detalhado", "compacto"],
+            format_func=lambda l: "Um gráfico por conta" if l == "detalhado" else "Grade compacta (todas as contas)",
+            horizontal=True,
+            key="layout_resumo",
+        )
+        ajustes_resumo = editar_ajustes_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim)
+        st.toggle(
+            "Gráfico interativo (zoom e valores ao passar o mouse)",
+            key="grafico_interativo",
+        )
         
         # Botões de ação
-        col_a, col_b, col_c = st.columns(3)
+        col_a, col_b, col_c, col_d = st.columns(4)
         with col_a:
             if st.button("Gerar Gráfico"):
                 st.session_state["grafico_comparativo_pronto"] = True
@@ -183,6 +233,10 @@ else:
         with col_c:
             if st.button("Gerar Resumo do Período 📄"):
                 st.session_state["resumo_periodo_pronto"] = True
+
+        with col_d:
+            if st.button("Exportar Excel do Período 📊"):
+                st.session_state["excel_periodo_pronto"] = True
                 
         # =============================
         # 📈 Geração do gráfico de linha
@@ -190,7 +244,7 @@ else:
         if st.session_state.get("grafico_comparativo_pronto", False):
             st.session_state["grafico_comparativo_pronto"] = False  # limpa a flag após usar
 
-            df_comparativo = carregar_dados_conta_periodo(
+            df_comparativo = relatorio.carregar_dados_conta_periodo(
                 mes_inicio, ano_inicio,
                 mes_fim, ano_fim,
                 conta_escolhida
@@ -198,8 +252,19 @@ else:
 
             if df_comparativo.empty:
                 st.warning("Nenhum dado encontrado para o período selecionado.")
+            elif st.session_state["grafico_interativo"]:
+                # Renderizado no navegador: só a série mensal é enviada
+                grafico = relatorio.gerar_grafico_interativo_linha(
+                    df_comparativo,
+                    conta_escolhida,
+                    mes_inicio,
+                    ano_inicio,
+                    mes_fim,
+                    ano_fim
+                )
+                st.altair_chart(grafico, use_container_width=True)
             else:
-                fig = gerar_grafico_comparativo_linha(
+                fig = relatorio.gerar_grafico_comparativo_linha(
                     df_comparativo,
                     conta_escolhida,
                     mes_inicio,
@@ -215,7 +280,7 @@ else:
         if st.session_state.get("pdf_comparativo_pronto", False):
             st.session_state["pdf_comparativo_pronto"] = False
 
-            df_pdf = carregar_dados_conta_periodo(
+            df_pdf = relatorio.carregar_dados_conta_periodo(
                 mes_inicio, ano_inicio,
                 mes_fim, ano_fim,
                 conta_escolhida
@@ -224,13 +289,14 @@ else:
             if df_pdf.empty:
                 st.warning("Não foi possível gerar o PDF. Nenhum dado encontrado.")
             else:
-                pdf_bytes = gerar_pdf_comparativo_conta(
+                pdf_bytes = relatorio.gerar_pdf_comparativo_conta(
                     df_pdf,
                     conta_escolhida,
                     mes_inicio,
                     ano_inicio,
                     mes_fim,
-                    ano_fim
+                    ano_fim,
+                    qualidade=st.session_state["qualidade_pdf"],
                 )
                 nome_arquivo = f"relatorio_{(conta_escolhida or '').lower()}_{mes_inicio:02d}{ano_inicio}_{mes_fim:02d}{ano_fim}.pdf"
                 st.download_button(
@@ -241,28 +307,108 @@ else:
                 )
 
         # =============================
-        # 🧾 Geração do Resumo do Período
+        # 📊 Várias contas no mesmo gráfico
         # =============================
-        if st.session_state.get("resumo_periodo_pronto", False):
-            st.session_state["resumo_periodo_pronto"] = False
+        st.markdown("---")
+        st.subheader("📊 Comparar Contas")
+
+        col_contas, col_modo = st.columns([3, 1])
+        with col_contas:
+            contas_comparacao = st.multiselect("Contas", contas_disponiveis, key="contas_comparacao")
+        with col_modo:
+            modo_comparacao = st.radio(
+                "Exibição",
+                ["linhas", "area"],
+                format_func=lambda m: "Linhas sobrepostas" if m == "linhas" else "Área empilhada",
+                key="modo_comparacao",
+            )
+
+        col_d, col_e = st.columns(2)
+        with col_d:
+            gerar_grafico_contas = st.button("Gerar Comparativo de Contas", disabled=not contas_comparacao)
+        with col_e:
+            gerar_pdf_contas = st.button("Gerar PDF do Comparativo de Contas", disabled=not contas_comparacao)
 
-            df_periodo = carregar_dados_conta_periodo(
+        if gerar_grafico_contas or gerar_pdf_contas:
+            # Todas as contas selecionadas em uma única requisição
+            df_contas = relatorio.carregar_dados_contas_periodo(
                 mes_inicio, ano_inicio,
                 mes_fim, ano_fim,
-                nome_da_conta=None  # todas as contas
+                contas_comparacao
             )
 
-            if df_periodo.empty:
-                st.warning("Não há contas registradas no intervalo selecionado.")
+            if df_contas.empty:
+                st.warning("Nenhum dado encontrado para as contas e o período selecionados.")
+            elif gerar_grafico_contas:
+                if st.session_state["grafico_interativo"]:
+                    grafico = relatorio.gerar_grafico_interativo_contas(
+                        df_contas, contas_comparacao, mes_inicio, ano_inicio, mes_fim, ano_fim, modo=modo_comparacao
+                    )
+                    st.altair_chart(grafico, use_container_width=True)
+                else:
+                    fig = relatorio.gerar_grafico_comparativo_contas(
+                        df_contas, contas_comparacao, mes_inicio, ano_inicio, mes_fim, ano_fim, modo=modo_comparacao
+                    )
+                    st.pyplot(fig)
             else:
-                st.success("Resumo do período carregado com sucesso!")
-                pdf_bytes = gerar_relatorio_periodo_pdf(
-                    df_periodo,
+                pdf_bytes = relatorio.gerar_pdf_comparativo_conta(
+                    df_contas,
+                    contas_comparacao,
                     mes_inicio,
                     ano_inicio,
                     mes_fim,
-                    ano_fim
+                    ano_fim,
+                    qualidade=st.session_state["qualidade_pdf"],
+                    modo=modo_comparacao,
+                )
+                nome_arquivo = f"relatorio_contas_{mes_inicio:02d}{ano_inicio}_{mes_fim:02d}{ano_fim}.pdf"
+                st.download_button(
+                    label="📄 Baixar PDF do Comparativo de Contas",
+                    data=pdf_bytes,
+                    file_name=nome_arquivo,
+                    mime="application/pdf"
                 )
+
+        # =============================
+        # 🧾 Geração do Resumo do Período
+        # =============================
+        if st.session_state.get("resumo_periodo_pronto", False):
+            st.session_state["resumo_periodo_pronto"] = False
+
+            # Busca e geração medidas juntas no perfil (painel "🧪 Perfil dos relatórios"),
+            # com prazo próprio; se o período não puder ser lido inteiro (erro ou prazo
+            # esgotado), o PDF não é gerado em vez de sair incompleto
+            pdf_bytes = None
+            incompleto = False
+            with prazo(PRAZO_EXPORTACAO_SEGUNDOS), relatorio.etapa("resumo_do_periodo"):
+                try:
+                    with relatorio.etapa("busca"):
+                        df_periodo = relatorio.carregar_dados_conta_periodo(
+                            mes_inicio, ano_inicio,
+                            mes_fim, ano_fim,
+                            nome_da_conta=None  # todas as contas
+                        )
+                except relatorio.DadosIncompletos as e:
+                    print(f"Resumo do período não gerado: falha ao ler {e}")
+                    df_periodo, incompleto = pd.DataFrame(), True
+                if not df_periodo.empty:
+                    pdf_bytes = relatorio.gerar_relatorio_periodo_pdf(
+                        df_periodo,
+                        mes_inicio,
+                        ano_inicio,
+                        mes_fim,
+                        ano_fim,
+                        qualidade=st.session_state["qualidade_pdf"],
+                        layout=st.session_state["layout_resumo"],
+                        ajustes=ajustes_resumo,
+                    )
+
+            if incompleto:
+                st.error("⚠️ Não foi possível ler todo o período do Supabase e o resumo sairia incompleto. Tente novamente.")
+            elif df_periodo.empty:
+                st.warning("Não há contas registradas no intervalo selecionado.")
+            else:
+                st.success("Resumo do período carregado com sucesso!")
                 nome_arquivo = f"relatorio_resumo_{mes_inicio:02d}{ano_inicio}_{mes_fim:02d}{ano_fim}.pdf"
                 if pdf_bytes is not None:
                     st.download_button(
@@ -272,6 +418,46 @@ else:
                         mime="application/pdf"
                     )
 
+        # =============================
+        # 📊 Exportação do Período em Excel
+        # =============================
+        if st.session_state.get("excel_periodo_pronto", False):
+            st.session_state["excel_periodo_pronto"] = False
+
+            # Lido do Supabase em blocos de meses e escrito aba por aba, com prazo próprio;
+            # um bloco que falha (erro ou prazo esgotado) descarta a planilha inteira
+            incompleto = False
+            with prazo(PRAZO_EXPORTACAO_SEGUNDOS):
+                try:
+                    planilha = relatorio.gerar_excel_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim)
+                except relatorio.DadosIncompletos as e:
+                    print(f"Planilha do período não gerada: falha ao ler {e}")
+                    planilha, incompleto = None, True
+            if incompleto:
+                st.error("⚠️ Não foi possível ler todo o período do Supabase e a planilha sairia incompleta. Tente novamente.")
+            elif planilha is None:
+                st.warning("Não há contas registradas no intervalo selecionado.")
+            else:
+                st.download_button(
+                    label="📊 Baixar Planilha do Período",
+                    data=planilha,
+                    file_name=f"contas_{mes_inicio:02d}{ano_inicio}_{mes_fim:02d}{ano_fim}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                )
+
+
+# Painel de depuração com o perfil do último relatório gerado
+exibir_painel_perfil()
+
+
+# ====================================
+# 🔥 PÓS-RENDERIZAÇÃO
+# ====================================
+# Com a tela já enviada ao navegador, carrega o pacote de relatórios
+# (matplotlib, fpdf, cache de fontes) em segundo plano para o primeiro uso.
+
+relatorio.aquecer_em_segundo_plano()
+
 
 
 
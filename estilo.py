@@ -3,23 +3,39 @@
 # ====================================
 
 import base64
+from functools import lru_cache
+import os
 import streamlit as st
 
+# Pasta servida pelo Streamlit em /app/static (ver .streamlit/config.toml)
+PASTA_STATIC = "static"
 
-def set_background(image_file):
+
+@lru_cache(maxsize=None)
+def _url_imagem(image_file):
     """
-    Define uma imagem de fundo fixa para o aplicativo Streamlit.
+    Retorna a URL usada no CSS para a imagem, calculada uma única vez por processo.
 
-    Parâmetros:
-        image_file (str): Caminho para a imagem a ser usada como background.
+    Arquivos dentro de `static/` são servidos pelo próprio Streamlit, então o CSS
+    leva apenas o caminho. Fora dela, cai no data URI em base64 (lido uma vez só).
     """
+    caminho = os.path.normpath(image_file)
+    if caminho.split(os.sep)[0] == PASTA_STATIC:
+        return "app/" + caminho.replace(os.sep, "/")
+
     with open(image_file, "rb") as f:
         data = f.read()
     encoded = base64.b64encode(data).decode()
-    css = f"""
+    return f"data:image/png;base64,{encoded}"
+
+
+@lru_cache(maxsize=None)
+def _css_background(image_file):
+    """Monta (uma única vez por imagem) o CSS da tela inicial."""
+    return f"""
     <style>
     .stApp {{
-        background: url("data:image/png;base64,{encoded}") no-repeat center center fixed;
+        background: url("{_url_imagem(image_file)}") no-repeat center center fixed;
         background-size: cover;
         background-color: #111111;
     }}
@@ -43,15 +59,23 @@ def set_background(image_file):
     }}
     </style>
     """
-    st.markdown(css, unsafe_allow_html=True)
 
 
-def aplicar_estilo_mockup():
+def set_background(image_file):
     """
-    Aplica um estilo visual escuro e moderno ao app Streamlit,
-    com cabeçalho flutuante e botões estilizados.
+    Define uma imagem de fundo fixa para o aplicativo Streamlit.
+
+    A imagem deve estar em `static/` para ser servida como arquivo estático;
+    o CSS gerado é reaproveitado entre reruns.
+
+    Parâmetros:
+        image_file (str): Caminho para a imagem a ser usada como background.
     """
-    st.markdown("""
+    st.markdown(_css_background(image_file), unsafe_allow_html=True)
+
+
+# CSS do tema escuro, montado uma única vez no carregamento do módulo
+CSS_MOCKUP = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;700&display=swap');
     .stApp {
@@ -95,5 +119,14 @@ def aplicar_estilo_mockup():
         transform: scale(1.05);
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def aplicar_estilo_mockup():
+    """
+    Aplica um estilo visual escuro e moderno ao app Streamlit,
+    com cabeçalho flutuante e botões estilizados.
+    """
+    st.markdown(CSS_MOCKUP, unsafe_allow_html=True)
+
     
\ No newline at end of file
@@ -1,13 +1,18 @@
 from .app_utils import (
+    avisar_dados_desatualizados,
+    editar_ajustes_periodo,
+    exibir_painel_perfil,
     exibir_cabecalho_mes,
     exibir_formulario_conta,
     exibir_contas_mes,
+    seletor_qualidade_pdf,
 )
 
 from .navegacao import (
     ir_para_mes_vigente,
     ir_para_historico,
     voltar_tela_inicial,
+    prefetch_meses_vizinhos,
 )
 
 from .app_vars import inicializar_sessao
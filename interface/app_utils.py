@@ -7,15 +7,16 @@ import pandas as pd
 import streamlit as st
 
 # --------- Módulos internos ---------
-from relatorio import (
-    gerar_relatorio_pdf,
-)
+import relatorio  # funções carregadas sob demanda (matplotlib/fpdf só no primeiro uso)
 
 from supabase import (
     carregar_tabela,
     carregar_mes_referente,
+    centavos_do_df,
+    centavos_para_reais,
     excluir_conta,
     get_nomes_conta_unicos,
+    prazos_esgotados,
     salvar_conta,
 )
 
@@ -36,11 +37,138 @@ def exibir_cabecalho_mes(nome_mes, ano, total):
     <div class="floating-header">
         <div class="month-title">{nome_mes} / {ano}</div>
         <div class="header-actions">
-            <div><strong>Total:</strong> R$ {total:,.2f}</div>
+            <div><strong>Total:</strong> {relatorio.formatar_brl(total)}</div>
         </div>
     </div>
     """, unsafe_allow_html=True)
 
+# ================================================
+# ⏱️ Aviso de dados desatualizados
+# ================================================
+
+def avisar_dados_desatualizados():
+    """
+    Avisa quando alguma requisição deste rerun estourou o prazo e a tela
+    está usando dados do cache (possivelmente desatualizados) ou incompletos.
+    """
+    if prazos_esgotados():
+        st.warning(
+            "⏱️ O Supabase demorou a responder: alguns dados podem estar desatualizados "
+            "ou incompletos. Recarregue a página para tentar de novo."
+        )
+
+# ================================================
+# 🖼️ Qualidade dos gráficos nos PDFs
+# ================================================
+
+QUALIDADES_PDF = {
+    "compacto": "Compacto (menor arquivo)",
+    "padrao": "Padrão",
+    "alta": "Alta resolução",
+    "vetorial": "Vetorial (SVG)",
+}
+
+
+def seletor_qualidade_pdf(chave):
+    """
+    Exibe o seletor da qualidade dos gráficos nos PDFs e guarda a escolha em
+    `st.session_state["qualidade_pdf"]`, uma chave comum às telas.
+
+    A chave do widget (`chave`) é própria de cada tela: o Streamlit apaga a
+    chave de um widget quando ele deixa de ser exibido, então a escolha não
+    pode morar nela.
+
+    Retorno:
+        str: Qualidade escolhida (ex: "padrao").
+    """
+    opcoes = list(QUALIDADES_PDF)
+    escolha = st.selectbox(
+        "Qualidade do PDF",
+        opcoes,
+        index=opcoes.index(st.session_state.get("qualidade_pdf", "padrao")),
+        format_func=QUALIDADES_PDF.get,
+        key=chave,
+    )
+    st.session_state["qualidade_pdf"] = escolha
+    return escolha
+
+# ================================================
+# ⚖️ Ajustes do balanço no resumo do período
+# ================================================
+
+def editar_ajustes_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim):
+    """
+    Exibe, recolhida, a tabela do ajuste mensal a favor de Roman no balanço do
+    resumo do período, com um mês por linha (começando em AJUSTE_MENSAL_PADRAO).
+
+    Retorno:
+        dict: {(ano, mes): valor} para `gerar_relatorio_periodo_pdf(..., ajustes=...)`.
+    """
+    inicio, fim = sorted([(ano_inicio, mes_inicio), (ano_fim, mes_fim)])
+    periodos = pd.period_range(f"{inicio[0]}-{inicio[1]:02d}", f"{fim[0]}-{fim[1]:02d}", freq="M")
+    tabela = pd.DataFrame({
+        "Mês": [p.strftime("%m/%Y") for p in periodos],
+        "Ajuste (R$)": [relatorio.AJUSTE_MENSAL_PADRAO] * len(periodos),
+    })
+
+    with st.expander("⚖️ Ajustes do balanço entre pagadores (resumo do período)"):
+        st.caption("Valor somado a favor de Roman no saldo de cada mês.")
+        editada = st.data_editor(
+            tabela,
+            key=f"ajustes_{inicio[0]}{inicio[1]:02d}_{fim[0]}{fim[1]:02d}",
+            disabled=["Mês"],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    return {
+        (p.year, p.month): float(valor)
+        for p, valor in zip(periodos, editada["Ajuste (R$)"].fillna(0.0))
+    }
+
+# ================================================
+# 🧪 Painel de perfil dos relatórios
+# ================================================
+
+def exibir_painel_perfil():
+    """
+    Exibe na barra lateral a opção de medir os relatórios e, se ligada, o
+    tempo e o pico de memória de cada etapa do último relatório gerado.
+    """
+    with st.sidebar:
+        st.checkbox(
+            "🧪 Perfil dos relatórios",
+            key="perfil_relatorios",
+            help="Mede busca, pandas, gráficos, imagens e serialização de cada relatório gerado.",
+        )
+        if not st.session_state["perfil_relatorios"]:
+            return
+
+        perfis = relatorio.ultimos_perfis()
+        if not perfis:
+            st.caption("Gere um relatório para ver o perfil.")
+            return
+
+        perfil = perfis[-1]
+        st.markdown(
+            f"**{perfil['relatorio']}** ({perfil['data']}): "
+            f"{perfil['total_ms']:.0f} ms, pico de {perfil['pico_mb']:.1f} MB"
+        )
+        if "erro" in perfil:
+            st.error(f"Interrompido por {perfil['erro']}")
+
+        etapas = pd.DataFrame(perfil["etapas"])
+        etapas["etapa"] = [
+            "  " * nivel + caminho.rsplit("/", 1)[-1]
+            for nivel, caminho in zip(etapas["nivel"], etapas["etapa"])
+        ]
+        st.dataframe(
+            etapas[["etapa", "ms", "proprio_ms", "chamadas", "pico_mb"]],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption(f"Histórico das execuções em {relatorio.ARQUIVO_PERFIL}")
+
 # ================================================
 # 🧾 Flutuante controle de contas a pagar
 # ================================================
@@ -229,18 +357,26 @@ def exibir_contas_mes(df, nome_mes, ano, mes):
     # --------------------------
     # 🧾 Cabeçalho do Mês
     # --------------------------
-    total = df['valor'].sum() if not df.empty else 0
+    total = centavos_para_reais(int(centavos_do_df(df).sum())) if not df.empty else 0
     exibir_cabecalho_mes(nome_mes, ano, total)
     mostrar_lembrete_balanco(df, mes, ano)
+    avisar_dados_desatualizados()
 
     # --------------------------
-    # 🧩 Botões: Nova Conta e Relatório
+    # 🧩 Botões: Nova Conta, Excel e Relatório
     # --------------------------
-    col_btn1, _, col_btn3 = st.columns([1, 1, 1])
+    col_btn1, col_btn2, col_qualidade, col_btn3 = st.columns([1, 1, 1, 1])
     with col_btn1:
         if st.button("Nova Conta"):
             st.session_state["modo_nova_conta"] = True
 
+    with col_btn2:
+        if st.button("Exportar Excel 📊", disabled=df.empty):
+            st.session_state["exportar_excel_mes"] = True
+
+    with col_qualidade:
+        seletor_qualidade_pdf("qualidade_pdf_mes")
+
     with col_btn3:
         st.markdown("<div style='display: flex; justify-content: flex-end;'>", unsafe_allow_html=True)
         if st.button("Gerar Resumo do Mês 📄"):
@@ -260,13 +396,32 @@ def exibir_contas_mes(df, nome_mes, ano, mes):
             st.error("Erro ao detectar mês/ano das contas.")
             st.stop()
 
-        pdf_bytes = gerar_relatorio_pdf(df.copy(), nome_mes_detectado, ano_detectado)
+        pdf_bytes = relatorio.gerar_relatorio_pdf(
+            df.copy(), nome_mes_detectado, ano_detectado,
+            qualidade=st.session_state["qualidade_pdf"],
+        )
         if pdf_bytes is not None:
             nome_arquivo = f"relatorio_{nome_mes_detectado}_{ano_detectado}.pdf"
             st.download_button("Download Relatório PDF", data=pdf_bytes, file_name=nome_arquivo, mime="application/pdf")
         else:
             st.error("Erro ao gerar o PDF. Verifique se os dados estão preenchidos corretamente.")
 
+    # --------------------------
+    # 📊 Exportação em Excel
+    # --------------------------
+    if st.session_state.get("exportar_excel_mes", False):
+        st.session_state["exportar_excel_mes"] = False
+        planilha = relatorio.gerar_excel_mes(df.copy(), mes, ano)
+        if planilha is not None:
+            st.download_button(
+                "Download Planilha Excel",
+                data=planilha,
+                file_name=f"contas_{mes:02d}_{ano}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+        else:
+            st.warning("Não há contas para exportar neste mês.")
+
 
     # --------------------------
     # ➕ Formulário de Nova Conta
@@ -308,12 +463,14 @@ def exibir_contas_mes(df, nome_mes, ano, mes):
         df = df.sort_values(by="nome_da_conta", ascending=True)
 
     if not df.empty:
+        # Valores formatados de uma vez para a lista inteira
+        valores_fmt = relatorio.formatar_brl_centavos(pd.Series(centavos_do_df(df), index=df.index))
         for idx, row in df.iterrows():
             nome = row.get("nome_da_conta", "Sem nome")
             instancia = row.get("instancia", "")
-            valor = row.get("valor", 0.0)
+            valor_fmt = valores_fmt[idx]
 
-            resumo = f"💼 {nome} | 🏷️ {instancia} | 💰 R$ {valor:,.2f}"
+            resumo = f"💼 {nome} | 🏷️ {instancia} | 💰 {valor_fmt}"
 
             with st.expander(resumo):
                 exibir_formulario_conta(row.to_dict(), idx_prefix=f"{row['id']}")
@@ -24,6 +24,13 @@ def inicializar_sessao():
         "historico_carregado": False,
         "nome_mes_historico": "",
         "gerar_relatorio": False,
+        "exportar_excel_mes": False,
+        "qualidade_pdf": "padrao",
+        "layout_resumo": "detalhado",
+        "grafico_interativo": True,
+        "contas_comparacao": [],
+        "modo_comparacao": "linhas",
+        "perfil_relatorios": False,
     }
 
     for key, value in valores_iniciais.items():
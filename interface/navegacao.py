@@ -2,8 +2,26 @@
 # 📦 IMPORTAÇÕES (em ordem alfabética)
 # ====================================
 
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
 import streamlit as st
 
+# --------- Módulos internos ---------
+from supabase import prefetch_meses
+
+# ====================================
+# 🔮 MESES VIZINHOS POR TELA
+# ====================================
+# Deslocamentos (meses, anos) que cada tela costuma pedir logo em seguida:
+# - Mês Vigente: lembrete (mês anterior) e relatório (mês anterior + mesmo mês do ano passado)
+# - Histórico: o mesmo, mais a navegação mês a mês (anterior/seguinte)
+
+DESLOCAMENTOS_PREFETCH = {
+    "inicial": [(0, 0)],
+    "mes_vigente": [(-1, 0), (0, -1)],
+    "historico": [(-1, 0), (1, 0), (0, -1)],
+}
+
 # ====================================
 # 🔀 NAVEGAÇÃO ENTRE TELAS
 # ====================================
@@ -26,4 +44,27 @@ def voltar_tela_inicial():
     st.session_state["tela_atual"] = "inicial"
     st.session_state["modo_nova_conta"] = False
     st.session_state["df_original"] = None
-    st.session_state["historico_carregado"] = False
\ No newline at end of file
+    st.session_state["historico_carregado"] = False
+
+def prefetch_meses_vizinhos(tela, mes, ano):
+    """
+    Aquece em segundo plano o cache dos meses que a tela costuma pedir em seguida.
+
+    Deve ser chamada logo após o mês atual ser exibido. Meses futuros são ignorados.
+
+    Parâmetros:
+        tela (str): Tela atual ('inicial', 'mes_vigente' ou 'historico').
+        mes (int): Mês exibido (1 a 12).
+        ano (int): Ano exibido.
+    """
+    hoje = datetime.today()
+    limite = datetime(hoje.year, hoje.month, 1)
+    base = datetime(ano, mes, 1)
+
+    meses = []
+    for delta_meses, delta_anos in DESLOCAMENTOS_PREFETCH.get(tela, []):
+        destino = base + relativedelta(months=delta_meses, years=delta_anos)
+        if destino <= limite:
+            meses.append((destino.month, destino.year))
+
+    prefetch_meses(meses)
@@ -1,18 +1,145 @@
-from .pdf import (
-    gerar_relatorio_pdf,
-    gerar_pdf_comparativo_conta,
-    gerar_relatorio_periodo_pdf,
-)
-
-from .graficos import (
-    gerar_grafico_pizza_periodo,
-    gerar_grafico_comparativo_duplo,
-    gerar_grafico_comparativo_linha,
-)
-
-from .utils import (
-    calcular_saldo_entre_pagadores,
-    agrupar_por_mes,
-    filtrar_contas_repetidas,
-    carregar_dados_conta_periodo,
-)
+# ====================================
+# 📦 PACOTE DE RELATÓRIOS (importação sob demanda)
+# ====================================
+# Os submódulos dependem de matplotlib, fpdf e numpy, que pesam no cold start.
+# Por isso as funções abaixo só são importadas no primeiro acesso
+# (ex: `relatorio.gerar_relatorio_pdf(...)`), e não ao importar o pacote.
+
+import importlib
+import sys
+import threading
+import time
+
+# Função pública → submódulo onde ela está definida
+_SUBMODULOS = {
+    "gerar_relatorio_pdf": "pdf",
+    "gerar_pdf_comparativo_conta": "pdf",
+    "gerar_relatorio_periodo_pdf": "pdf",
+    "gerar_relatorios_em_lote": "lote",
+    "gerar_excel_mes": "excel",
+    "gerar_excel_periodo": "excel",
+    "gerar_grafico_pizza_periodo": "graficos",
+    "gerar_grafico_comparativo_duplo": "graficos",
+    "gerar_grafico_comparativo_linha": "graficos",
+    "gerar_grafico_comparativo_periodos": "graficos",
+    "calcular_periodos_referencia": "utils",
+    "montar_comparativo_periodos": "utils",
+    "calcular_saldo_entre_pagadores": "utils",
+    "calcular_livro_saldos": "utils",
+    "AJUSTE_MENSAL_PADRAO": "utils",
+    "agrupar_por_mes": "utils",
+    "iterar_por_mes": "utils",
+    "filtrar_contas_repetidas": "utils",
+    "carregar_dados_conta_periodo": "utils",
+    "DadosIncompletos": "utils",
+    "montar_matriz_periodo": "utils",
+    "serie_da_conta": "utils",
+    "contas_recorrentes": "utils",
+    "gerar_grafico_multiplos_contas": "graficos",
+    "salvar_figura": "graficos",
+    "gerar_grafico_saldo_acumulado": "graficos",
+    "gerar_grafico_interativo_linha": "graficos_interativos",
+    "gerar_grafico_interativo_contas": "graficos_interativos",
+    "gerar_grafico_comparativo_contas": "graficos",
+    "carregar_dados_contas_periodo": "utils",
+    "pivotar_contas_periodo": "utils",
+    "calcular_limites_eixo_y": "utils",
+    "formatar_brl": "formatacao",
+    "formatar_brl_serie": "formatacao",
+    "formatar_brl_centavos": "formatacao",
+    "etapa": "perfil",
+    "ativar_perfil": "perfil",
+    "perfil_ativo": "perfil",
+    "ultimos_perfis": "perfil",
+    "ARQUIVO_PERFIL": "perfil",
+}
+
+__all__ = list(_SUBMODULOS) + ["aquecer_em_segundo_plano", "tempos_importacao"]
+
+# Segundos gastos na primeira importação de cada submódulo (e no aquecimento)
+_tempos_importacao = {}
+_lock = threading.Lock()
+_aquecimento_iniciado = False
+
+
+def _importar(submodulo):
+    """Importa `relatorio.<submodulo>` registrando o tempo da primeira importação."""
+    nome = f"{__name__}.{submodulo}"
+    if nome in sys.modules:
+        return sys.modules[nome]
+
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome)
+    with _lock:
+        _tempos_importacao.setdefault(nome, time.perf_counter() - inicio)
+    return modulo
+
+
+def __getattr__(nome):
+    submodulo = _SUBMODULOS.get(nome)
+    if submodulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+    valor = getattr(_importar(submodulo), nome)
+    globals()[nome] = valor  # próximos acessos não passam mais por aqui
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# =====================================================
+# 🔥 Aquecimento em segundo plano
+# =====================================================
+
+def _aquecer():
+    inicio = time.perf_counter()
+    try:
+        _importar("pdf")  # importa também graficos e utils
+
+        # Monta o cache de fontes do matplotlib e inicializa o renderizador Agg
+        import matplotlib.pyplot as plt
+        from matplotlib import font_manager
+
+        font_manager.findfont(font_manager.FontProperties(family=plt.rcParams["font.family"]))
+        fig, ax = plt.subplots(figsize=(1, 1))
+        ax.set_title("R$ 0,00")
+        ax.plot([0, 1], [0, 1])
+        fig.canvas.draw()
+        plt.close(fig)
+    except Exception as e:
+        # O aquecimento é só uma otimização: o primeiro relatório importa normalmente
+        print(f"Erro ao aquecer o pacote de relatórios: {e}")
+        return
+
+    with _lock:
+        _tempos_importacao["aquecimento"] = time.perf_counter() - inicio
+
+
+def aquecer_em_segundo_plano():
+    """
+    Carrega o pacote de relatórios e aquece o cache de fontes do matplotlib
+    em uma thread separada. Chamadas repetidas não têm efeito.
+
+    Deve ser chamada ao final do script, depois da primeira renderização.
+    """
+    global _aquecimento_iniciado
+    with _lock:
+        if _aquecimento_iniciado:
+            return
+        _aquecimento_iniciado = True
+
+    threading.Thread(target=_aquecer, name="aquecer_relatorio", daemon=True).start()
+
+
+def tempos_importacao():
+    """
+    Retorna os tempos (em segundos) de importação dos submódulos já carregados
+    e, se concluído, do aquecimento em segundo plano.
+
+    Retorno:
+        dict: Ex: {'relatorio.pdf': 0.84, 'aquecimento': 1.12}
+    """
+    with _lock:
+        return dict(_tempos_importacao)
@@ -0,0 +1,64 @@
+# ====================================
+# 🖥️ LINHA DE COMANDO: relatórios mensais em lote
+# ====================================
+# Exemplos:
+#   SUPABASE_URL=... SUPABASE_KEY=... python -m relatorio 2024
+#   python -m relatorio --inicio 01/2024 --fim 06/2025 --saida relatorios --processos 4
+#   python -m relatorio 2024 --snapshot snapshot   (lê o snapshot em Parquet, sem requisições)
+
+import argparse
+import sys
+
+from relatorio.lote import gerar_relatorios_em_lote, listar_meses
+
+
+def _mes_ano(texto):
+    """Converte 'MM/AAAA' em (mes, ano)."""
+    try:
+        mes, ano = (int(parte) for parte in texto.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"use o formato MM/AAAA (recebido: {texto!r})")
+    if not 1 <= mes <= 12:
+        raise argparse.ArgumentTypeError(f"mês inválido: {mes}")
+    return mes, ano
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m relatorio",
+        description="Gera os relatórios mensais em PDF de um ano ou intervalo, sem abrir o app.",
+    )
+    parser.add_argument("ano", nargs="?", type=int, help="Ano completo a gerar (ex: 2024)")
+    parser.add_argument("--inicio", type=_mes_ano, help="Primeiro mês (MM/AAAA)")
+    parser.add_argument("--fim", type=_mes_ano, help="Último mês (MM/AAAA)")
+    parser.add_argument("--saida", default="relatorios", help="Pasta de saída (padrão: relatorios)")
+    parser.add_argument(
+        "--qualidade", default="padrao", choices=["compacto", "padrao", "alta", "vetorial"],
+        help="Qualidade dos gráficos (padrão: padrao)",
+    )
+    parser.add_argument("--processos", type=int, default=None, help="Processos em paralelo (padrão: núcleos da máquina)")
+    parser.add_argument(
+        "--snapshot", metavar="PASTA", default=None,
+        help="Lê as contas de um snapshot em Parquet (python -m supabase snapshot) em vez do Supabase",
+    )
+    args = parser.parse_args(argv)
+
+    if args.ano is not None and (args.inicio or args.fim):
+        parser.error("informe o ano OU --inicio/--fim")
+    if args.ano is not None:
+        inicio, fim = (1, args.ano), (12, args.ano)
+    elif args.inicio and args.fim:
+        inicio, fim = args.inicio, args.fim
+    else:
+        parser.error("informe o ano ou o intervalo com --inicio e --fim")
+
+    meses = listar_meses(*inicio, *fim)
+    gerados = gerar_relatorios_em_lote(
+        meses, args.saida, qualidade=args.qualidade, processos=args.processos, snapshot=args.snapshot,
+    )
+    print(f"{len(gerados)} relatório(s) gerado(s) em {args.saida}")
+    return 0 if gerados else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+# ====================================
+# 💾 ARQUIVOS TEMPORÁRIOS PARA DOWNLOAD
+# ====================================
+# Leitor usado pelos PDFs e planilhas gerados em arquivos temporários
+# "spooled" (em memória até um limite, depois em disco). Não depende de
+# matplotlib nem de fpdf.
+
+import io
+
+
+class ArquivoTemporario(io.RawIOBase):
+    """
+    Leitor somente-leitura sobre o arquivo temporário que contém o documento gerado.
+
+    É aceito diretamente pelo `st.download_button` e pode ser copiado em blocos
+    (ex: `shutil.copyfileobj`), sem montar cópias intermediárias do documento.
+    """
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        return self._arquivo.seek(pos, whence)
+
+    def tell(self):
+        return self._arquivo.tell()
+
+    def readinto(self, destino):
+        dados = self._arquivo.read(len(destino))
+        destino[:len(dados)] = dados
+        return len(dados)
+
+    def close(self):
+        if not self.closed:
+            self._arquivo.close()
+        super().close()
@@ -0,0 +1,243 @@
+# ====================================
+# 📊 EXPORTAÇÃO DAS CONTAS EM EXCEL
+# ====================================
+# Planilha gerada com o openpyxl em modo "write-only": as linhas vão direto
+# para o arquivo à medida que são escritas, sem montar a planilha em memória,
+# e o resultado é gravado em um arquivo temporário "spooled".
+
+from datetime import date
+import tempfile
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from relatorio.arquivos import ArquivoTemporario
+from relatorio.lote import listar_meses
+from relatorio.utils import DadosIncompletos
+from supabase import carregar_intervalo, centavos_do_df, centavos_para_reais
+
+
+# Acima deste tamanho a planilha gerada vai para disco em vez de ficar em memória
+LIMITE_EXCEL_EM_MEMORIA = 8 * 1024 * 1024  # 8 MB
+
+# Meses buscados por requisição na exportação de um período
+MESES_POR_BLOCO = 6
+
+FORMATO_REAIS = '"R$" #,##0.00'
+FORMATO_DATA = "DD/MM/YYYY"
+
+# Colunas das abas mensais: (coluna da tabela, título, largura)
+COLUNAS_MES = [
+    ("data_de_pagamento", "Data de Pagamento", 16),
+    ("nome_da_conta", "Conta", 28),
+    ("instancia", "Instância", 18),
+    ("valor", "Valor", 14),
+    ("quem_pagou", "Quem Pagou", 14),
+    ("dividida", "Dividida", 10),
+    ("link_boleto", "Boleto", 40),
+    ("link_comprovante", "Comprovante", 40),
+]
+
+
+# =====================================================
+# 🧱 Células e abas
+# =====================================================
+
+def _celula(aba, valor, formato=None, negrito=False):
+    celula = WriteOnlyCell(aba, value=valor)
+    if formato:
+        celula.number_format = formato
+    if negrito:
+        celula.font = Font(bold=True)
+    return celula
+
+
+def _criar_aba(workbook, titulo, cabecalho, larguras):
+    """Cria uma aba com o cabeçalho em negrito, congelado na primeira linha."""
+    aba = workbook.create_sheet(titulo)
+    aba.freeze_panes = "A2"
+    for indice, largura in enumerate(larguras):
+        aba.column_dimensions[chr(ord("A") + indice)].width = largura
+    aba.append([_celula(aba, texto, negrito=True) for texto in cabecalho])
+    return aba
+
+
+def _data_excel(valor):
+    """Converte 'AAAA-MM-DD' (como vem do Supabase) em data; o resto fica como está."""
+    if isinstance(valor, str):
+        try:
+            return date.fromisoformat(valor[:10])
+        except ValueError:
+            return valor
+    return None if pd.isna(valor) else valor
+
+
+def _escrever_aba_mes(workbook, mes, ano, df, totais_conta, totais_pagador):
+    """Escreve as contas de um mês e acumula os totais (em centavos) dos resumos."""
+    aba = _criar_aba(
+        workbook, f"{mes:02d}-{ano}",
+        [titulo for _, titulo, _ in COLUNAS_MES], [largura for _, _, largura in COLUNAS_MES],
+    )
+
+    df = df.sort_values(["data_de_pagamento", "nome_da_conta"], na_position="last")
+    centavos = centavos_do_df(df)
+    colunas = {
+        coluna: df[coluna].tolist() if coluna in df.columns else [None] * len(df)
+        for coluna, _, _ in COLUNAS_MES
+    }
+
+    for i, valor_centavos in enumerate(centavos):
+        conta = colunas["nome_da_conta"][i]
+        pagador = colunas["quem_pagou"][i]
+        aba.append([
+            _celula(aba, _data_excel(colunas["data_de_pagamento"][i]), FORMATO_DATA),
+            conta,
+            colunas["instancia"][i] or None,
+            _celula(aba, centavos_para_reais(int(valor_centavos)), FORMATO_REAIS),
+            pagador,
+            "Sim" if colunas["dividida"][i] == True else "Não",
+            colunas["link_boleto"][i] or None,
+            colunas["link_comprovante"][i] or None,
+        ])
+
+        for totais, chave in ((totais_conta, conta), (totais_pagador, pagador)):
+            atual = totais.setdefault(chave or "Sem nome", [0, 0, set()])
+            atual[0] += int(valor_centavos)
+            atual[1] += 1
+            atual[2].add((ano, mes))
+
+    total_centavos = int(centavos.sum())
+    aba.append([])
+    aba.append([
+        _celula(aba, "Total", negrito=True), None, None,
+        _celula(aba, centavos_para_reais(total_centavos), FORMATO_REAIS, negrito=True),
+    ])
+
+
+def _escrever_resumo(aba, totais, total_geral):
+    """Escreve uma aba de resumo (por conta ou por pagador), do maior total para o menor."""
+    for chave, (centavos, contagem, meses) in sorted(totais.items(), key=lambda item: -item[1][0]):
+        aba.append([
+            chave,
+            _celula(aba, centavos_para_reais(centavos), FORMATO_REAIS),
+            contagem,
+            len(meses),
+            _celula(aba, centavos_para_reais(centavos) / len(meses), FORMATO_REAIS),
+            _celula(aba, centavos / total_geral if total_geral else 0, "0.0%"),
+        ])
+    aba.append([])
+    aba.append([
+        _celula(aba, "Total", negrito=True),
+        _celula(aba, centavos_para_reais(total_geral), FORMATO_REAIS, negrito=True),
+        sum(contagem for _, contagem, _ in totais.values()),
+    ])
+
+
+# =====================================================
+# 📤 Exportação
+# =====================================================
+
+def gerar_excel_contas(meses_e_contas):
+    """
+    Gera a planilha com uma aba por mês e abas de resumo por conta e por pagador.
+
+    As contas são consumidas mês a mês: cada mês é escrito no arquivo e
+    descartado antes do próximo, e dos resumos só os totais ficam em memória.
+
+    Parâmetros:
+        meses_e_contas (iterable): Tuplas (mes, ano, df) em ordem cronológica;
+            pode ser um gerador (ex: `iterar_meses_intervalo`).
+
+    Retorno:
+        ArquivoTemporario | None: Planilha pronta para download, ou None se não houver contas.
+
+    Erros:
+        DadosIncompletos: Repassado de `meses_e_contas` (a planilha é descartada).
+    """
+    workbook = Workbook(write_only=True)
+    cabecalho_resumo = ["Total", "Lançamentos", "Meses", "Média por Mês", "% do Total"]
+    # Criadas antes das abas mensais para aparecerem primeiro; preenchidas no final
+    aba_contas = _criar_aba(workbook, "Resumo por Conta", ["Conta"] + cabecalho_resumo, [28, 16, 13, 9, 16, 11])
+    aba_pagadores = _criar_aba(workbook, "Resumo por Pagador", ["Pagador"] + cabecalho_resumo, [28, 16, 13, 9, 16, 11])
+
+    totais_conta, totais_pagador = {}, {}
+    try:
+        for mes, ano, df in meses_e_contas:
+            if df is not None and not df.empty:
+                _escrever_aba_mes(workbook, int(mes), int(ano), df, totais_conta, totais_pagador)
+    except BaseException:
+        _descartar_abas(workbook)
+        raise
+
+    if not totais_conta:
+        _descartar_abas(workbook)
+        return None
+
+    total_geral = sum(centavos for centavos, _, _ in totais_conta.values())
+    _escrever_resumo(aba_contas, totais_conta, total_geral)
+    _escrever_resumo(aba_pagadores, totais_pagador, total_geral)
+
+    arquivo = tempfile.SpooledTemporaryFile(max_size=LIMITE_EXCEL_EM_MEMORIA)
+    workbook.save(arquivo)
+    arquivo.seek(0)
+    return ArquivoTemporario(arquivo)
+
+
+def _descartar_abas(workbook):
+    """Fecha os arquivos temporários das abas já criadas de uma planilha que não será salva."""
+    for aba in workbook.worksheets:
+        aba.close()
+
+
+def iterar_meses_intervalo(mes_inicio, ano_inicio, mes_fim, ano_fim, meses_por_bloco=MESES_POR_BLOCO):
+    """
+    Percorre as contas de um intervalo mês a mês, buscando `meses_por_bloco`
+    meses por requisição (`carregar_intervalo`).
+
+    Retorno:
+        generator: Tuplas (mes, ano, df), incluindo meses sem contas (df vazio).
+
+    Erros:
+        DadosIncompletos: Se algum bloco não puder ser lido (erro ou prazo esgotado).
+    """
+    meses = listar_meses(mes_inicio, ano_inicio, mes_fim, ano_fim)
+    for inicio in range(0, len(meses), meses_por_bloco):
+        bloco = meses[inicio:inicio + meses_por_bloco]
+        (mes_i, ano_i), (mes_f, ano_f) = bloco[0], bloco[-1]
+        df_bloco = carregar_intervalo(mes_i, ano_i, mes_f, ano_f, estrito=True)
+        if df_bloco is None:
+            raise DadosIncompletos(f"meses {mes_i:02d}/{ano_i} a {mes_f:02d}/{ano_f}")
+
+        por_mes = {}
+        if not df_bloco.empty:
+            chave_mes = df_bloco["mes"].astype(int) + 100 * df_bloco["ano"].astype(int)
+            por_mes = {int(chave): grupo for chave, grupo in df_bloco.groupby(chave_mes)}
+        del df_bloco
+
+        for mes, ano in bloco:
+            yield mes, ano, por_mes.pop(mes + 100 * ano, pd.DataFrame())
+
+
+def gerar_excel_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim):
+    """
+    Exporta para Excel todas as contas de um intervalo de meses (inclusive).
+
+    Retorno:
+        ArquivoTemporario | None: Planilha pronta para download, ou None se não houver contas.
+
+    Erros:
+        DadosIncompletos: Se algum bloco de meses não puder ser lido do Supabase.
+    """
+    return gerar_excel_contas(iterar_meses_intervalo(mes_inicio, ano_inicio, mes_fim, ano_fim))
+
+
+def gerar_excel_mes(df, mes, ano):
+    """
+    Exporta para Excel as contas de um mês já carregado (ex: tela do mês).
+
+    Retorno:
+        ArquivoTemporario | None: Planilha pronta para download, ou None se não houver contas.
+    """
+    return gerar_excel_contas([(mes, ano, df)])
@@ -0,0 +1,85 @@
+# ====================================
+# 💲 FORMATAÇÃO DE VALORES EM REAIS (pt-BR)
+# ====================================
+
+import numpy as np
+import pandas as pd
+
+
+def _montar_textos(inteiros, negativos, centavos):
+    """
+    Monta os textos a partir dos valores já arredondados (em centavos ou em reais).
+
+    O separador de milhar do Python (`,`) é trocado por `.`; os centavos são
+    acrescentados com vírgula, já no padrão brasileiro.
+    """
+    prefixos = np.where(negativos, "-R$ ", "R$ ").tolist()
+    if not centavos:
+        return [f"{p}{r:,}".replace(",", ".") for p, r in zip(prefixos, inteiros.tolist())]
+
+    reais, resto = np.divmod(inteiros, 100)
+    return [
+        f"{p}{r:,}".replace(",", ".") + f",{c:02d}"
+        for p, r, c in zip(prefixos, reais.tolist(), resto.tolist())
+    ]
+
+
+def formatar_brl(valor, centavos=True):
+    """
+    Formata um único valor em reais no padrão brasileiro.
+
+    Parâmetros:
+        valor (float | int): Valor em reais.
+        centavos (bool): Se False, arredonda para reais inteiros.
+
+    Retorno:
+        str: Ex: 'R$ 1.234,56' ou '-R$ 10,00'.
+    """
+    return formatar_brl_serie([valor], centavos=centavos).iloc[0]
+
+
+def formatar_brl_serie(valores, centavos=True):
+    """
+    Formata uma coluna inteira de valores em reais de uma vez.
+
+    A conversão numérica, o arredondamento e o sinal são calculados de forma
+    vetorizada; os textos são montados em uma única passada, sem `iterrows`.
+    Valores ausentes ou inválidos são tratados como zero.
+
+    Parâmetros:
+        valores (pd.Series | array-like): Valores em reais.
+        centavos (bool): Se False, arredonda para reais inteiros.
+
+    Retorno:
+        pd.Series: Textos no formato 'R$ 1.234,56', com o mesmo índice da entrada.
+    """
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(valores)
+    numeros = pd.to_numeric(serie, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+    escala = 100 if centavos else 1
+    inteiros = np.rint(np.abs(numeros) * escala).astype(np.int64)
+    negativos = (numeros < 0) & (inteiros > 0)  # "-R$ 0,00" não existe
+
+    return pd.Series(_montar_textos(inteiros, negativos, centavos), index=serie.index, dtype=object)
+
+
+def formatar_brl_centavos(valores_centavos):
+    """
+    Formata valores já em centavos inteiros (ex: coluna `valor_centavos`),
+    sem passar por float: o texto corresponde exatamente ao valor somado.
+
+    Parâmetros:
+        valores_centavos (pd.Series | array-like | int): Centavos (int64).
+
+    Retorno:
+        pd.Series | str: Textos no formato 'R$ 1.234,56' (str se a entrada for um escalar).
+    """
+    if np.isscalar(valores_centavos):
+        return formatar_brl_centavos([valores_centavos]).iloc[0]
+
+    serie = valores_centavos if isinstance(valores_centavos, pd.Series) else pd.Series(valores_centavos)
+    inteiros = serie.to_numpy(dtype=np.int64)
+
+    return pd.Series(
+        _montar_textos(np.abs(inteiros), inteiros < 0, centavos=True), index=serie.index, dtype=object
+    )
@@ -3,18 +3,89 @@
 # ====================================
 
 import os
+from io import BytesIO
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # backend sem interface gráfica: só gera imagens
 import matplotlib.pyplot as plt
 from datetime import datetime
+from PIL import Image
+
+from relatorio.formatacao import formatar_brl, formatar_brl_serie
+from relatorio.utils import (
+    calcular_limites_eixo_y,
+    calcular_periodos_referencia,
+    montar_comparativo_periodos,
+    pivotar_contas_periodo,
+)
+from supabase import somar_valores_por
+
+
+# =====================================================
+# 💾 Exportação de figuras (raster ou vetorial)
+# =====================================================
+
+# Sem data/criador no SVG: o conteúdo fica determinístico e o fpdf não
+# reclama da tag <metadata>, que ele não suporta
+_METADADOS_SVG = {"Date": None, "Creator": None, "Format": None, "Type": None}
+
+
+def salvar_figura(fig, destino=None, formato="png", dpi=None, cores=None):
+    """
+    Salva a figura no destino informado e fecha-a.
+
+    Parâmetros:
+        fig (Figure): Figura matplotlib.
+        destino (str | BytesIO, opcional): Caminho ou buffer. Se None, cria um BytesIO.
+        formato (str): 'png' (raster) ou 'svg' (vetorial, embutido pelo fpdf2).
+        dpi (int, opcional): Resolução do PNG. None usa o padrão do matplotlib (100).
+        cores (int, opcional): Reduz o PNG a uma paleta com esse número de cores.
+            Gráficos usam poucas cores, então o arquivo encolhe sem perda visível.
+
+    Retorno:
+        str | BytesIO: O destino, com buffers posicionados no início.
+    """
+    if destino is None:
+        destino = BytesIO()
+
+    if formato == "svg":
+        fig.savefig(destino, format="svg", metadata=_METADADOS_SVG)
+    elif cores:
+        bruto = BytesIO()
+        fig.savefig(bruto, format="png", dpi=dpi)
+        bruto.seek(0)
+        Image.open(bruto).convert("RGB").quantize(cores).save(destino, format="PNG", optimize=True)
+    else:
+        fig.savefig(destino, format="png", dpi=dpi)
+    plt.close(fig)
+
+    if hasattr(destino, "seek"):
+        destino.seek(0)
+    return destino
 
 
 # =====================================================
 # 🍕 Gráfico de Pizza: Gastos por Categoria
 # =====================================================
 
-def gerar_grafico_pizza_periodo(df, nome_arquivo):
-    categorias = df.groupby('nome_da_conta')['valor'].sum().sort_values(ascending=False)
+def gerar_grafico_pizza_periodo(df, nome_arquivo, categorias=None, **opcoes_imagem):
+    """
+    Gera o gráfico de pizza de gastos por categoria (5 maiores + "Outros").
+
+    Parâmetros:
+        df (pd.DataFrame): Contas com 'nome_da_conta' e 'valor'.
+        nome_arquivo (str | BytesIO): Caminho ou buffer de saída.
+        categorias (pd.Series, opcional): Totais por conta já calculados
+            (ex: da matriz do período), dispensando o agrupamento de `df`.
+        **opcoes_imagem: Repassadas a `salvar_figura` (formato, dpi, cores).
+
+    Retorno:
+        str | BytesIO: O mesmo destino recebido em `nome_arquivo`.
+    """
+    if categorias is None:
+        categorias = somar_valores_por(df, 'nome_da_conta')
+    categorias = categorias.sort_values(ascending=False)
     total_gastos = categorias.sum()
 
     if len(categorias) > 6:
@@ -66,12 +137,14 @@ def gerar_grafico_pizza_periodo(df, nome_arquivo):
 
     # Legenda: inclui percentual se não foi mostrado dentro
     legendas = []
-    for nome, valor in zip(categorias_ordenadas.index, categorias_ordenadas):
+    valores_fmt = formatar_brl_serie(categorias_ordenadas)
+    for nome, valor, valor_fmt in zip(categorias_ordenadas.index, categorias_ordenadas, valores_fmt):
         pct = valor / total_gastos * 100
         if pct < 6:
-            legendas.append(f"{nome}: R$ {valor:,.2f} ({pct:.1f}%)".replace('.', ','))
+            pct_fmt = f"{pct:.1f}%".replace('.', ',')
+            legendas.append(f"{nome}: {valor_fmt} ({pct_fmt})")
         else:
-            legendas.append(f"{nome}: R$ {valor:,.2f}".replace('.', ','))
+            legendas.append(f"{nome}: {valor_fmt}")
 
     ax.legend(
         wedges,
@@ -85,9 +158,7 @@ def gerar_grafico_pizza_periodo(df, nome_arquivo):
 
     plt.title("Gastos por Categoria no Período")
     plt.tight_layout()
-    plt.savefig(nome_arquivo)
-    plt.close()
-    return nome_arquivo
+    return salvar_figura(fig, nome_arquivo, **opcoes_imagem)
 
 
 
@@ -114,40 +185,19 @@ def gerar_grafico_comparativo_linha(df, nome_conta, mes_inicio, ano_inicio, mes_
     ax.plot(df["periodo"], df["valor_total"], marker="o", linestyle="-", color="#4FC3F7", linewidth=2)
 
     # ===== Escala dinâmica com range mínimo =====
-    y_min = float(df["valor_total"].min())
-    y_max = float(df["valor_total"].max())
-    data_range = y_max - y_min
-
-    # range mínimo (evita “explodir” o gráfico por diferença de centavos)
-    min_visual_range = max(10.0, 0.2 * max(y_max, 1.0))  # 10 reais ou 20% do valor típico
-
-    if data_range < min_visual_range:
-        # Expande em torno do valor médio
-        mid = (y_min + y_max) / 2.0
-        y_range = min_visual_range
-        pad_up = 0.12 * y_range
-        pad_dn = 0.10 * y_range
-        bottom = max(0.0, mid - y_range / 2.0 - pad_dn)
-        top = mid + y_range / 2.0 + pad_up
-    else:
-        # Usa range real + margens proporcionais
-        y_range = data_range
-        pad_up = 0.12 * y_range
-        pad_dn = 0.10 * y_range
-        bottom = max(0.0, y_min - pad_dn)
-        top = y_max + pad_up
-
+    bottom, top, y_range = calcular_limites_eixo_y(df["valor_total"])
     ax.set_ylim(bottom=bottom, top=top)
 
     # ===== Rótulos dos pontos (proporcionais ao range + clamp) =====
-    for i, valor in enumerate(df["valor_total"]):
+    rotulos_valores = formatar_brl_serie(df["valor_total"])
+    for i, (valor, rotulo) in enumerate(zip(df["valor_total"], rotulos_valores)):
         desloc = (0.04 * y_range) if (i % 2 == 0) else (-0.06 * y_range)
         y_text = float(valor) + desloc
         # mantém o texto dentro do gráfico
         y_text = min(top - 0.04 * y_range, max(bottom + 0.04 * y_range, y_text))
         va = 'bottom' if desloc > 0 else 'top'
         ax.annotate(
-            f"R$ {float(valor):.2f}",
+            rotulo,
             xy=(i, float(valor)),
             xytext=(i, y_text),
             textcoords='data',
@@ -163,7 +213,7 @@ def gerar_grafico_comparativo_linha(df, nome_conta, mes_inicio, ano_inicio, mes_
 
     # Linha de média
     media = float(df["valor_total"].mean())
-    ax.axhline(media, linestyle="--", color="gray", linewidth=1.2, label=f"Média da conta: R$ {media:.2f}")
+    ax.axhline(media, linestyle="--", color="gray", linewidth=1.2, label=f"Média da conta: {formatar_brl(media)}")
     ax.legend(loc="upper center", bbox_to_anchor=(0.5, 1.20), fontsize=9, frameon=False)
 
     # Limpeza estética
@@ -186,112 +236,278 @@ def gerar_grafico_comparativo_linha(df, nome_conta, mes_inicio, ano_inicio, mes_
 
 
 # =====================================================
-# 📊 Gráfico comparativo duplo: mês anterior e ano anterior
+# 📈 Várias contas sobrepostas (linhas ou área empilhada)
 # =====================================================
-def gerar_grafico_comparativo_duplo(df_atual, df_mes_anterior, df_ano_passado, nome_arquivo):
+
+def gerar_grafico_comparativo_contas(df, contas, mes_inicio, ano_inicio, mes_fim, ano_fim, modo="linhas"):
     """
-    Gera um gráfico comparativo horizontal em barras duplas com:
-    - Comparação do mês atual vs mês anterior
-    - Comparação do mês atual vs mesmo mês do ano anterior
+    Gráfico com várias contas no mesmo eixo de tempo: linhas sobrepostas
+    (meses sem lançamento ficam em branco) ou área empilhada (total do grupo).
 
     Parâmetros:
-        df_atual (pd.DataFrame): Dados do mês atual.
-        df_mes_anterior (pd.DataFrame): Dados do mês anterior.
-        df_ano_passado (pd.DataFrame): Dados do mesmo mês do ano anterior.
-        nome_arquivo (str): Caminho de saída para salvar o gráfico gerado (.png).
+        df (pd.DataFrame): Saída de `carregar_dados_contas_periodo`
+            (['nome_da_conta', 'ano', 'mes', 'valor_total']).
+        contas (list): Contas a desenhar, na ordem da legenda.
+        mes_inicio, ano_inicio, mes_fim, ano_fim (int): Período (título).
+        modo (str): "linhas" ou "area".
 
     Retorno:
-        str: Caminho do arquivo de imagem gerado.
+        matplotlib.figure.Figure
     """
-    contas_desejadas = ["Condomínio", "Luz", "Empregada", "Cartão de crédito", "Gás"]
-
-    # ------------------------
-    # Preparo dos dados
-    # ------------------------
-    def preparar(df, label):
-        if df is None or df.empty or 'nome_da_conta' not in df.columns:
-            return pd.DataFrame({
-                "nome_da_conta": contas_desejadas,
-                label: [0] * len(contas_desejadas)
-            })
-        df_filtrado = df[df['nome_da_conta'].isin(contas_desejadas)]
-        return (
-            df_filtrado
-            .groupby("nome_da_conta")["valor"]
-            .sum()
-            .reindex(contas_desejadas)
-            .fillna(0)
-            .reset_index()
-            .rename(columns={"valor": label})
+    if df.empty:
+        raise ValueError("DataFrame de entrada está vazio.")
+
+    tabela = pivotar_contas_periodo(df, contas)
+    rotulos = [f"{int(m):02d}/{int(a)}" for a, m in tabela.index]
+    x = np.arange(len(rotulos))
+
+    fig, ax = plt.subplots(figsize=(10, 4.5))
+    if modo == "area":
+        ax.stackplot(x, tabela.to_numpy(dtype=float).T, labels=tabela.columns.tolist(), alpha=0.85)
+        total = tabela.sum(axis=1).to_numpy(dtype=float)
+        ax.annotate(
+            f"Total: {formatar_brl(total[-1])}", xy=(x[-1], total[-1]), xytext=(0, 6),
+            textcoords="offset points", ha="right", fontsize=8,
         )
+    else:
+        for conta in tabela.columns:
+            valores = tabela[conta].where(tabela[conta] != 0).to_numpy(dtype=float)
+            ax.plot(x, valores, marker="o", markersize=3, linewidth=1.8, label=conta)
+
+    titulo = f"Comparativo de contas - {mes_inicio:02d}/{ano_inicio} a {mes_fim:02d}/{ano_fim}"
+    ax.set_title(titulo, fontsize=14, pad=36)
+    ax.legend(loc="lower center", bbox_to_anchor=(0.5, 1.0), ncol=min(len(tabela.columns), 4), fontsize=9, frameon=False)
+
+    passo = max(1, len(rotulos) // 24)
+    ax.set_xticks(x[::passo])
+    ax.set_xticklabels(rotulos[::passo], rotation=45)
+    ax.yaxis.set_major_formatter(lambda v, _: formatar_brl(v, centavos=False))
+    ax.tick_params(axis="y", labelsize=8)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.grid(axis="y", alpha=0.3)
+
+    fig.subplots_adjust(top=0.80, bottom=0.20)
+    return fig
+
+
+# =====================================================
+# 🔲 Pequenos múltiplos: todas as contas em uma grade
+# =====================================================
 
-    atual = preparar(df_atual, "Atual")
-    anterior = preparar(df_mes_anterior, "Anterior")
-    ano_passado = preparar(df_ano_passado, "Ano Passado")
-
-    df_anterior = pd.merge(anterior, atual, on="nome_da_conta")
-    df_ano = pd.merge(ano_passado, atual, on="nome_da_conta")
-
-    # ------------------------
-    # Criação do gráfico
-    # ------------------------
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 7), sharey=True)
-    y = np.arange(len(contas_desejadas))
-    width = 0.35
-
-    def plot_duplo(ax, df, col_ref, col_atual, titulo, cor_ref, cor_atual, label_ref, label_atual):
-        ax.barh(y - width/2, df[col_ref], height=width, label=label_ref, color=cor_ref)
-        ax.barh(y + width/2, df[col_atual], height=width, label=label_atual, color=cor_atual)
-        for i in y:
-            v_ref = df[col_ref][i]
-            v_atual = df[col_atual][i]
-            ax.text(v_ref / 2, i - width/2, f"         R$ {int(v_ref)}", ha='center', va='center', fontsize=8, color='black')
-            ax.text(v_atual / 2, i + width/2, f"         R$ {int(v_atual)}", ha='center', va='center', fontsize=8, color='black')
-
-        ax.set_yticks(y)
-        ax.set_yticklabels(contas_desejadas)
-        ax.invert_yaxis()
-        ax.set_title(titulo)
-        # Criação da legenda com ordem customizada
-        handles, labels = ax.get_legend_handles_labels()
-        ax.legend(
-            handles[::-1], labels[::-1],  # inverte ordem: Atual em cima
-            loc='lower right',
-            fontsize=9
+def gerar_grafico_multiplos_contas(matriz, contas, colunas=3, linhas_por_figura=5):
+    """
+    Desenha um painel pequeno (estilo sparkline) por conta, em grades que
+    compartilham o eixo X (meses do período). Substitui um gráfico de linha
+    por conta: o custo de montar/salvar figuras cresce por grade, não por conta.
+
+    Parâmetros:
+        matriz (dict): Matriz do período (`montar_matriz_periodo`).
+        contas (list): Contas a desenhar (ex: retorno de `contas_recorrentes`).
+        colunas (int): Painéis por linha da grade.
+        linhas_por_figura (int): Linhas de painéis por figura (uma figura por página).
+
+    Retorno:
+        list[Figure]: Figuras geradas (vazia se não houver contas).
+    """
+    if not contas:
+        return []
+
+    # Conta × período, com meses sem lançamento em branco (NaN)
+    valores_contas = matriz["valores"].loc[contas].where(matriz["contagem"].loc[contas] > 0)
+    rotulos = [f"{int(mes):02d}/{int(ano)}" for ano, mes in valores_contas.columns]
+    x = np.arange(len(rotulos))
+    passo_rotulos = max(1, len(rotulos) // 6)  # no máximo ~6 rótulos no eixo X
+
+    por_figura = colunas * linhas_por_figura
+    figuras = []
+    for inicio in range(0, len(contas), por_figura):
+        contas_figura = contas[inicio:inicio + por_figura]
+        linhas = -(-len(contas_figura) // colunas)  # divisão arredondando para cima
+
+        fig, eixos = plt.subplots(
+            linhas, colunas,
+            figsize=(10, 1.8 * linhas + 0.6),
+            sharex=True,
+            squeeze=False,
         )
 
+        for ax, conta in zip(eixos.flat, contas_figura):
+            valores = valores_contas.loc[conta].to_numpy(dtype=float)
+            media = np.nanmean(valores)
+
+            ax.plot(x, valores, marker="o", markersize=2.5, linewidth=1.4, color="#4FC3F7")
+            ax.axhline(media, linestyle="--", color="gray", linewidth=0.8)
+            ax.set_title(conta, fontsize=9, loc="left")
+
+            # Último valor e média no canto do painel
+            ultimo = valores[~np.isnan(valores)][-1]
+            ax.text(
+                0.99, 0.95, f"últ. {formatar_brl(ultimo, centavos=False)} | méd. {formatar_brl(media, centavos=False)}",
+                transform=ax.transAxes, ha="right", va="top", fontsize=6.5, color="#555555",
+            )
+
+            ax.spines["top"].set_visible(False)
+            ax.spines["right"].set_visible(False)
+            ax.tick_params(labelsize=6.5, length=2)
+            ax.margins(y=0.25)
+
+        # Painéis sobrando na última linha da grade
+        for ax in list(eixos.flat)[len(contas_figura):]:
+            ax.set_visible(False)
+
+        # Rótulos do eixo X no último painel visível de cada coluna
+        for coluna in range(colunas):
+            visiveis = [ax for ax in eixos[:, coluna] if ax.get_visible()]
+            if visiveis:
+                ax = visiveis[-1]
+                ax.set_xticks(x[::passo_rotulos])
+                ax.set_xticklabels(rotulos[::passo_rotulos], rotation=45)
+                ax.xaxis.set_tick_params(labelbottom=True)
+
+        fig.tight_layout()
+        figuras.append(fig)
+
+    return figuras
 
-    # ------------------------
-    # Títulos e rótulos de tempo
-    # ------------------------
-    mes_ano_atual = df_atual.iloc[0]["mes"]
-    ano_atual = df_atual.iloc[0]["ano"]
-    nome_mes = datetime(1900, mes_ano_atual, 1).strftime("%B").capitalize()
-
-    mes_ano_anterior = (datetime(ano_atual, mes_ano_atual, 1) - pd.DateOffset(months=1)).strftime("%B/%Y")
-    ano_anterior = f"{nome_mes}/{ano_atual - 1}"
-    atual_label = f"{nome_mes}/{ano_atual}"
-
-    # ------------------------
-    # Gerar os dois gráficos comparativos
-    # ------------------------
-    plot_duplo(
-        ax1, df_anterior,
-        col_ref="Anterior", col_atual="Atual",
-        titulo=f"Comparativo com {mes_ano_anterior}",
-        cor_ref="#f58518", cor_atual="#4c78a8",
-        label_atual=atual_label, label_ref=mes_ano_anterior,
-    )
 
-    plot_duplo(
-        ax2, df_ano,
-        col_ref="Ano Passado", col_atual="Atual",
-        titulo=f"Comparativo com {ano_anterior}",
-        cor_ref="#54a24b", cor_atual="#4c78a8",
-        label_atual=atual_label, label_ref=ano_anterior
+# =====================================================
+# 📒 Saldo acumulado entre pagadores
+# =====================================================
+
+def gerar_grafico_saldo_acumulado(livro, pagador="Roman"):
+    """
+    Barras com o saldo ajustado de cada mês e linha com o saldo acumulado
+    de `pagador` (acima de zero: os outros devem a ele).
+
+    Parâmetros:
+        livro (pd.DataFrame): Resultado de `calcular_livro_saldos`.
+        pagador (str): Pagador cuja perspectiva é desenhada.
+
+    Retorno:
+        matplotlib.figure.Figure
+    """
+    rotulos = [f"{int(m):02d}/{int(a)}" for a, m in zip(livro["ano"], livro["mes"])]
+    mensal = livro[f"saldo_ajustado_{pagador}"].to_numpy(dtype=float)
+    acumulado = livro[f"acumulado_ajustado_{pagador}"].to_numpy(dtype=float)
+    x = np.arange(len(rotulos))
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+    cores = np.where(mensal >= 0, "#81C784", "#E57373")
+    ax.bar(x, mensal, color=cores, width=0.6, label="Saldo do mês (ajustado)")
+    ax.plot(x, acumulado, marker="o", color="#4FC3F7", linewidth=2, label="Saldo acumulado")
+    ax.axhline(0, color="#888888", linewidth=0.8)
+
+    ax.annotate(
+        formatar_brl(acumulado[-1]),
+        xy=(x[-1], acumulado[-1]),
+        xytext=(0, 8),
+        textcoords="offset points",
+        ha="center",
+        fontsize=9,
     )
-    
+
+    ax.set_title(f"Saldo acumulado de {pagador} no período", fontsize=14)
+    passo = max(1, len(rotulos) // 24)  # períodos longos: no máximo ~24 rótulos
+    ax.set_xticks(x[::passo])
+    ax.set_xticklabels(rotulos[::passo], rotation=45)
+    ax.legend(loc="upper left", fontsize=9, frameon=False)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+
+    fig.subplots_adjust(bottom=0.20)
+    return fig
+
+
+# =====================================================
+# 📊 Gráfico comparativo entre K períodos
+# =====================================================
+
+# Contas comparadas no relatório mensal quando nenhuma lista é informada
+CONTAS_COMPARATIVO_PADRAO = ["Condomínio", "Luz", "Empregada", "Cartão de crédito", "Gás"]
+
+_CORES_PERIODOS = ["#4c78a8", "#f58518", "#54a24b", "#e45756", "#72b7b2", "#b279a2", "#ff9da6", "#9d755d"]
+
+
+def _rotulo_periodo(ano, mes):
+    return datetime(int(ano), int(mes), 1).strftime("%B/%Y").capitalize()
+
+
+def gerar_grafico_comparativo_periodos(tabela, nome_arquivo, titulo=None, **opcoes_imagem):
+    """
+    Gera um gráfico de barras horizontais agrupadas: uma barra por período
+    para cada conta, com qualquer número de períodos e de contas.
+
+    Parâmetros:
+        tabela (pd.DataFrame): Saída de `montar_comparativo_periodos`
+            (contas × períodos (ano, mes), valores em reais).
+        nome_arquivo (str | BytesIO): Caminho (.png) ou buffer de saída.
+        titulo (str, opcional): Título do gráfico.
+        **opcoes_imagem: Repassadas a `salvar_figura` (formato, dpi, cores).
+
+    Retorno:
+        str | BytesIO: O mesmo destino recebido em `nome_arquivo`.
+    """
+    contas = tabela.index.tolist()
+    periodos = tabela.columns.tolist()
+    k = max(len(periodos), 1)
+
+    y = np.arange(len(contas))
+    altura = 0.8 / k
+    fig, ax = plt.subplots(figsize=(12, max(3.5, 0.32 * k * len(contas) + 1.5)))
+
+    valores = tabela.to_numpy(dtype=float)
+    for j, (ano, mes) in enumerate(periodos):
+        deslocamento = (j - (k - 1) / 2) * altura
+        barras = ax.barh(
+            y + deslocamento, valores[:, j], height=altura,
+            label=_rotulo_periodo(ano, mes), color=_CORES_PERIODOS[j % len(_CORES_PERIODOS)],
+        )
+        ax.bar_label(
+            barras, labels=formatar_brl_serie(valores[:, j], centavos=False).tolist(),
+            padding=3, fontsize=7 if k > 3 else 8,
+        )
+
+    ax.set_yticks(y)
+    ax.set_yticklabels(contas)
+    ax.invert_yaxis()
+    ax.margins(x=0.15)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.set_title(titulo or "Comparativo entre períodos", pad=28)
+    ax.legend(loc="lower center", bbox_to_anchor=(0.5, 1.0), ncol=min(k, 4), fontsize=9, frameon=False)
+
     plt.tight_layout()
-    plt.savefig(nome_arquivo)
-    plt.close()
-    return nome_arquivo
\ No newline at end of file
+    return salvar_figura(fig, nome_arquivo, **opcoes_imagem)
+
+
+# =====================================================
+# 📊 Gráfico comparativo duplo: mês anterior e ano anterior
+# =====================================================
+def gerar_grafico_comparativo_duplo(df_atual, df_mes_anterior, df_ano_passado, nome_arquivo, **opcoes_imagem):
+    """
+    Compara o mês atual com o mês anterior e com o mesmo mês do ano anterior
+    nas contas de `CONTAS_COMPARATIVO_PADRAO`.
+
+    Mantida por compatibilidade: monta a tabela com `montar_comparativo_periodos`
+    e desenha com `gerar_grafico_comparativo_periodos`.
+
+    Parâmetros:
+        df_atual (pd.DataFrame): Dados do mês atual.
+        df_mes_anterior (pd.DataFrame): Dados do mês anterior.
+        df_ano_passado (pd.DataFrame): Dados do mesmo mês do ano anterior.
+        nome_arquivo (str | BytesIO): Caminho (.png) ou buffer de saída para o gráfico gerado.
+        **opcoes_imagem: Repassadas a `salvar_figura` (formato, dpi, cores).
+
+    Retorno:
+        str | BytesIO: O mesmo destino recebido em `nome_arquivo`.
+    """
+    periodos = calcular_periodos_referencia(df_atual.iloc[0]["mes"], df_atual.iloc[0]["ano"])
+    df_todos = pd.concat(
+        [df for df in (df_atual, df_mes_anterior, df_ano_passado) if df is not None and not df.empty],
+        ignore_index=True,
+    )
+    tabela = montar_comparativo_periodos(df_todos, periodos, contas=CONTAS_COMPARATIVO_PADRAO)
+    return gerar_grafico_comparativo_periodos(
+        tabela, nome_arquivo, titulo=f"Comparativo de {_rotulo_periodo(*tabela.columns[0])}", **opcoes_imagem
+    )
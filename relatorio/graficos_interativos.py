@@ -0,0 +1,140 @@
+# ====================================
+# 🖱️ GRÁFICOS INTERATIVOS (Vega-Lite via Altair)
+# ====================================
+# Renderizados no navegador: o servidor envia só a série agregada
+# (período, valor), sem matplotlib nem imagem rasterizada.
+
+import altair as alt
+import pandas as pd
+
+from relatorio.formatacao import formatar_brl, formatar_brl_serie
+from relatorio.utils import calcular_limites_eixo_y, pivotar_contas_periodo
+
+
+# =====================================================
+# 📈 Gráfico de Linha interativo: Conta ao longo do tempo
+# =====================================================
+
+def gerar_grafico_interativo_linha(df, nome_conta, mes_inicio, ano_inicio, mes_fim, ano_fim):
+    """
+    Versão interativa de `gerar_grafico_comparativo_linha`, para `st.altair_chart`:
+    mesma escala com range mínimo e mesma linha de média, com zoom/arraste
+    no eixo X e tooltip com o valor de cada mês.
+
+    Parâmetros:
+        df (pd.DataFrame): Colunas ['ano', 'mes', 'valor_total'] (ex: `carregar_dados_conta_periodo`).
+        nome_conta (str): Nome da conta (título).
+        mes_inicio, ano_inicio, mes_fim, ano_fim (int): Período (título).
+
+    Retorno:
+        alt.LayerChart: Gráfico pronto para `st.altair_chart(..., use_container_width=True)`.
+    """
+    if df.empty or "mes" not in df.columns or "ano" not in df.columns or "valor_total" not in df.columns:
+        raise ValueError("DataFrame de entrada está vazio ou incompleto.")
+
+    dados = pd.DataFrame({
+        "periodo": pd.to_datetime({"year": df["ano"].astype(int), "month": df["mes"].astype(int), "day": 1}),
+        "valor_total": df["valor_total"].astype(float).to_numpy(),
+        "valor_fmt": formatar_brl_serie(df["valor_total"]).to_numpy(),
+    })
+
+    bottom, top, _ = calcular_limites_eixo_y(dados["valor_total"])
+    media = float(dados["valor_total"].mean())
+    rotulo_media = f"Média da conta: {formatar_brl(media)}"
+
+    eixo_x = alt.X("periodo:T", title=None, axis=alt.Axis(format="%m/%Y", labelAngle=-45))
+    eixo_y = alt.Y(
+        "valor_total:Q", title=None, scale=alt.Scale(domain=[bottom, top], zero=False, nice=False)
+    )
+
+    linha = (
+        alt.Chart(dados)
+        .mark_line(point=alt.OverlayMarkDef(size=50), color="#4FC3F7", strokeWidth=2)
+        .encode(
+            x=eixo_x,
+            y=eixo_y,
+            tooltip=[
+                alt.Tooltip("periodo:T", title="Mês", format="%m/%Y"),
+                alt.Tooltip("valor_fmt:N", title="Valor"),
+            ],
+        )
+    )
+
+    linha_media = (
+        alt.Chart(pd.DataFrame({"media": [media], "rotulo": [rotulo_media]}))
+        .mark_rule(color="gray", strokeDash=[6, 4], strokeWidth=1.2)
+        .encode(y="media:Q", tooltip=alt.Tooltip("rotulo:N", title="Média"))
+    )
+
+    titulo = f"Comparativo de conta '{nome_conta}' - {mes_inicio:02d}/{ano_inicio} a {mes_fim:02d}/{ano_fim}"
+    return (
+        alt.layer(linha, linha_media)
+        .properties(title=alt.TitleParams(titulo, subtitle=[rotulo_media]), height=360)
+        .interactive(bind_y=False)  # zoom/arraste só no tempo: o eixo Y mantém o range mínimo
+    )
+
+
+# =====================================================
+# 📈 Várias contas sobrepostas, interativo
+# =====================================================
+
+def gerar_grafico_interativo_contas(df, contas, mes_inicio, ano_inicio, mes_fim, ano_fim, modo="linhas"):
+    """
+    Versão interativa de `gerar_grafico_comparativo_contas`: linhas
+    sobrepostas ou área empilhada, com tooltip e destaque pela legenda.
+
+    Parâmetros:
+        df (pd.DataFrame): Saída de `carregar_dados_contas_periodo`.
+        contas (list): Contas a desenhar, na ordem da legenda.
+        mes_inicio, ano_inicio, mes_fim, ano_fim (int): Período (título).
+        modo (str): "linhas" ou "area".
+
+    Retorno:
+        alt.Chart: Gráfico pronto para `st.altair_chart`.
+    """
+    if df.empty:
+        raise ValueError("DataFrame de entrada está vazio.")
+
+    if modo == "area":
+        # Área empilhada precisa de todos os meses (0 sem lançamento)
+        dados = pivotar_contas_periodo(df, contas).stack().rename("valor_total").reset_index()
+    else:
+        dados = df[["nome_da_conta", "ano", "mes", "valor_total"]].copy()
+
+    dados["periodo"] = pd.to_datetime({"year": dados["ano"].astype(int), "month": dados["mes"].astype(int), "day": 1})
+    dados["valor_fmt"] = formatar_brl_serie(dados["valor_total"]).to_numpy()
+    dados = dados[["periodo", "nome_da_conta", "valor_total", "valor_fmt"]]
+
+    destaque = alt.selection_point(fields=["nome_da_conta"], bind="legend")
+    cor = alt.Color("nome_da_conta:N", title="Conta", sort=list(contas))
+    tooltip = [
+        alt.Tooltip("nome_da_conta:N", title="Conta"),
+        alt.Tooltip("periodo:T", title="Mês", format="%m/%Y"),
+        alt.Tooltip("valor_fmt:N", title="Valor"),
+    ]
+    eixo_x = alt.X("periodo:T", title=None, axis=alt.Axis(format="%m/%Y", labelAngle=-45))
+
+    base = alt.Chart(dados)
+    if modo == "area":
+        grafico = base.mark_area().encode(
+            x=eixo_x,
+            y=alt.Y("valor_total:Q", title=None, stack="zero"),
+            color=cor,
+            opacity=alt.condition(destaque, alt.value(0.9), alt.value(0.2)),
+            tooltip=tooltip,
+        )
+    else:
+        grafico = base.mark_line(point=True).encode(
+            x=eixo_x,
+            y=alt.Y("valor_total:Q", title=None, scale=alt.Scale(zero=False)),
+            color=cor,
+            opacity=alt.condition(destaque, alt.value(1.0), alt.value(0.15)),
+            tooltip=tooltip,
+        )
+
+    titulo = f"Comparativo de contas - {mes_inicio:02d}/{ano_inicio} a {mes_fim:02d}/{ano_fim}"
+    return (
+        grafico.add_params(destaque)
+        .properties(title=titulo, height=380)
+        .interactive(bind_y=False)
+    )
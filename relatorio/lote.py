@@ -0,0 +1,133 @@
+# ====================================
+# 🗂️ GERAÇÃO DE RELATÓRIOS MENSAIS EM LOTE
+# ====================================
+# Usada pela linha de comando (`python -m relatorio`), sem Streamlit: as
+# credenciais do Supabase vêm das variáveis de ambiente SUPABASE_URL e SUPABASE_KEY.
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import multiprocessing
+import os
+import shutil
+
+from dateutil.relativedelta import relativedelta
+import pandas as pd
+
+from relatorio.utils import calcular_periodos_referencia
+from supabase import carregar_meses
+
+
+# =====================================================
+# 📆 Meses do lote
+# =====================================================
+
+def listar_meses(mes_inicio, ano_inicio, mes_fim, ano_fim):
+    """
+    Lista os meses de um intervalo (inclusive), em ordem cronológica.
+
+    Retorno:
+        list[tuple]: [(mes, ano), ...]
+    """
+    data_atual = datetime(ano_inicio, mes_inicio, 1)
+    data_fim = datetime(ano_fim, mes_fim, 1)
+    if data_atual > data_fim:
+        data_atual, data_fim = data_fim, data_atual
+
+    meses = []
+    while data_atual <= data_fim:
+        meses.append((data_atual.month, data_atual.year))
+        data_atual += relativedelta(months=1)
+    return meses
+
+
+# =====================================================
+# 🧵 Trabalho de cada processo
+# =====================================================
+
+def _gerar_mes(df_mes, df_referencias, mes, ano, pasta_saida, qualidade):
+    """Gera o PDF de um mês e grava em `pasta_saida`. Roda em um processo separado."""
+    from relatorio.pdf import gerar_relatorio_pdf
+
+    nome_mes = datetime(1900, mes, 1).strftime("%B").capitalize()
+    arquivo_pdf = gerar_relatorio_pdf(df_mes, nome_mes, ano, qualidade=qualidade, df_referencias=df_referencias)
+    if arquivo_pdf is None:
+        return None
+
+    caminho = os.path.join(pasta_saida, f"relatorio_{nome_mes}_{ano}.pdf")
+    with arquivo_pdf, open(caminho, "wb") as destino:
+        shutil.copyfileobj(arquivo_pdf, destino)
+    return caminho
+
+
+# =====================================================
+# 🚀 Lote completo
+# =====================================================
+
+def gerar_relatorios_em_lote(meses, pasta_saida, qualidade="padrao", processos=None, snapshot=None):
+    """
+    Gera o relatório PDF de cada mês informado, em paralelo.
+
+    Todos os meses necessários (os do lote e os de referência do comparativo:
+    mês anterior e mesmo mês do ano anterior) são buscados juntos em uma única
+    requisição; cada processo recebe só os dados do seu mês.
+
+    Parâmetros:
+        meses (list[tuple]): Pares (mes, ano) a gerar.
+        pasta_saida (str): Pasta onde os PDFs serão gravados (criada se não existir).
+        qualidade (str): Chave de QUALIDADES_PDF.
+        processos (int, opcional): Número de processos (padrão: núcleos da máquina).
+        snapshot (str, opcional): Pasta de um snapshot em Parquet; se informada, os
+            meses são lidos dele, sem nenhuma requisição ao Supabase.
+
+    Retorno:
+        list[str]: Caminhos dos PDFs gerados (meses sem contas são ignorados).
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+
+    referencias = {(mes, ano): calcular_periodos_referencia(mes, ano)[1:] for mes, ano in meses}
+    necessarios = list(dict.fromkeys(
+        [tuple(p) for p in meses] + [p for refs in referencias.values() for p in refs]
+    ))
+
+    if snapshot is None:
+        df_todos = carregar_meses(necessarios)
+    else:
+        from supabase import carregar_snapshot_meses  # pyarrow só quando usado
+        df_todos = carregar_snapshot_meses(necessarios, pasta=snapshot)
+    if df_todos.empty:
+        print("Nenhuma conta encontrada para os meses informados.")
+        return []
+
+    chave_mes = df_todos["mes"].astype(int) + 100 * df_todos["ano"].astype(int)
+    por_mes = {
+        (int(chave) % 100, int(chave) // 100): grupo.reset_index(drop=True)
+        for chave, grupo in df_todos.groupby(chave_mes)
+    }
+
+    gerados = []
+    # "spawn": cada processo começa limpo (sem as threads do processo principal)
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as executor:
+        futuros = {}
+        for mes, ano in meses:
+            df_mes = por_mes.get((mes, ano))
+            if df_mes is None:
+                print(f"⏭️  {mes:02d}/{ano}: sem contas")
+                continue
+            partes_referencia = [por_mes[p] for p in referencias[(mes, ano)] if p in por_mes and p != (mes, ano)]
+            df_referencias = pd.concat([df_todos.iloc[0:0], *partes_referencia], ignore_index=True)
+            futuro = executor.submit(_gerar_mes, df_mes, df_referencias, mes, ano, pasta_saida, qualidade)
+            futuros[futuro] = (mes, ano)
+
+        for futuro in as_completed(futuros):
+            mes, ano = futuros[futuro]
+            try:
+                caminho = futuro.result()
+            except Exception as e:
+                print(f"❌ {mes:02d}/{ano}: erro ao gerar o relatório: {e}")
+                continue
+            if caminho:
+                print(f"✅ {mes:02d}/{ano}: {caminho}")
+                gerados.append(caminho)
+
+    return sorted(gerados)
@@ -2,27 +2,55 @@
 # 📄 GERAÇÃO DE RELATÓRIOS EM PDF
 # ====================================
 
-import os
 from io import BytesIO
 from datetime import datetime
+import tempfile
 
-import matplotlib.pyplot as plt
 import pandas as pd
 from fpdf import FPDF
 
+from relatorio.arquivos import ArquivoTemporario
+from relatorio.formatacao import formatar_brl, formatar_brl_centavos, formatar_brl_serie
 from relatorio.graficos import (
-    gerar_grafico_comparativo_duplo,
+    CONTAS_COMPARATIVO_PADRAO,
+    gerar_grafico_comparativo_contas,
     gerar_grafico_comparativo_linha,
+    gerar_grafico_comparativo_periodos,
+    gerar_grafico_multiplos_contas,
     gerar_grafico_pizza_periodo,
+    gerar_grafico_saldo_acumulado,
+    salvar_figura,
 )
+from relatorio.perfil import etapa
 from relatorio.utils import (
-    agrupar_por_mes,
+    calcular_livro_saldos,
+    calcular_periodos_referencia,
     calcular_saldo_entre_pagadores,
-    filtrar_contas_repetidas,
+    contas_recorrentes,
+    iterar_por_mes,
+    montar_comparativo_periodos,
+    montar_matriz_periodo,
+    serie_da_conta,
 )
-from supabase import carregar_mes_referente
+from supabase import COLUNA_CENTAVOS, carregar_agregados, centavos_do_df, centavos_para_reais
 
 
+# =====================================================
+# 🎚️ Qualidade x tamanho dos gráficos no PDF
+# =====================================================
+
+# Opções repassadas a `salvar_figura` para cada nível de qualidade:
+# - compacto: PNG em baixa resolução com paleta de 64 cores (menor arquivo)
+# - padrao:   PNG na resolução padrão com paleta de 256 cores
+# - alta:     PNG em alta resolução, sem redução de cores
+# - vetorial: SVG (nítido em qualquer zoom; gera o PDF mais devagar)
+QUALIDADES_PDF = {
+    "compacto": {"formato": "png", "dpi": 72, "cores": 64},
+    "padrao": {"formato": "png", "dpi": 100, "cores": 256},
+    "alta": {"formato": "png", "dpi": 200, "cores": None},
+    "vetorial": {"formato": "svg", "dpi": None, "cores": None},
+}
+
 # =====================================================
 # 📄 Classe PDF customizada com links clicáveis
 # =====================================================
@@ -31,7 +59,39 @@ class PDF(FPDF):
     """
     Extensão da classe FPDF com método auxiliar para inserção de links inline.
     Ideal para exibir boletos e comprovantes clicáveis diretamente no relatório.
+
+    Também centraliza a inserção de gráficos conforme a qualidade escolhida
+    (ver QUALIDADES_PDF), com compressão dos streams. Imagens repetidas já são
+    embutidas uma única vez pelo próprio fpdf2 (identificadas pelo conteúdo).
     """
+    def __init__(self, *args, qualidade="padrao", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opcoes_imagem = QUALIDADES_PDF[qualidade]
+        self.set_compression(True)
+
+    def inserir_imagem(self, imagem, **posicao):
+        """
+        Insere uma imagem em memória (PNG ou SVG).
+
+        Parâmetros:
+            imagem (BytesIO): Imagem gerada por `salvar_figura`.
+            **posicao: Repassados a `FPDF.image` (x, y, w, h).
+        """
+        with etapa("imagens"):
+            self.image(imagem, **posicao)
+
+    def inserir_figura(self, fig, **posicao):
+        """
+        Renderiza uma figura matplotlib na qualidade do documento, fecha-a e insere no PDF.
+
+        Parâmetros:
+            fig (Figure): Figura a ser inserida.
+            **posicao: Repassados a `FPDF.image` (x, y, w, h).
+        """
+        with etapa("graficos"):
+            imagem = salvar_figura(fig, **self.opcoes_imagem)
+        self.inserir_imagem(imagem, **posicao)
+
     def write_link_inline(self, label, url):
         """
         Escreve um texto com estilo de link sublinhado, clicável, na posição atual.
@@ -47,43 +107,111 @@ class PDF(FPDF):
         self.set_font("Arial", size=10)
 
 # =====================================================
-# 📄 Geração do Relatório PDF do mês atual
+# 💾 Exportação do PDF para arquivo temporário
 # =====================================================
 
-def gerar_relatorio_pdf(df_atual, nome_mes, ano):
-    if df_atual.empty:
-        return None
+# Acima deste tamanho o PDF gerado vai para disco em vez de ficar em memória
+LIMITE_PDF_EM_MEMORIA = 8 * 1024 * 1024  # 8 MB
+
+
+# O leitor é compartilhado com a exportação em Excel; o nome antigo continua valendo
+ArquivoPDF = ArquivoTemporario
+
+
+@etapa("serializacao")
+def _exportar_pdf(pdf):
+    """
+    Finaliza o documento e grava-o em um arquivo temporário "spooled"
+    (em memória até LIMITE_PDF_EM_MEMORIA, depois em disco).
+
+    Parâmetros:
+        pdf (FPDF): Documento já montado.
+
+    Retorno:
+        ArquivoPDF: Arquivo posicionado no início, pronto para leitura/download.
+    """
+    arquivo = tempfile.SpooledTemporaryFile(max_size=LIMITE_PDF_EM_MEMORIA)
+    arquivo.write(pdf.output())
+    pdf.buffer = bytearray()  # libera a cópia mantida pelo fpdf
+    arquivo.seek(0)
+    return ArquivoTemporario(arquivo)
 
-    df_mes_anterior = carregar_mes_referente(df_atual.iloc[0]['mes'], df_atual.iloc[0]['ano'], delta_meses=-1)
-    df_ano_passado = carregar_mes_referente(df_atual.iloc[0]['mes'], df_atual.iloc[0]['ano'], delta_anos=-1)
 
-    df = df_atual.copy()
-    df['dividida'] = df['dividida'].astype(bool)
-    df['valor'] = pd.to_numeric(df['valor'], errors='coerce').fillna(0.0)
+# =====================================================
+# 📄 Geração do Relatório PDF do mês atual
+# =====================================================
+
+@etapa("gerar_relatorio_pdf")
+def gerar_relatorio_pdf(
+    df_atual, nome_mes, ano, qualidade="padrao",
+    deslocamentos_comparativo=((0, 0), (-1, 0), (0, -1)), contas_comparativo=CONTAS_COMPARATIVO_PADRAO,
+    df_referencias=None,
+):
+    """
+    Gera o relatório PDF de um mês: pizza por categoria, resumo e saldo entre
+    pagadores, comparativo com meses de referência e lista de contas por pagador.
+
+    Parâmetros:
+        df_atual (pd.DataFrame): Contas do mês.
+        nome_mes (str): Nome do mês (ex: 'Abril').
+        ano (int): Ano de referência.
+        qualidade (str): Chave de QUALIDADES_PDF (tamanho x nitidez dos gráficos).
+        deslocamentos_comparativo (tuple): Períodos do comparativo como
+            (delta_meses, delta_anos) em relação ao mês do relatório; o padrão
+            compara com o mês anterior e com o mesmo mês do ano anterior.
+        contas_comparativo (list | None): Contas do comparativo; None usa as 5
+            de maior valor no mês.
+        df_referencias (pd.DataFrame, opcional): Contas (ou agregados) dos meses
+            de referência já carregados; se None, são buscados aqui. Usado na
+            geração em lote (`python -m relatorio`), que busca todos os meses de uma vez.
 
-    totais = df.groupby('quem_pagou')['valor'].sum().to_dict()
-    total_roman = totais.get('Roman', 0.0)
-    total_tati = totais.get('Tati', 0.0)
-    total_outros = totais.get('Outro', 0.0)
-    categorias = df.groupby('nome_da_conta')['valor'].sum().sort_values(ascending=False)
-    total_gastos = categorias.sum()
+    Retorno:
+        ArquivoPDF | None: PDF gerado ou None se não houver contas.
+    """
+    if df_atual.empty:
+        return None
 
-    saldo, saldo_ajustado, detalhes = calcular_saldo_entre_pagadores(df)
-    df_divididas = df[df['dividida'] == True]
+    # Meses de referência do comparativo: só os agregados mensais (em memória
+    # ou carregados juntos em uma única requisição)
+    periodos = calcular_periodos_referencia(df_atual.iloc[0]['mes'], df_atual.iloc[0]['ano'], deslocamentos_comparativo)
+    if df_referencias is None:
+        with etapa("busca"):
+            df_referencias = carregar_agregados([p for p in periodos[1:] if p != periodos[0]])
+
+    with etapa("pandas"):
+        df = df_atual.copy()
+        df['dividida'] = df['dividida'].astype(bool)
+        df[COLUNA_CENTAVOS] = centavos_do_df(df)
+        df['valor'] = centavos_para_reais(df[COLUNA_CENTAVOS])
+
+        # Somas exatas em centavos; conversão para reais só na exibição
+        totais = df.groupby('quem_pagou')[COLUNA_CENTAVOS].sum().to_dict()
+        total_roman = centavos_para_reais(totais.get('Roman', 0))
+        total_tati = centavos_para_reais(totais.get('Tati', 0))
+        total_outros = centavos_para_reais(totais.get('Outro', 0))
+        total_gastos = centavos_para_reais(df[COLUNA_CENTAVOS].sum())
+
+        saldo, saldo_ajustado, detalhes = calcular_saldo_entre_pagadores(df)
+        df_divididas = df[df['dividida'] == True]
+
+        tabela_comparativo = montar_comparativo_periodos(
+            pd.concat([df, df_referencias], ignore_index=True), periodos, contas=contas_comparativo
+        )
 
-    grafico_path = "grafico_pizza.png"
-    gerar_grafico_pizza_periodo(df, grafico_path)
+    pdf = PDF(qualidade=qualidade)
 
-    comparativo_path = "comparativo_duplo.png"
-    gerar_grafico_comparativo_duplo(df, df_mes_anterior, df_ano_passado, comparativo_path)
+    with etapa("graficos"):
+        grafico_pizza = gerar_grafico_pizza_periodo(df, BytesIO(), **pdf.opcoes_imagem)
+        grafico_comparativo = gerar_grafico_comparativo_periodos(
+            tabela_comparativo, BytesIO(), titulo=f"Comparativo de {nome_mes}/{ano}", **pdf.opcoes_imagem
+        )
 
-    pdf = PDF()
     pdf.add_page()
     pdf.set_font("Arial", "B", 16)
     pdf.cell(0, 10, f"Relatório Financeiro - {nome_mes}/{ano}", ln=True, align="C")
     pdf.set_font("Arial", size=12)
     pdf.cell(0, 10, f"Gerado em {datetime.now().strftime('%d/%m/%Y')}", ln=True, align="C")
-    pdf.image(grafico_path, x=10, y=30, w=180)
+    pdf.inserir_imagem(grafico_pizza, x=10, y=30, w=180)
     if pdf.get_y() < 190:
         pdf.set_y(200)
 
@@ -91,31 +219,32 @@ def gerar_relatorio_pdf(df_atual, nome_mes, ano):
     pdf.cell(0, 10, "Resumo Geral:", ln=True)
 
     pdf.set_font("Arial", size=11)
-    pdf.cell(0, 8, f"Total gasto: R$ {total_gastos:,.2f}".replace('.', ','), ln=True)
-    pdf.cell(0, 8, f"Roman: R$ {total_roman:,.2f} | Tati: R$ {total_tati:,.2f} | Outros: R$ {total_outros:,.2f}".replace('.', ','), ln=True)
+    pdf.cell(0, 8, f"Total gasto: {formatar_brl(total_gastos)}", ln=True)
+    pdf.cell(0, 8, f"Roman: {formatar_brl(total_roman)} | Tati: {formatar_brl(total_tati)} | Outros: {formatar_brl(total_outros)}", ln=True)
     pdf.ln(3)
-    pdf.cell(0, 8, f"Total dividido: R$ {detalhes['total']:,.2f}".replace('.', ','), ln=True)
-    pdf.cell(0, 8, f"Cada um deveria pagar: R$ {detalhes['metade']:,.2f}".replace('.', ','), ln=True)
-    pdf.cell(0, 8, f"Pago por Roman: R$ {detalhes['D_R']:,.2f} | Pago por Tati: R$ {detalhes['D_T']:,.2f}".replace('.', ','), ln=True)
+    pdf.cell(0, 8, f"Total dividido: {formatar_brl(detalhes['total'])}", ln=True)
+    pdf.cell(0, 8, f"Cada um deveria pagar: {formatar_brl(detalhes['metade'])}", ln=True)
+    pdf.cell(0, 8, f"Pago por Roman: {formatar_brl(detalhes['D_R'])} | Pago por Tati: {formatar_brl(detalhes['D_T'])}", ln=True)
 
     if saldo > 0:
-        pdf.cell(0, 8, f"Tati deve R$ {abs(saldo):,.2f} para Roman".replace('.', ','), ln=True)
+        pdf.cell(0, 8, f"Tati deve {formatar_brl(abs(saldo))} para Roman", ln=True)
     elif saldo < 0:
-        pdf.cell(0, 8, f"Roman deve R$ {abs(saldo):,.2f} para Tati".replace('.', ','), ln=True)
+        pdf.cell(0, 8, f"Roman deve {formatar_brl(abs(saldo))} para Tati", ln=True)
     else:
         pdf.cell(0, 8, "Balanço equilibrado entre Roman e Tati", ln=True)
 
     if saldo_ajustado > 0:
-        pdf.cell(0, 8, f"Tati deve R$ {abs(saldo_ajustado):,.2f} para Roman (ajustado com R$ {detalhes['ajuste']:,.2f} referentes a atividades extracurriculares)".replace('.', ','), ln=True)
+        pdf.cell(0, 8, f"Tati deve {formatar_brl(abs(saldo_ajustado))} para Roman (ajustado com {formatar_brl(detalhes['ajuste'])} referentes a atividades extracurriculares)", ln=True)
     elif saldo_ajustado < 0:
-        pdf.cell(0, 8, f"Roman deve R$ {abs(saldo_ajustado):,.2f} para Tati (ajustado com R$ {detalhes['ajuste']:,.2f} referentes a atividades extracurriculares)".replace('.', ','), ln=True)
+        pdf.cell(0, 8, f"Roman deve {formatar_brl(abs(saldo_ajustado))} para Tati (ajustado com {formatar_brl(detalhes['ajuste'])} referentes a atividades extracurriculares)", ln=True)
     else:
-        pdf.cell(0, 8, f"Balanço ajustado zerado após ajuste de R$ {detalhes['ajuste']:,.2f}".replace('.', ','), ln=True)
+        pdf.cell(0, 8, f"Balanço ajustado zerado após ajuste de {formatar_brl(detalhes['ajuste'])}", ln=True)
 
     pdf.add_page()
-    pdf.image(comparativo_path, x=10, w=190)
+    pdf.inserir_imagem(grafico_comparativo, x=10, w=190)
 
     pdf.add_page()
+    df['valor_fmt'] = formatar_brl_centavos(df[COLUNA_CENTAVOS])  # formata a coluna inteira de uma vez
     for pagador in ['Roman', 'Tati', 'Outro']:
         df_pagador = df[df['quem_pagou'] == pagador]
         if df_pagador.empty:
@@ -125,49 +254,114 @@ def gerar_relatorio_pdf(df_atual, nome_mes, ano):
         pdf.cell(0, 10, f"Contas pagas por {pagador}:", ln=True)
         pdf.set_font("Arial", size=10)
 
-        for _, row in df_pagador.iterrows():
-            valor_fmt = f"R$ {row['valor']:,.2f}".replace('.', ',')
-            dividida = 'Sim' if row['dividida'] else 'Não'
-            nome = row['nome_da_conta']
-            instancia = row.get('instancia', '')
+        for row in df_pagador.itertuples(index=False):
+            dividida = 'Sim' if row.dividida else 'Não'
+            nome = row.nome_da_conta
+            instancia = getattr(row, 'instancia', '')
             nome_completo = f"{nome} ({instancia})" if instancia else nome
 
             pdf.set_font("Arial", style="", size=10)
             pdf.cell(80, 6, nome_completo, border=0)
-            pdf.cell(30, 6, valor_fmt, border=0)
+            pdf.cell(30, 6, row.valor_fmt, border=0)
             pdf.cell(25, 6, f"Dividida: {dividida}", border=0)
 
-            if row.get('link_boleto'):
-                pdf.write_link_inline("Boleto", row['link_boleto'])
-            if row.get('link_comprovante'):
-                pdf.write_link_inline("Comprovante", row['link_comprovante'])
+            link_boleto = getattr(row, 'link_boleto', '')
+            link_comprovante = getattr(row, 'link_comprovante', '')
+            if link_boleto:
+                pdf.write_link_inline("Boleto", link_boleto)
+            if link_comprovante:
+                pdf.write_link_inline("Comprovante", link_comprovante)
 
             pdf.ln(6)
         pdf.ln(3)
 
-    buffer = BytesIO()
-    output = pdf.output(dest="S")
-    pdf_bytes = output.encode("latin1") if isinstance(output, str) else output
-    buffer.write(pdf_bytes)
-    buffer.seek(0)
+    return _exportar_pdf(pdf)
+
+# =====================================================
+# 📒 Página do balanço acumulado entre pagadores
+# =====================================================
+
+def _adicionar_pagina_livro_saldos(pdf, livro, pagadores=("Roman", "Tati")):
+    """
+    Adiciona ao PDF o gráfico do saldo acumulado e a tabela mês a mês do
+    livro de saldos (ver `calcular_livro_saldos`), para qualquer número de pagadores.
 
+    Com dois pagadores, a tabela traz o saldo do mês e o acumulado do primeiro
+    (o do segundo é o mesmo valor com o sinal trocado); com mais, o acumulado
+    de cada um.
+    """
+    if livro.empty:
+        return
+
+    pagadores = list(pagadores)
+    primeiro = pagadores[0]
+    pdf.add_page()
+    pdf.inserir_figura(gerar_grafico_saldo_acumulado(livro, primeiro), x=10, y=20, w=190)
+    pdf.set_y(110)
+
+    pdf.set_font("Arial", "B", 12)
+    if len(pagadores) == 2:
+        segundo = pagadores[1]
+        acumulado = livro[f"acumulado_ajustado_{primeiro}"].iloc[-1]
+        if acumulado > 0:
+            pdf.cell(0, 8, f"No período, {segundo} deve {formatar_brl(abs(acumulado))} para {primeiro}", ln=True)
+        elif acumulado < 0:
+            pdf.cell(0, 8, f"No período, {primeiro} deve {formatar_brl(abs(acumulado))} para {segundo}", ln=True)
+        else:
+            pdf.cell(0, 8, f"Balanço equilibrado entre {primeiro} e {segundo} no período", ln=True)
+    else:
+        for pagador in pagadores:
+            acumulado = livro[f"acumulado_ajustado_{pagador}"].iloc[-1]
+            if acumulado > 0:
+                pdf.cell(0, 8, f"No período, {pagador} tem {formatar_brl(acumulado)} a receber", ln=True)
+            elif acumulado < 0:
+                pdf.cell(0, 8, f"No período, {pagador} deve {formatar_brl(abs(acumulado))}", ln=True)
+            else:
+                pdf.cell(0, 8, f"No período, {pagador} está quite", ln=True)
+    pdf.ln(2)
+
+    # Colunas formatadas de uma vez para a tabela inteira
+    colunas = {"Mês": [f"{int(m):02d}/{int(a)}" for a, m in zip(livro["ano"], livro["mes"])]}
+    for pagador in pagadores:
+        colunas[f"Pago {pagador}"] = formatar_brl_serie(livro[f"pago_{pagador}"]).tolist()
+    colunas["Ajuste"] = formatar_brl_serie(livro["ajuste"]).tolist()
+    if len(pagadores) == 2:
+        colunas["Saldo do mês"] = formatar_brl_serie(livro[f"saldo_ajustado_{primeiro}"]).tolist()
+        colunas["Acumulado"] = formatar_brl_serie(livro[f"acumulado_ajustado_{primeiro}"]).tolist()
+    else:
+        for pagador in pagadores:
+            colunas[f"Acum. {pagador}"] = formatar_brl_serie(livro[f"acumulado_ajustado_{pagador}"]).tolist()
+    # 'Mês' estreita; as demais dividem o restante da largura útil (190 mm)
+    larguras = [22] + [168 / (len(colunas) - 1)] * (len(colunas) - 1)
 
+    pdf.set_font("Arial", "B", 9)
+    for titulo, largura in zip(colunas, larguras):
+        pdf.cell(largura, 6, titulo, border="B")
+    pdf.ln(6)
 
-    for path in [grafico_path, comparativo_path]:
-        if os.path.exists(path):
-            os.remove(path)
+    pdf.set_font("Arial", size=9)
+    for linha in zip(*colunas.values()):
+        for texto, largura in zip(linha, larguras):
+            pdf.cell(largura, 6, texto)
+        pdf.ln(6)
 
-    return buffer
 
 # ==================================================================
 # 📄 Geração do Relatório PDF comparativo entre meses selecionados
 # ==================================================================
 
-def gerar_relatorio_periodo_pdf(df, mes_inicio, ano_inicio, mes_fim, ano_fim):
+@etapa("gerar_relatorio_periodo_pdf")
+def gerar_relatorio_periodo_pdf(
+    df, mes_inicio, ano_inicio, mes_fim, ano_fim, qualidade="padrao", layout="detalhado", ajustes=None,
+    pagadores=("Roman", "Tati"),
+):
     """
     Gera um PDF contendo o resumo financeiro de um período completo, incluindo:
     - Gráfico de pizza com distribuição por categoria (maiores contas + "Outros")
-    - Gráficos de linha por conta (apenas as que aparecem mais de uma vez, até 3 por página)
+    - Balanço entre os pagadores (Roman e Tati, por padrão) mês a mês, com o saldo acumulado no período
+    - Gráficos de linha por conta (apenas as que aparecem mais de uma vez): um
+      gráfico por conta, 2 por página ("detalhado"), ou todas as contas em grades
+      de pequenos múltiplos, uma por página ("compacto")
     - Listagem de contas agrupadas por mês com valores, pagador e links clicáveis
 
     Parâmetros:
@@ -176,146 +370,160 @@ def gerar_relatorio_periodo_pdf(df, mes_inicio, ano_inicio, mes_fim, ano_fim):
         ano_inicio (int): Ano inicial do intervalo
         mes_fim (int): Mês final do intervalo
         ano_fim (int): Ano final do intervalo
+        qualidade (str): Chave de QUALIDADES_PDF (tamanho x nitidez dos gráficos)
+        layout (str): "detalhado" ou "compacto" para os gráficos por conta
+        ajustes (dict, opcional): {(ano, mes): valor} do ajuste a favor do primeiro
+            pagador em cada mês; meses ausentes usam AJUSTE_MENSAL_PADRAO
+            (ver `calcular_livro_saldos`). No app, editados na tela de Relatórios.
+        pagadores (tuple): Pagadores que dividem as contas (o primeiro recebe o ajuste)
 
     Retorno:
-        BytesIO: PDF final gerado, pronto para download
+        ArquivoPDF: PDF final gerado (arquivo temporário), pronto para download
     """
     if df.empty:
         return None
 
-    df['valor'] = pd.to_numeric(df['valor'], errors='coerce').fillna(0.0)
-    df = df.copy()
+    with etapa("pandas"):
+        df = df.copy()
+        df[COLUNA_CENTAVOS] = centavos_do_df(df)
+        df['valor'] = centavos_para_reais(df[COLUNA_CENTAVOS])
+
+        # Matriz conta × mês compartilhada por todas as etapas abaixo
+        matriz = montar_matriz_periodo(df)
 
-    arquivos_temp = []
+        # Balanço entre pagadores: saldo de cada mês e acumulado no período
+        livro = calcular_livro_saldos(df, pagadores=pagadores, ajustes=ajustes)
 
-    # Gráfico de pizza
-    grafico_pizza_path = "pizza_periodo.png"
-    gerar_grafico_pizza_periodo(df, grafico_pizza_path)
-    arquivos_temp.append(grafico_pizza_path)
+    pdf = PDF(qualidade=qualidade)
+
+    # Gráfico de pizza (renderizado em memória e embutido logo em seguida)
+    with etapa("graficos"):
+        grafico_pizza = gerar_grafico_pizza_periodo(
+            df, BytesIO(), categorias=centavos_para_reais(matriz["centavos"].sum(axis=1)), **pdf.opcoes_imagem
+        )
 
     # PDF inicial
-    pdf = PDF()
     pdf.add_page()
     pdf.set_font("Arial", "B", 16)
     pdf.cell(0, 10, f"Resumo Financeiro: {mes_inicio:02d}/{ano_inicio} a {mes_fim:02d}/{ano_fim}", ln=True, align="C")
     pdf.set_font("Arial", size=12)
     pdf.cell(0, 10, f"Gerado em {pd.Timestamp.now().strftime('%d/%m/%Y')}", ln=True, align="C")
-    pdf.image(grafico_pizza_path, x=10, y=40, w=180)
+    pdf.inserir_imagem(grafico_pizza, x=10, y=40, w=180)
     pdf.set_y(130)
+    del grafico_pizza
+
+    _adicionar_pagina_livro_saldos(pdf, livro, pagadores)
 
-    # Gráficos de linha para contas recorrentes (até 3 por página)
-    contas_validas = filtrar_contas_repetidas(df)
+    # Gráficos de linha para contas recorrentes (2 por página).
+    # Cada gráfico é embutido assim que renderizado, sem acumular imagens.
+    contas_validas = contas_recorrentes(matriz)
     graficos_por_pagina = 2
-    imagens = []
-
-    for conta in contas_validas:
-        df_conta = df[df["nome_da_conta"] == conta]
-        df_conta = (
-            df_conta.groupby(["ano", "mes"])["valor"]
-            .sum()
-            .reset_index()
-            .rename(columns={"valor": "valor_total"})
-            .sort_values(by=["ano", "mes"])
-        )
-        fig = gerar_grafico_comparativo_linha(df_conta, conta, mes_inicio, ano_inicio, mes_fim, ano_fim)
-        caminho_img = f"linha_{conta}.png"
-        fig.savefig(caminho_img)
-        plt.close(fig)
-        imagens.append(caminho_img)
-        arquivos_temp.append(caminho_img)
-
-    for i in range(0, len(imagens), graficos_por_pagina):
-        pdf.add_page()
-        for j, img_path in enumerate(imagens[i:i+graficos_por_pagina]):
-            y_pos = 30 + j * 120
-            pdf.image(img_path, x=10, y=y_pos, w=190)
 
-    # Listagem agrupada por mês
-    agrupado = agrupar_por_mes(df)
-    for (ano, mes) in sorted(agrupado.keys()):
+    if layout == "compacto":
+        with etapa("graficos"):
+            figuras = list(gerar_grafico_multiplos_contas(matriz, contas_validas))
+        for fig in figuras:
+            pdf.add_page()
+            pdf.inserir_figura(fig, x=10, y=20, w=190)
+        contas_validas = []  # já desenhadas nas grades
+
+    for i, conta in enumerate(contas_validas):
+        with etapa("graficos"):
+            df_conta = serie_da_conta(matriz, conta)
+            fig = gerar_grafico_comparativo_linha(df_conta, conta, mes_inicio, ano_inicio, mes_fim, ano_fim)
+
+        j = i % graficos_por_pagina
+        if j == 0:
+            pdf.add_page()
+        pdf.inserir_figura(fig, x=10, y=30 + j * 120, w=190)
+
+    # Listagem agrupada por mês (um mês por vez, a partir do frame já ordenado)
+    totais_mes = matriz["centavos"].sum(axis=0)
+    df_ordenado = matriz["df"]
+    df_ordenado["valor_fmt"] = formatar_brl_centavos(df_ordenado[COLUNA_CENTAVOS])
+
+    for ano, mes, linhas in iterar_por_mes(df_ordenado, ja_ordenado=True):
         pdf.add_page()
         pdf.set_font("Arial", "B", 14)
         nome_mes = pd.Timestamp(year=ano, month=mes, day=1).strftime("%B").capitalize()
-        total_mes = sum(r["valor"] for r in agrupado[(ano, mes)])
-        pdf.cell(0, 10, f"{nome_mes}/{ano} - Total: R$ {total_mes:,.2f}".replace('.', ','), ln=True)
+        total_mes = totais_mes[(ano, mes)]
+        pdf.cell(0, 10, f"{nome_mes}/{ano} - Total: {formatar_brl_centavos(total_mes)}", ln=True)
 
 
         pdf.set_font("Arial", size=9)
-        for row in agrupado[(ano, mes)]:
-            nome = row["nome_da_conta"]
-            instancia = row.get("instancia", "")
-            quem_pagou = row.get("quem_pagou", "")
-            valor_fmt = f"R$ {row['valor']:,.2f}".replace(".", ",")
+        for row in linhas:
+            nome = row.nome_da_conta
+            instancia = getattr(row, "instancia", "")
+            quem_pagou = getattr(row, "quem_pagou", "")
             nome_exibido = f"{nome} ({instancia})" if instancia else nome
 
             pdf.cell(80, 6, nome_exibido, border=0)
-            pdf.cell(26, 6, valor_fmt, border=0)
+            pdf.cell(26, 6, row.valor_fmt, border=0)
             pdf.cell(30, 6, f"Pagador: {quem_pagou}", border=0)
 
-            if row.get("link_boleto"):
-                pdf.write_link_inline("Boleto", row["link_boleto"])
-            if row.get("link_comprovante"):
-                pdf.write_link_inline("Comprovante", row["link_comprovante"])
+            link_boleto = getattr(row, "link_boleto", "")
+            link_comprovante = getattr(row, "link_comprovante", "")
+            if link_boleto:
+                pdf.write_link_inline("Boleto", link_boleto)
+            if link_comprovante:
+                pdf.write_link_inline("Comprovante", link_comprovante)
 
             pdf.ln(6)
         pdf.ln(3)
 
-    buffer = BytesIO()
-    output = pdf.output(dest="S")
-    pdf_bytes = output.encode("latin1") if isinstance(output, str) else output
-    buffer.write(pdf_bytes)
-    buffer.seek(0)
-
-
-    # Limpa os arquivos temporários criados
-    for path in arquivos_temp:
-        if os.path.exists(path):
-            os.remove(path)
-
-    return buffer
+    return _exportar_pdf(pdf)
 
 # =====================================================
 # 📄 Gerar PDF comparativo de uma conta no tempo
 # =====================================================
 
-def gerar_pdf_comparativo_conta(df, nome_conta, mes_inicio, ano_inicio, mes_fim, ano_fim):
+def gerar_pdf_comparativo_conta(df, nome_conta, mes_inicio, ano_inicio, mes_fim, ano_fim, qualidade="padrao", modo="linhas"):
     """
     Gera um PDF contendo o gráfico de linha da variação de uma conta específica
     ao longo de um intervalo de meses, além de resumo geral do valor total acumulado.
 
+    Com uma lista de contas, desenha todas no mesmo gráfico (linhas sobrepostas
+    ou área empilhada) e resume o total de cada uma.
+
     Parâmetros:
     - df (pd.DataFrame): DataFrame com colunas ['ano', 'mes', 'valor_total']
-    - nome_conta (str): Nome da conta (ex: 'Luz')
+      (com várias contas: saída de `carregar_dados_contas_periodo`, com 'nome_da_conta')
+    - nome_conta (str | list): Nome da conta (ex: 'Luz') ou lista de contas
     - mes_inicio (int): Mês inicial (1 a 12)
     - ano_inicio (int): Ano inicial
     - mes_fim (int): Mês final (1 a 12)
     - ano_fim (int): Ano final
+    - qualidade (str): Chave de QUALIDADES_PDF (tamanho x nitidez do gráfico)
+    - modo (str): Com várias contas, "linhas" ou "area"
 
     Retorno:
-    - BytesIO: Buffer contendo o PDF pronto para download
+    - ArquivoPDF: Arquivo temporário contendo o PDF pronto para download
     """
+    varias_contas = isinstance(nome_conta, (list, tuple))
 
     # -----------------------------
-    # 📊 Gerar gráfico e salvar temporariamente
+    # 📊 Gerar gráfico
     # -----------------------------
-    fig = gerar_grafico_comparativo_linha(df, nome_conta, mes_inicio, ano_inicio, mes_fim, ano_fim)
-    caminho_img = "grafico_comparativo_temp.png"
-    fig.savefig(caminho_img)
-    plt.close(fig)
+    if varias_contas:
+        fig = gerar_grafico_comparativo_contas(df, nome_conta, mes_inicio, ano_inicio, mes_fim, ano_fim, modo=modo)
+        nome_exibido = ", ".join(nome_conta)
+    else:
+        fig = gerar_grafico_comparativo_linha(df, nome_conta, mes_inicio, ano_inicio, mes_fim, ano_fim)
+        nome_exibido = nome_conta
 
     # -----------------------------
     # 📄 Iniciar PDF
     # -----------------------------
-    pdf = PDF()
+    pdf = PDF(qualidade=qualidade)
     pdf.add_page()
     pdf.set_font("Arial", "B", 16)
-    titulo = f"Comparativo - {nome_conta}: {mes_inicio:02d}/{ano_inicio} a {mes_fim:02d}/{ano_fim}"
-    pdf.cell(0, 10, titulo, ln=True, align="C")
+    titulo = f"Comparativo - {nome_exibido}: {mes_inicio:02d}/{ano_inicio} a {mes_fim:02d}/{ano_fim}"
+    pdf.multi_cell(0, 10, titulo, align="C")
 
     # -----------------------------
     # 🖼️ Inserir imagem do gráfico
     # -----------------------------
-    pdf.image(caminho_img, x=10, y=30, w=190)
+    pdf.inserir_figura(fig, x=10, y=30, w=190)
     pdf.set_y(110)
 
     # -----------------------------
@@ -324,22 +532,15 @@ def gerar_pdf_comparativo_conta(df, nome_conta, mes_inicio, ano_inicio, mes_fim,
     valor_total = df["valor_total"].sum()
     pdf.set_font("Arial", "", 12)
     pdf.ln(85)
-    pdf.cell(0, 10, f"Valor total acumulado no período: R$ {valor_total:,.2f}".replace(".", ","), ln=True)
+    pdf.cell(0, 10, f"Valor total acumulado no período: {formatar_brl(valor_total)}", ln=True)
+
+    if varias_contas:
+        totais = df.groupby("nome_da_conta")["valor_total"].sum().reindex(nome_conta, fill_value=0)
+        pdf.set_font("Arial", "", 11)
+        for conta, total_fmt in zip(totais.index, formatar_brl_serie(totais)):
+            pdf.cell(0, 8, f"{conta}: {total_fmt}", ln=True)
 
     # -----------------------------
-    # 💾 Exportar para buffer de memória
+    # 💾 Exportar para arquivo temporário
     # -----------------------------
-    buffer = BytesIO()
-    output = pdf.output(dest="S")
-    pdf_bytes = output.encode("latin1") if isinstance(output, str) else output
-    buffer.write(pdf_bytes)
-    buffer.seek(0)
-
-
-    # Limpar imagem temporária
-    if os.path.exists(caminho_img):
-        os.remove(caminho_img)
-
-    return buffer
-
-
+    return _exportar_pdf(pdf)
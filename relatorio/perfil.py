@@ -0,0 +1,170 @@
+# ====================================
+# 🧪 PERFIL DA GERAÇÃO DE RELATÓRIOS
+# ====================================
+# Mede o tempo e o pico de memória (tracemalloc) de cada etapa de um
+# relatório: busca, pandas, gráficos, imagens e serialização do PDF.
+#
+#     @etapa("gerar_relatorio_pdf")          # decorador...
+#     def gerar_relatorio_pdf(...):
+#         with etapa("graficos"):            # ...ou bloco
+#             ...
+#
+# Desligado por padrão, quando `etapa` não faz nada. Ligado (no app, pela
+# barra lateral; fora dele, com RELATORIO_PERFIL=1), a etapa mais externa
+# vira uma execução: etapas internas com o mesmo nome são somadas e o
+# resultado vai para `ultimos_perfis()` e para uma linha no ARQUIVO_PERFIL (JSONL).
+# Com o tracemalloc ligado o código roda mais devagar: compare os tempos entre
+# execuções com perfil, não com execuções sem ele.
+# O tracemalloc é do processo inteiro e as sessões do Streamlit rodam em
+# threads: execuções medidas ao mesmo tempo esperam umas pelas outras, senão
+# uma zeraria o pico da outra (reset_peak) ou desligaria o rastreamento no
+# meio dela (stop). Relatórios sem perfil não esperam.
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+
+ARQUIVO_PERFIL = os.environ.get("RELATORIO_PERFIL_ARQUIVO", "perfil_relatorios.jsonl")
+
+# Execuções guardadas em memória para o painel
+MAXIMO_PERFIS = 20
+
+_ativo = ContextVar("perfil_ativo", default=os.environ.get("RELATORIO_PERFIL") == "1")
+_execucao = ContextVar("perfil_execucao", default=None)
+
+_ultimos = deque(maxlen=MAXIMO_PERFIS)
+_lock = threading.Lock()
+_lock_tracemalloc = threading.Lock()  # uma execução medida por vez no processo
+
+
+def ativar_perfil(ativo=True):
+    """Liga (ou desliga) o perfil no contexto atual — no app, a cada rerun."""
+    _ativo.set(bool(ativo))
+
+
+def perfil_ativo():
+    return _ativo.get()
+
+
+# =====================================================
+# ⏱️ Etapas
+# =====================================================
+
+@contextmanager
+def etapa(nome):
+    """
+    Mede o bloco (ou a função decorada) como uma etapa do relatório.
+
+    Parâmetros:
+        nome (str): Nome da etapa (ex: 'graficos'). Etapas com o mesmo nome
+            dentro da mesma etapa-mãe são somadas.
+    """
+    if not _ativo.get():
+        yield
+        return
+
+    execucao = _execucao.get()
+    raiz = execucao is None
+    if raiz:
+        _lock_tracemalloc.acquire()
+        execucao = {"pilha": [], "etapas": {}, "iniciou_tracemalloc": not tracemalloc.is_tracing()}
+        if execucao["iniciou_tracemalloc"]:
+            tracemalloc.start()
+        token = _execucao.set(execucao)
+
+    pilha = execucao["pilha"]
+    if pilha:
+        # O pico da etapa-mãe até aqui, antes de zerar o contador para esta
+        pilha[-1]["pico"] = max(pilha[-1]["pico"], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+
+    caminho = (pilha[-1]["caminho"] if pilha else ()) + (nome,)
+    registro = execucao["etapas"].setdefault(caminho, {"segundos": 0.0, "chamadas": 0, "pico": 0})
+    atual = {
+        "caminho": caminho,
+        "inicio": time.perf_counter(),
+        "memoria_inicial": tracemalloc.get_traced_memory()[0],
+        "pico": 0,
+    }
+    pilha.append(atual)
+    erro = None
+    try:
+        yield
+    except BaseException as e:
+        erro = type(e).__name__
+        raise
+    finally:
+        pilha.pop()
+        pico = max(atual["pico"], tracemalloc.get_traced_memory()[1])
+        if pilha:
+            pilha[-1]["pico"] = max(pilha[-1]["pico"], pico)
+        registro["segundos"] += time.perf_counter() - atual["inicio"]
+        registro["chamadas"] += 1
+        registro["pico"] = max(registro["pico"], pico - atual["memoria_inicial"])
+
+        if raiz:
+            _execucao.reset(token)
+            if execucao["iniciou_tracemalloc"]:
+                tracemalloc.stop()
+            _lock_tracemalloc.release()
+            _concluir(nome, execucao["etapas"], erro)
+
+
+# =====================================================
+# 📤 Resultados
+# =====================================================
+
+def _concluir(nome, etapas, erro=None):
+    """Monta o registro da execução, guarda-o em memória e grava uma linha no ARQUIVO_PERFIL."""
+    linhas = []
+    for caminho, registro in etapas.items():
+        filhas = sum(
+            outro["segundos"] for outro_caminho, outro in etapas.items()
+            if len(outro_caminho) == len(caminho) + 1 and outro_caminho[:-1] == caminho
+        )
+        linhas.append({
+            "etapa": "/".join(caminho),
+            "nivel": len(caminho) - 1,
+            "ms": round(registro["segundos"] * 1000, 1),
+            "proprio_ms": round((registro["segundos"] - filhas) * 1000, 1),  # fora das etapas internas
+            "chamadas": registro["chamadas"],
+            "pico_mb": round(registro["pico"] / 2**20, 2),
+        })
+
+    perfil = {
+        "relatorio": nome,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "total_ms": linhas[0]["ms"],
+        "pico_mb": linhas[0]["pico_mb"],
+        "etapas": linhas,
+    }
+    if erro:
+        perfil["erro"] = erro
+
+    with _lock:
+        _ultimos.append(perfil)
+        try:
+            with open(ARQUIVO_PERFIL, "a", encoding="utf-8") as f:
+                f.write(json.dumps(perfil, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Erro ao gravar o perfil em {ARQUIVO_PERFIL}: {e}")
+
+
+def ultimos_perfis():
+    """
+    Execuções medidas mais recentes (até MAXIMO_PERFIS), da mais antiga para a mais nova.
+
+    Retorno:
+        list[dict]: Ex: {'relatorio': 'gerar_relatorio_pdf', 'total_ms': 812.4, 'pico_mb': 21.3,
+            'etapas': [{'etapa': 'gerar_relatorio_pdf/graficos', 'nivel': 1, 'ms': 530.2,
+            'proprio_ms': 530.2, 'chamadas': 2, 'pico_mb': 18.9}, ...]}
+    """
+    with _lock:
+        return list(_ultimos)
@@ -3,19 +3,36 @@
 # ====================================
 
 from datetime import datetime
+from functools import partial
 from dateutil.relativedelta import relativedelta
 
+import numpy as np
 import pandas as pd
 
-from supabase import carregar_tabela
+from supabase import (
+    COLUNA_CENTAVOS,
+    carregar_agregados,
+    carregar_intervalo,
+    carregar_meses,
+    centavos_do_df,
+    centavos_para_reais,
+)
 
 
 
+# =====================================================
+# ⚠️ Leitura incompleta
+# =====================================================
+
+class DadosIncompletos(Exception):
+    """Parte do período não pôde ser lida do Supabase: o arquivo gerado sairia incompleto."""
+
+
 # =====================================================
 # 📥 Carregar dados de uma conta em um intervalo de meses
 # =====================================================
 
-def carregar_dados_conta_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim, nome_da_conta):
+def carregar_dados_conta_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim, nome_da_conta, snapshot=None):
     """
     Carrega os dados de uma conta específica ou de todas as contas ao longo de um intervalo de meses.
 
@@ -25,11 +42,17 @@ def carregar_dados_conta_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim, nome_
     - mes_fim (int): Mês final (1–12)
     - ano_fim (int): Ano final (ex: 2025)
     - nome_da_conta (str | None): Nome da conta a ser filtrada. Se None, retorna todas as contas.
+    - snapshot (str, opcional): Pasta de um snapshot em Parquet (`exportar_snapshot`);
+      se informada, os dados são lidos dele em vez do Supabase.
 
     Retorno:
     - pd.DataFrame:
         - Se nome_da_conta for fornecido: DataFrame com ['ano', 'mes', 'valor_total']
         - Se nome_da_conta for None: DataFrame original com todos os campos das contas
+
+    Erros:
+    - DadosIncompletos: Se nome_da_conta for None e o período não puder ser lido
+      do Supabase (erro ou prazo esgotado).
     """
     data_inicio = datetime(ano_inicio, mes_inicio, 1)
     data_fim = datetime(ano_fim, mes_fim, 1)
@@ -37,51 +60,179 @@ def carregar_dados_conta_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim, nome_
     if data_inicio > data_fim:
         data_inicio, data_fim = data_fim, data_inicio
 
-    registros = []
+    meses_periodo = []
     data_atual = data_inicio
-
     while data_atual <= data_fim:
-        mes = data_atual.month
-        ano = data_atual.year
-        df_mes = carregar_tabela(mes, ano)
-
-        if not df_mes.empty:
-            if nome_da_conta is not None:
-                df_filtrado = df_mes[df_mes["nome_da_conta"] == nome_da_conta].copy()
-            else:
-                df_filtrado = df_mes.copy()
-
-            df_filtrado["mes"] = mes
-            df_filtrado["ano"] = ano
-            registros.append(df_filtrado)
-
+        meses_periodo.append((data_atual.month, data_atual.year))
         data_atual += relativedelta(months=1)
 
-    if not registros:
-        return pd.DataFrame()
-
-    df_todos = pd.concat(registros, ignore_index=True)
-    df_todos["valor"] = pd.to_numeric(df_todos["valor"], errors="coerce").fillna(0)
+    if snapshot is not None:
+        from supabase import carregar_snapshot_intervalo  # pyarrow só quando usado
 
-    # Caso o nome da conta tenha sido informado → retorna o DataFrame agrupado
+    # Caso o nome da conta tenha sido informado → lê só os agregados mensais
+    # (poucas linhas por mês, mantidos em memória) em vez das contas
     if nome_da_conta is not None:
+        if snapshot is None:
+            df_agregados = carregar_agregados(meses_periodo)
+        else:
+            df_agregados = carregar_snapshot_intervalo(
+                mes_inicio, ano_inicio, mes_fim, ano_fim,
+                contas=[nome_da_conta], colunas="ano,mes,nome_da_conta,valor", pasta=snapshot,
+            )
+        if df_agregados.empty:
+            return pd.DataFrame()
+        df_conta = df_agregados[df_agregados["nome_da_conta"] == nome_da_conta]
+        if df_conta.empty:
+            return pd.DataFrame()
+
+        # Soma exata em centavos, convertida para reais só no final
         df_agrupado = (
-            df_todos.groupby(["ano", "mes"])["valor"]
+            df_conta.groupby(["ano", "mes"])[COLUNA_CENTAVOS]
             .sum()
             .reset_index()
-            .rename(columns={"valor": "valor_total"})
             .sort_values(by=["ano", "mes"])
         )
+        df_agrupado["valor_total"] = centavos_para_reais(df_agrupado.pop(COLUNA_CENTAVOS))
         return df_agrupado
 
+    if snapshot is not None:
+        return carregar_snapshot_intervalo(mes_inicio, ano_inicio, mes_fim, ano_fim, pasta=snapshot)
+
+    # Todas as contas do período em uma requisição (meses em cache não são pedidos);
+    # sem reserva desatualizada: um erro vira DadosIncompletos em vez de um período pela metade
+    df_todos = carregar_meses(meses_periodo, estrito=True)
+    if df_todos is None:
+        (mes_i, ano_i), (mes_f, ano_f) = meses_periodo[0], meses_periodo[-1]
+        raise DadosIncompletos(f"meses {mes_i:02d}/{ano_i} a {mes_f:02d}/{ano_f}")
+    if df_todos.empty:
+        return pd.DataFrame()
+
+    df_todos = df_todos.sort_values(by=["ano", "mes"], kind="stable", ignore_index=True)
+    df_todos[COLUNA_CENTAVOS] = centavos_do_df(df_todos)
+    df_todos["valor"] = centavos_para_reais(df_todos[COLUNA_CENTAVOS])
+
     # Caso contrário, retorna todos os dados originais para geração de relatório
     return df_todos
 
+# =====================================================
+# 📥 Carregar várias contas em um intervalo (uma requisição)
+# =====================================================
+
+def carregar_dados_contas_periodo(mes_inicio, ano_inicio, mes_fim, ano_fim, contas, snapshot=None):
+    """
+    Carrega a evolução mensal de várias contas de uma vez, com uma única
+    requisição (`nome_da_conta=in.(...)`) e um único agrupamento.
+
+    Parâmetros:
+    - mes_inicio, ano_inicio (int): Início do intervalo.
+    - mes_fim, ano_fim (int): Fim do intervalo.
+    - contas (list): Nomes das contas a comparar.
+    - snapshot (str, opcional): Pasta de um snapshot em Parquet, lido no lugar do Supabase.
+
+    Retorno:
+    - pd.DataFrame: ['nome_da_conta', 'ano', 'mes', 'valor_total'], só com os
+      meses em que cada conta teve lançamento, em ordem cronológica.
+    """
+    if not contas:
+        return pd.DataFrame()
+
+    if snapshot is None:
+        carregar = carregar_intervalo
+    else:
+        from supabase import carregar_snapshot_intervalo  # pyarrow só quando usado
+        carregar = partial(carregar_snapshot_intervalo, pasta=snapshot)
+
+    df = carregar(
+        mes_inicio, ano_inicio, mes_fim, ano_fim,
+        contas=list(contas), colunas="ano,mes,nome_da_conta,valor",
+    )
+    if df.empty:
+        return pd.DataFrame()
+
+    df_agrupado = (
+        df.groupby(["nome_da_conta", "ano", "mes"])[COLUNA_CENTAVOS]
+        .sum()
+        .reset_index()
+        .sort_values(by=["ano", "mes", "nome_da_conta"], kind="stable")
+        .reset_index(drop=True)
+    )
+    df_agrupado["valor_total"] = centavos_para_reais(df_agrupado.pop(COLUNA_CENTAVOS))
+    return df_agrupado
+
+
+def pivotar_contas_periodo(df, contas=None):
+    """
+    Converte o resultado de `carregar_dados_contas_periodo` em uma tabela
+    mês × conta (valores em reais, 0 nos meses sem lançamento), cobrindo
+    todos os meses entre o primeiro e o último do período.
+
+    Retorno:
+        pd.DataFrame: Índice (ano, mes), uma coluna por conta (na ordem de `contas`, se informada).
+    """
+    tabela = df.pivot_table(index=["ano", "mes"], columns="nome_da_conta", values="valor_total", aggfunc="sum", fill_value=0)
+    inicio, fim = tabela.index.min(), tabela.index.max()
+    meses = pd.period_range(f"{inicio[0]}-{inicio[1]:02d}", f"{fim[0]}-{fim[1]:02d}", freq="M")
+    indice = pd.MultiIndex.from_arrays([meses.year, meses.month], names=["ano", "mes"])
+    tabela = tabela.reindex(indice, fill_value=0)
+    if contas is not None:
+        tabela = tabela.reindex(columns=list(contas), fill_value=0)
+    return tabela
+
+
+# =====================================================
+# 📏 Escala do eixo Y dos gráficos de linha
+# =====================================================
+
+def calcular_limites_eixo_y(valores):
+    """
+    Calcula os limites do eixo Y de um gráfico de linha com range mínimo,
+    para que variações de centavos não "explodam" a escala.
+
+    Compartilhada pelo gráfico estático (matplotlib) e pelo interativo (Vega-Lite).
+
+    Parâmetros:
+        valores (array-like): Valores em reais da série.
+
+    Retorno:
+        tuple: (inferior, superior, amplitude) — `amplitude` é a faixa usada
+        como referência para margens e deslocamento de rótulos.
+    """
+    valores = np.asarray(valores, dtype=float)
+    y_min = float(valores.min())
+    y_max = float(valores.max())
+    data_range = y_max - y_min
+
+    # range mínimo (evita “explodir” o gráfico por diferença de centavos)
+    min_visual_range = max(10.0, 0.2 * max(y_max, 1.0))  # 10 reais ou 20% do valor típico
+
+    if data_range < min_visual_range:
+        # Expande em torno do valor médio
+        mid = (y_min + y_max) / 2.0
+        y_range = min_visual_range
+        pad_up = 0.12 * y_range
+        pad_dn = 0.10 * y_range
+        bottom = max(0.0, mid - y_range / 2.0 - pad_dn)
+        top = mid + y_range / 2.0 + pad_up
+    else:
+        # Usa range real + margens proporcionais
+        y_range = data_range
+        pad_up = 0.12 * y_range
+        pad_dn = 0.10 * y_range
+        bottom = max(0.0, y_min - pad_dn)
+        top = y_max + pad_up
+
+    return bottom, top, y_range
+
+
 # =====================================================
 # 💰 Cálculo de Saldos entre Pagadores
 # =====================================================
 
-def calcular_saldo_entre_pagadores(df, ajuste_escolar=929.0):
+# Ajuste mensal (R$) a favor do primeiro pagador quando nenhum outro é informado
+AJUSTE_MENSAL_PADRAO = 929.0
+
+
+def calcular_saldo_entre_pagadores(df, ajuste_escolar=AJUSTE_MENSAL_PADRAO):
     """
     Calcula o saldo financeiro entre Roman e Tati com base nas contas divididas.
 
@@ -111,45 +262,307 @@ def calcular_saldo_entre_pagadores(df, ajuste_escolar=929.0):
     df_divididas = df[df["dividida"] == True]
 
     # -----------------------------
-    # 💰 Totais pagos por cada um
+    # 💰 Totais pagos por cada um (em centavos, soma exata)
     # -----------------------------
-    total_dividido_roman = df_divididas[df_divididas["quem_pagou"] == "Roman"]["valor"].sum()
-    total_dividido_tati = df_divididas[df_divididas["quem_pagou"] == "Tati"]["valor"].sum()
+    centavos = centavos_do_df(df_divididas)
+    pagadores = df_divididas["quem_pagou"].to_numpy()
+    centavos_roman = int(centavos[pagadores == "Roman"].sum())
+    centavos_tati = int(centavos[pagadores == "Tati"].sum())
 
     # -----------------------------
     # 🧮 Cálculo do saldo
     # -----------------------------
-    total_dividido = total_dividido_roman + total_dividido_tati
-    metade = total_dividido / 2
-    saldo = total_dividido_roman - metade
+    # saldo = Roman - metade = (Roman - Tati) / 2: a única divisão é feita
+    # sobre o inteiro, então o resultado é exato (no máximo meio centavo)
+    total_dividido = centavos_para_reais(centavos_roman + centavos_tati)
+    metade = centavos_para_reais((centavos_roman + centavos_tati) / 2)
+    saldo = centavos_para_reais((centavos_roman - centavos_tati) / 2)
 
     # -----------------------------
     # 🎓 Aplicação do ajuste escolar a favor de Roman
     # -----------------------------
-    saldo_ajustado = saldo + ajuste_escolar
+    centavos_ajuste = int(round(ajuste_escolar * 100))
+    saldo_ajustado = centavos_para_reais((centavos_roman - centavos_tati + 2 * centavos_ajuste) / 2)
 
     # -----------------------------
     # 📦 Retorno estruturado
     # -----------------------------
     return saldo, saldo_ajustado, {
-        "D_R": total_dividido_roman,
-        "D_T": total_dividido_tati,
+        "D_R": centavos_para_reais(centavos_roman),
+        "D_T": centavos_para_reais(centavos_tati),
         "total": total_dividido,
         "metade": metade,
         "ajuste": ajuste_escolar
     }
 
+# =====================================================
+# 📒 Livro de saldos entre pagadores (vários meses)
+# =====================================================
+
+def calcular_livro_saldos(df, pagadores=("Roman", "Tati"), ajustes=None, ajuste_padrao=AJUSTE_MENSAL_PADRAO):
+    """
+    Calcula, em uma única passada agrupada, o saldo entre pagadores de cada
+    mês do período e o saldo acumulado (quem deve a quem até aquele mês).
+
+    Generaliza `calcular_saldo_entre_pagadores` para vários meses e pagadores:
+    em cada mês, cada pagador deveria arcar com 1/N das contas divididas, e o
+    ajuste do mês é somado a favor do primeiro pagador (dividido entre os demais).
+    Com ('Roman', 'Tati') e um único mês, os valores coincidem com os da função original.
+
+    Parâmetros:
+        df (pd.DataFrame): Contas de um ou mais meses com 'ano', 'mes', 'dividida',
+            'quem_pagou' e 'valor' (ou 'valor_centavos').
+        pagadores (tuple): Pagadores que dividem as contas; o primeiro recebe o ajuste.
+        ajustes (dict, opcional): {(ano, mes): valor} com o ajuste de cada mês.
+            Meses ausentes usam `ajuste_padrao`.
+        ajuste_padrao (float): Ajuste aplicado aos meses sem valor em `ajustes`.
+
+    Retorno:
+        pd.DataFrame: Uma linha por mês (ordem cronológica) com 'ano', 'mes',
+        'total', 'metade' (cota de cada pagador), 'ajuste' e, para cada pagador P:
+            - 'pago_P': quanto P pagou das contas divididas
+            - 'saldo_P': pago - cota (positivo: os outros devem a P)
+            - 'saldo_ajustado_P': saldo com o ajuste do mês
+            - 'acumulado_P' e 'acumulado_ajustado_P': somas corridas dos saldos
+        DataFrame vazio se `df` estiver vazio.
+    """
+    if df.empty:
+        return pd.DataFrame()
+
+    ajustes = ajustes or {}
+    pagadores = list(pagadores)
+    n = len(pagadores)
+
+    # Todos os meses do frame entram no livro, mesmo sem contas divididas
+    chaves = df["ano"].to_numpy(dtype=np.int64) * 100 + df["mes"].to_numpy(dtype=np.int64)
+    cod_periodo, chaves_periodo = pd.factorize(chaves, sort=True)
+
+    # Centavos pagos por (mês, pagador), só das contas divididas
+    cod_pagador = pd.Index(pagadores).get_indexer(df["quem_pagou"])
+    dividida = (df["dividida"] == True).to_numpy()
+    filtro = dividida & (cod_pagador >= 0)
+
+    pagos = np.zeros((len(chaves_periodo), n), dtype=np.int64)
+    np.add.at(pagos, (cod_periodo[filtro], cod_pagador[filtro]), centavos_do_df(df)[filtro])
+    total = pagos.sum(axis=1)
+
+    # Ajuste (em centavos) a favor do primeiro pagador, rateado entre os demais
+    anos, meses = chaves_periodo // 100, chaves_periodo % 100
+    centavos_ajuste = np.array(
+        [round(ajustes.get((int(a), int(m)), ajuste_padrao) * 100) for a, m in zip(anos, meses)],
+        dtype=np.int64,
+    )
+    rateio = np.full(n, -1.0 / max(n - 1, 1))
+    rateio[0] = 1.0
+
+    # saldo = pago - total / N, calculado sobre inteiros (divisão só no final)
+    saldos = (pagos * n - total[:, None]) / n
+    saldos_ajustados = saldos + centavos_ajuste[:, None] * rateio
+
+    livro = pd.DataFrame({
+        "ano": anos,
+        "mes": meses,
+        "total": centavos_para_reais(total),
+        "metade": centavos_para_reais(total / n),
+        "ajuste": centavos_para_reais(centavos_ajuste),
+    })
+    for i, pagador in enumerate(pagadores):
+        livro[f"pago_{pagador}"] = centavos_para_reais(pagos[:, i])
+        livro[f"saldo_{pagador}"] = centavos_para_reais(saldos[:, i])
+        livro[f"saldo_ajustado_{pagador}"] = centavos_para_reais(saldos_ajustados[:, i])
+        livro[f"acumulado_{pagador}"] = centavos_para_reais(np.cumsum(saldos[:, i]))
+        livro[f"acumulado_ajustado_{pagador}"] = centavos_para_reais(np.cumsum(saldos_ajustados[:, i]))
+
+    return livro
+
+
+# =====================================================
+# 📊 Comparativo entre períodos de referência
+# =====================================================
+
+def calcular_periodos_referencia(mes, ano, deslocamentos=((0, 0), (-1, 0), (0, -1))):
+    """
+    Converte deslocamentos (delta_meses, delta_anos) em pares (mes, ano),
+    como em `carregar_mes_referente`. O padrão é: o próprio mês, o mês
+    anterior e o mesmo mês do ano anterior.
+
+    Retorno:
+        list[tuple]: [(mes, ano), ...] na ordem dos deslocamentos.
+    """
+    base = datetime(int(ano), int(mes), 1)
+    periodos = []
+    for delta_meses, delta_anos in deslocamentos:
+        data = base + relativedelta(months=delta_meses, years=delta_anos)
+        periodos.append((data.month, data.year))
+    return periodos
+
+
+def montar_comparativo_periodos(df, periodos, contas=None, top_n=5):
+    """
+    Monta a tabela conta × período usada pelo gráfico comparativo, com um
+    único agrupamento + pivot sobre as contas de todos os períodos.
+
+    Parâmetros:
+        df (pd.DataFrame): Contas de todos os períodos (ex: `carregar_meses(periodos)`).
+        periodos (list[tuple]): Pares (mes, ano); o primeiro é o período de referência.
+        contas (list, opcional): Contas a comparar, nessa ordem.
+        top_n (int): Se `contas` não for informado, usa as `top_n` contas de
+            maior valor no primeiro período.
+
+    Retorno:
+        pd.DataFrame: Índice 'nome_da_conta', uma coluna por período
+        (MultiIndex (ano, mes), na ordem de `periodos`) com o total em reais (0 sem lançamento).
+    """
+    colunas = pd.MultiIndex.from_tuples([(int(a), int(m)) for m, a in periodos], names=["ano", "mes"])
+
+    if df.empty or "nome_da_conta" not in df.columns:
+        tabela = pd.DataFrame(0, index=pd.Index([], name="nome_da_conta"), columns=colunas, dtype=np.int64)
+    else:
+        tabela = (
+            pd.DataFrame({
+                "nome_da_conta": df["nome_da_conta"].to_numpy(),
+                "ano": df["ano"].astype(int).to_numpy(),
+                "mes": df["mes"].astype(int).to_numpy(),
+                "centavos": centavos_do_df(df),
+            })
+            .pivot_table(index="nome_da_conta", columns=["ano", "mes"], values="centavos", aggfunc="sum", fill_value=0)
+            .reindex(columns=colunas, fill_value=0)
+        )
+
+    if contas is None:
+        referencia = tabela.iloc[:, 0]
+        referencia = referencia[referencia > 0].sort_values(ascending=False, kind="stable")
+        contas = referencia.head(top_n).index.tolist()
+
+    return centavos_para_reais(tabela.reindex(list(contas), fill_value=0))
+
+
 # =====================================================
 # 🔁 Agrupamento por Mês para Relatório
 # =====================================================
 
+def iterar_por_mes(df, ja_ordenado=False):
+    """
+    Percorre as contas mês a mês, em ordem cronológica, sem alterar o DataFrame recebido.
+
+    Cada mês é uma fatia contígua do frame ordenado; as linhas são geradas sob
+    demanda com `itertuples`, então o custo por mês não depende de montar
+    dicionários para o período inteiro.
+
+    Parâmetros:
+        df (pd.DataFrame): Contas com 'ano' e 'mes'.
+        ja_ordenado (bool): Se True, assume `df` já ordenado por (ano, mes)
+            (ex: `montar_matriz_periodo(df)["df"]`) e evita nova ordenação.
+
+    Gera:
+        tuple: (ano, mes, linhas), onde `linhas` é um iterador de namedtuples
+        com as colunas de `df` (ex: `linha.nome_da_conta`).
+    """
+    if df.empty:
+        return
+
+    if not ja_ordenado:
+        df = df.sort_values(by=["ano", "mes"], kind="stable")
+
+    chaves = df["ano"].to_numpy(dtype=np.int64) * 100 + df["mes"].to_numpy(dtype=np.int64)
+    inicios = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])
+    fins = np.r_[inicios[1:], len(chaves)]
+
+    for inicio, fim in zip(inicios, fins):
+        ano, mes = divmod(int(chaves[inicio]), 100)
+        yield ano, mes, df.iloc[inicio:fim].itertuples(index=False, name="Conta")
+
+
 def agrupar_por_mes(df):
-    df["chave"] = df["ano"].astype(str) + "-" + df["mes"].astype(str).str.zfill(2)
-    return df.groupby(["ano", "mes"]).apply(lambda g: g.to_dict(orient="records")).to_dict()
+    """
+    Versão materializada de `iterar_por_mes`: dict (ano, mes) → lista de dicts.
+    Mantida por compatibilidade; prefira `iterar_por_mes`.
+    """
+    return {
+        (ano, mes): [linha._asdict() for linha in linhas]
+        for ano, mes, linhas in iterar_por_mes(df)
+    }
 
 # =====================================================
 # 🔍 Identificação de Contas Recorrentes
 # =====================================================
 
 def filtrar_contas_repetidas(df):
-    return df["nome_da_conta"].value_counts()[lambda x: x > 1].index.tolist()
\ No newline at end of file
+    return df["nome_da_conta"].value_counts()[lambda x: x > 1].index.tolist()
+
+
+# =====================================================
+# 🧮 Matriz conta × mês para o relatório de período
+# =====================================================
+
+def montar_matriz_periodo(df):
+    """
+    Monta, em uma única passada, a estrutura compartilhada pelas etapas do
+    resumo de período (pizza, gráficos por conta, totais e listagem mensal).
+
+    Parâmetros:
+        df (pd.DataFrame): Contas do período com 'ano', 'mes', 'nome_da_conta' e 'valor'.
+
+    Retorno:
+        dict:
+            - 'df': contas ordenadas por (ano, mes), com índice 0..n-1
+            - 'centavos': pd.DataFrame denso conta × (ano, mes) com a soma exata em centavos (int64)
+            - 'valores': a mesma matriz em reais (float), para gráficos
+            - 'contagem': pd.DataFrame conta × (ano, mes) com o número de lançamentos
+
+        Para percorrer 'df' mês a mês: `iterar_por_mes(matriz["df"], ja_ordenado=True)`.
+    """
+    ordenado = df.sort_values(by=["ano", "mes"], kind="stable").reset_index(drop=True)
+
+    anos = ordenado["ano"].to_numpy(dtype=np.int64)
+    meses = ordenado["mes"].to_numpy(dtype=np.int64)
+    ordenado[COLUNA_CENTAVOS] = centavos_do_df(ordenado)
+    centavos = ordenado[COLUNA_CENTAVOS].to_numpy()
+
+    # Como o frame está ordenado, cada período é um bloco contíguo de linhas
+    cod_periodo, chaves_periodo = pd.factorize(anos * 100 + meses, sort=True)
+    cod_conta, contas = pd.factorize(ordenado["nome_da_conta"], use_na_sentinel=False)
+
+    somas = np.zeros((len(contas), len(chaves_periodo)), dtype=np.int64)
+    contagem = np.zeros((len(contas), len(chaves_periodo)), dtype=np.int64)
+    np.add.at(somas, (cod_conta, cod_periodo), centavos)
+    np.add.at(contagem, (cod_conta, cod_periodo), 1)
+
+    colunas = pd.MultiIndex.from_arrays(
+        [chaves_periodo // 100, chaves_periodo % 100], names=["ano", "mes"]
+    )
+    indice = pd.Index(contas, name="nome_da_conta")
+
+    return {
+        "df": ordenado,
+        "centavos": pd.DataFrame(somas, index=indice, columns=colunas),
+        "valores": pd.DataFrame(centavos_para_reais(somas), index=indice, columns=colunas),
+        "contagem": pd.DataFrame(contagem, index=indice, columns=colunas),
+    }
+
+
+def serie_da_conta(matriz, conta):
+    """
+    Retorna a evolução de uma conta a partir da matriz do período, apenas nos
+    meses em que ela teve lançamento (mesmo formato de `carregar_dados_conta_periodo`).
+
+    Retorno:
+        pd.DataFrame: Colunas ['ano', 'mes', 'valor_total'] em ordem cronológica.
+    """
+    presente = matriz["contagem"].loc[conta].to_numpy() > 0
+    valores = matriz["valores"].loc[conta]
+    return pd.DataFrame({
+        "ano": valores.index.get_level_values("ano")[presente],
+        "mes": valores.index.get_level_values("mes")[presente],
+        "valor_total": valores.to_numpy()[presente],
+    })
+
+
+def contas_recorrentes(matriz):
+    """
+    Equivalente a `filtrar_contas_repetidas`, lido da matriz do período:
+    contas com mais de um lançamento, da mais frequente para a menos frequente.
+    """
+    lancamentos = matriz["contagem"].sum(axis=1)
+    lancamentos = lancamentos[lancamentos > 1]
+    return lancamentos.sort_values(ascending=False, kind="stable").index.tolist()
@@ -1,3 +1,5 @@
+import importlib
+
 from .supabase_utils import (
     carregar_tabela,
     inserir_nova_conta,
@@ -7,4 +9,72 @@ from .supabase_utils import (
     get_nomes_conta_unicos,
     carregar_mes_referente,
     get_anos_meses_disponiveis,
+    prefetch_meses,
+    carregar_meses,
+    carregar_agregados,
+    carregar_intervalo,
+    carregar_paginado,
+    iterar_paginas,
 )
+
+from .supabase_cache import invalidar_cache_meses
+
+from .supabase_metricas import (
+    definir_tela,
+    gravar_metricas_prometheus,
+    metricas,
+    metricas_prometheus,
+    zerar_metricas,
+)
+
+from .supabase_prazo import (
+    PRAZO_EXPORTACAO_SEGUNDOS,
+    PrazoEsgotado,
+    iniciar_prazo,
+    prazo,
+    prazos_esgotados,
+    tempo_restante,
+)
+
+from .supabase_backup import fazer_backup, restaurar_backup
+
+from .supabase_dinheiro import (
+    COLUNA_CENTAVOS,
+    reais_para_centavos,
+    centavos_para_reais,
+    centavos_do_df,
+    somar_valores_por,
+)
+
+# Módulos com dependências mais pesadas, importados só no primeiro uso
+# (ex: `supabase.exportar_snapshot()`), para não pesar no startup do app:
+# o snapshot usa pyarrow.dataset/parquet e o cliente assíncrono, httpx
+_SUBMODULOS_SOB_DEMANDA = {
+    "exportar_snapshot": "supabase_snapshot",
+    "carregar_snapshot_meses": "supabase_snapshot",
+    "carregar_snapshot_intervalo": "supabase_snapshot",
+    "meses_no_snapshot": "supabase_snapshot",
+    "PASTA_SNAPSHOT": "supabase_snapshot",
+    "executar": "supabase_async",
+    "executar_em_paralelo": "supabase_async",
+    "carregar_tabela_async": "supabase_async",
+    "carregar_mes_referente_async": "supabase_async",
+    "carregar_meses_async": "supabase_async",
+    "get_nomes_conta_unicos_async": "supabase_async",
+    "get_anos_meses_disponiveis_async": "supabase_async",
+    "inserir_nova_conta_async": "supabase_async",
+    "editar_conta_async": "supabase_async",
+    "excluir_conta_async": "supabase_async",
+    "salvar_conta_async": "supabase_async",
+}
+
+
+def __getattr__(nome):
+    submodulo = _SUBMODULOS_SOB_DEMANDA.get(nome)
+    if submodulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+    modulo = importlib.import_module(f"{__name__}.{submodulo}")
+    valor = getattr(modulo, nome)
+    globals()[nome] = valor
+    return valor
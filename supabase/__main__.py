@@ -0,0 +1,132 @@
+# ====================================
+# 🖥️ LINHA DE COMANDO: manutenção dos dados do Supabase
+# ====================================
+# Exemplos:
+#   SUPABASE_URL=... SUPABASE_KEY=... python -m supabase snapshot
+#   python -m supabase snapshot --pasta snapshot --completo
+#   python -m supabase backup --arquivo backup_contas.ndjson.gz
+#   python -m supabase restaurar --arquivo backup_contas.ndjson.gz
+#   python -m supabase benchmark --inicio 2023 --fim 2025
+
+import argparse
+import sys
+import time
+
+
+def _inteiro_positivo(texto):
+    """Converte um inteiro maior que zero (ex: --linhas-por-pagina)."""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"inteiro inválido: {texto!r}")
+    if valor <= 0:
+        raise argparse.ArgumentTypeError(f"deve ser maior que zero (recebido: {valor})")
+    return valor
+
+
+def _snapshot(args):
+    from .supabase_snapshot import exportar_snapshot
+
+    gravados = exportar_snapshot(args.pasta, completo=args.completo)
+    if gravados is None:
+        print("❌ Snapshot interrompido por erro na leitura. Execute o mesmo comando para tentar de novo.")
+        return 1
+    if gravados:
+        (mes_i, ano_i), (mes_f, ano_f) = gravados[0], gravados[-1]
+        print(f"✅ {len(gravados)} mês(es) gravado(s) em {args.pasta} ({mes_i:02d}/{ano_i} a {mes_f:02d}/{ano_f})")
+    else:
+        print("Nenhum mês gravado.")
+    return 0
+
+
+def _backup(args):
+    from .supabase_backup import fazer_backup
+
+    linhas = fazer_backup(args.arquivo, linhas_por_pagina=args.linhas_por_pagina)
+    if linhas is None:
+        print("❌ Backup interrompido. Execute o mesmo comando para continuar de onde parou.")
+        return 1
+    print(f"✅ {linhas} conta(s) salvas em {args.arquivo}")
+    return 0
+
+
+def _restaurar(args):
+    from .supabase_backup import restaurar_backup
+
+    linhas = restaurar_backup(args.arquivo, linhas_por_lote=args.linhas_por_lote)
+    if linhas is None:
+        print("❌ Restauração interrompida. Pode ser repetida sem duplicar contas.")
+        return 1
+    print(f"✅ {linhas} conta(s) restauradas de {args.arquivo}")
+    return 0
+
+
+def _benchmark(args):
+    import pandas as pd
+    from .supabase_transporte import FORMATOS, diferencas_formatos, orjson
+    from .supabase_utils import carregar_paginado
+
+    params = {"select": "*", "and": f"(ano.gte.{args.inicio},ano.lte.{args.fim})"}
+    print(f"Anos {args.inicio}–{args.fim}, melhor de {args.repeticoes} (orjson: {'sim' if orjson else 'não'})")
+    for formato in FORMATOS:
+        melhor, linhas = None, 0
+        for _ in range(args.repeticoes):
+            inicio = time.perf_counter()
+            linhas = sum(len(df) for df in carregar_paginado(params, formato=formato))
+            duracao = time.perf_counter() - inicio
+            melhor = duracao if melhor is None else min(melhor, duracao)
+        print(f"  {formato:<5} {linhas:>7} linhas  {melhor * 1000:8.1f} ms")
+
+    # Os dois formatos precisam devolver o mesmo DataFrame para as mesmas linhas
+    quadros = {
+        formato: pd.concat(list(carregar_paginado(params, formato=formato)) or [pd.DataFrame()], ignore_index=True)
+        for formato in FORMATOS
+    }
+    diferentes = diferencas_formatos(quadros["json"], quadros["csv"])
+    if diferentes:
+        print(f"❌ JSON e CSV divergem nas colunas: {', '.join(diferentes)}")
+        return 1
+    print("✅ JSON e CSV devolvem os mesmos dados")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m supabase", description="Manutenção dos dados do Supabase.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    snapshot = comandos.add_parser(
+        "snapshot", help="Exporta a tabela para Parquet (por ano/mês), só os meses novos por padrão",
+    )
+    snapshot.add_argument("--pasta", default="snapshot", help="Pasta do snapshot (padrão: snapshot)")
+    snapshot.add_argument("--completo", action="store_true", help="Regrava todos os meses")
+    snapshot.set_defaults(executar=_snapshot)
+
+    backup = comandos.add_parser(
+        "backup", help="Copia a tabela para NDJSON compactado (retoma um backup interrompido)",
+    )
+    backup.add_argument("--arquivo", default="backup_contas.ndjson.gz", help="Arquivo de backup")
+    backup.add_argument(
+        "--linhas-por-pagina", type=_inteiro_positivo, default=1000,
+        help="Linhas por requisição (padrão: 1000; acima do max-rows do PostgREST, as páginas só vêm menores)",
+    )
+    backup.set_defaults(executar=_backup)
+
+    restaurar = comandos.add_parser("restaurar", help="Restaura um backup (upsert por id, em lotes)")
+    restaurar.add_argument("--arquivo", default="backup_contas.ndjson.gz", help="Arquivo de backup")
+    restaurar.add_argument("--linhas-por-lote", type=_inteiro_positivo, default=500, help="Contas por requisição (padrão: 500)")
+    restaurar.set_defaults(executar=_restaurar)
+
+    benchmark = comandos.add_parser(
+        "benchmark", help="Compara o tempo de leitura (requisição + decodificação) em JSON e em CSV",
+    )
+    benchmark.add_argument("--inicio", type=int, required=True, help="Primeiro ano")
+    benchmark.add_argument("--fim", type=int, required=True, help="Último ano")
+    benchmark.add_argument("--repeticoes", type=int, default=3, help="Repetições por formato (padrão: 3)")
+    benchmark.set_defaults(executar=_benchmark)
+
+    args = parser.parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
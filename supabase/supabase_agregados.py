@@ -0,0 +1,182 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .supabase_cache import TTL_CACHE_SEGUNDOS, geracao_mes
+from .supabase_dinheiro import COLUNA_CENTAVOS, centavos_do_df, reais_para_centavos
+
+
+# ==============================
+# 🧮 AGREGADOS MENSAIS
+# ==============================
+
+# Para cada mês carregado, somas (em centavos) e contagens por
+# (nome_da_conta, quem_pagou, dividida). É mantido em dia pelas escritas feitas
+# pelo app (deltas de inserção, edição e exclusão), descartado quando um delta
+# não pode ser aplicado com segurança e vale pelo mesmo TTL do cache de meses
+# (calculado junto com ele, em `_guardar_mes`): alterações feitas fora do app
+# aparecem quando o mês é recarregado do Supabase.
+# Só meses lidos com sucesso viram agregados; em erro ou prazo esgotado, os dados
+# de reserva entram no resultado (`calcular_agregados`) sem ficarem guardados.
+
+CHAVES_AGREGADO = ["nome_da_conta", "quem_pagou", "dividida"]
+# A soma usa o mesmo nome da coluna de centavos das contas (`valor_centavos`),
+# então funções que somam contas (ex: `centavos_do_df`) aceitam os agregados direto
+COLUNAS_AGREGADOS = ["ano", "mes"] + CHAVES_AGREGADO + [COLUNA_CENTAVOS, "contagem"]
+
+_agregados = {}  # (mes, ano) -> (instante, {(nome_da_conta, quem_pagou, dividida): [centavos, contagem]})
+_lock = threading.Lock()
+
+
+def _chave_linha(nome_da_conta, quem_pagou, dividida):
+    # Mesmo critério dos relatórios (`df["dividida"] == True`): vazio/NaN conta como False
+    return (nome_da_conta, quem_pagou, bool(dividida == True))
+
+
+def _agrupar(df):
+    """{(nome_da_conta, quem_pagou, dividida): [centavos, contagem]} das contas de um mês."""
+    grupos = {}
+    if not df.empty:
+        centavos = centavos_do_df(df)
+        colunas = [df[c] if c in df.columns else pd.Series(None, index=df.index) for c in CHAVES_AGREGADO]
+        somas = (
+            pd.DataFrame({"centavos": centavos, "contagem": np.ones(len(df), dtype=np.int64)}, index=df.index)
+            .groupby([c.rename(nome) for c, nome in zip(colunas, CHAVES_AGREGADO)], dropna=False)
+            .sum()
+        )
+        for (conta, pagador, dividida), linha in zip(somas.index, somas.itertuples(index=False)):
+            # 'dividida' vazia conta como False: acumula em vez de sobrescrever
+            atual = grupos.setdefault(_chave_linha(conta, pagador, dividida), [0, 0])
+            atual[0] += int(linha.centavos)
+            atual[1] += int(linha.contagem)
+    return grupos
+
+
+def guardar_agregados_mes(mes, ano, df, geracao=None):
+    """
+    (Re)calcula os agregados de um mês a partir das contas recém-carregadas
+    do Supabase (nunca de dados de reserva, que ficariam guardados como atuais).
+
+    Parâmetros:
+    - mes (int): Mês (1 a 12)
+    - ano (int): Ano (ex: 2025)
+    - df (pd.DataFrame): Contas do mês (pode estar vazio).
+    - geracao (tuple, opcional): `geracao_mes` lida antes da busca. Se o mês foi
+      invalidado desde então, os agregados não são guardados.
+
+    Retorno:
+    - bool: True se os agregados foram guardados.
+    """
+    grupos = _agrupar(df)
+    with _lock:
+        # Conferida sob o mesmo lock dos deltas: uma escrita que invalida o mês
+        # depois daqui aplica seu delta sobre estes agregados, e uma que
+        # invalidou antes faz com que sejam descartados
+        if geracao is not None and geracao != geracao_mes(mes, ano):
+            return False
+        _agregados[(int(mes), int(ano))] = (time.monotonic(), grupos)
+    return True
+
+
+def _registros(mes, ano, grupos):
+    return [
+        (int(ano), int(mes), conta, pagador, dividida, centavos, contagem)
+        for (conta, pagador, dividida), (centavos, contagem) in grupos.items()
+    ]
+
+
+def _dataframe_agregados(registros):
+    df = pd.DataFrame.from_records(registros, columns=COLUNAS_AGREGADOS)
+    return df.astype({"ano": np.int64, "mes": np.int64, COLUNA_CENTAVOS: np.int64, "contagem": np.int64})
+
+
+def calcular_agregados(df):
+    """
+    Agregados (no formato de `obter_agregados`) das contas de um ou mais meses,
+    sem guardá-los — para dados de reserva, como um mês em cache já expirado.
+
+    Parâmetros:
+    - df (pd.DataFrame): Contas com 'mes' e 'ano'.
+
+    Retorno:
+    - pd.DataFrame: Colunas COLUNAS_AGREGADOS.
+    """
+    registros = []
+    if not df.empty:
+        for (mes, ano), grupo in df.groupby(["mes", "ano"], sort=False):
+            registros.extend(_registros(mes, ano, _agrupar(grupo)))
+    return _dataframe_agregados(registros)
+
+
+def aplicar_delta_agregados(linha, sinal):
+    """
+    Soma (sinal=+1) ou subtrai (sinal=-1) uma conta dos agregados do seu mês.
+    Meses que ainda não têm agregados são ignorados: serão calculados quando
+    forem carregados.
+
+    Parâmetros:
+    - linha (dict): Conta como devolvida pelo Supabase (com 'mes', 'ano', 'valor'...).
+    - sinal (int): +1 para inclusão, -1 para remoção.
+    """
+    try:
+        chave_mes = (int(linha["mes"]), int(linha["ano"]))
+    except (KeyError, TypeError, ValueError):
+        return
+
+    chave = _chave_linha(linha.get("nome_da_conta"), linha.get("quem_pagou"), linha.get("dividida"))
+    centavos = int(reais_para_centavos([linha.get("valor")])[0])
+
+    with _lock:
+        item = _agregados.get(chave_mes)
+        if item is None:
+            return
+        grupos = item[1]
+        atual = grupos.setdefault(chave, [0, 0])
+        atual[0] += sinal * centavos
+        atual[1] += sinal
+        if atual[1] <= 0:
+            del grupos[chave]
+
+
+def descartar_agregados(mes=None, ano=None):
+    """
+    Descarta os agregados de um mês (ou de todos, sem parâmetros), para que
+    sejam recalculados no próximo carregamento.
+    """
+    with _lock:
+        if mes is None or ano is None:
+            _agregados.clear()
+        else:
+            _agregados.pop((int(mes), int(ano)), None)
+
+
+def obter_agregados(meses):
+    """
+    Lê os agregados já disponíveis (e dentro do TTL) para os meses pedidos.
+
+    Parâmetros:
+    - meses (iterable): Pares (mes, ano).
+
+    Retorno:
+    - tuple:
+        - pd.DataFrame: Colunas COLUNAS_AGREGADOS, uma linha por (mês, conta, pagador, dividida).
+        - list: Pares (mes, ano) sem agregados (ou com agregados expirados).
+    """
+    registros = []
+    faltantes = []
+    agora = time.monotonic()
+    with _lock:
+        for mes, ano in meses:
+            item = _agregados.get((int(mes), int(ano)))
+            if item is None or agora - item[0] > TTL_CACHE_SEGUNDOS:
+                faltantes.append((int(mes), int(ano)))
+                continue
+            registros.extend(_registros(mes, ano, item[1]))
+
+    return _dataframe_agregados(registros), faltantes
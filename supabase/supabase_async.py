@@ -0,0 +1,344 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+import asyncio
+from datetime import date, datetime
+import json
+import threading
+import time
+import weakref
+
+from dateutil.relativedelta import relativedelta
+import httpx
+import pandas as pd
+
+from .supabase_cache import geracao_mes, invalidar_cache_meses, obter_mes_cache, obter_mes_em_andamento
+from .supabase_config import HEADERS, SUPABASE_URL, TABELA
+from .supabase_dinheiro import adicionar_coluna_centavos, remover_colunas_derivadas
+from .supabase_metricas import (
+    chave_endpoint,
+    definir_tela,
+    registrar_cache,
+    registrar_linhas,
+    registrar_requisicao,
+    tela_atual,
+)
+from .supabase_prazo import PrazoEsgotado, estado_prazo, prazo_esgotado, tempo_restante, timeout_requisicao, usar_prazo
+from .supabase_transporte import FORMATO_TRANSPORTE, cabecalhos_formato, decodificar_dataframe, decodificar_linhas
+from .supabase_utils import (
+    LINHAS_POR_PAGINA,
+    _anos_meses_a_partir_de,
+    _conta_anterior_em_cache,
+    _escrita_sem_resposta,
+    _guardar_mes,
+    _leitura_terminou,
+    _mes_desatualizado,
+    _nomes_da_pagina,
+    _registrar_edicao,
+    _registrar_exclusao,
+    _registrar_insercao,
+    _ultimos_resultados,
+)
+
+
+# ==============================
+# ⚡ CLIENTE ASSÍNCRONO (httpx)
+# ==============================
+
+# Versões `async` das funções de `supabase_utils`, para fluxos que precisam de
+# várias leituras ao mesmo tempo (relatórios, lembretes, prefetch). Cache de
+# meses e agregados são os mesmos do cliente síncrono.
+#
+# O Streamlit roda o script em uma thread sem event loop: `executar` e
+# `executar_em_paralelo` mandam as corrotinas para um loop próprio, em uma
+# thread de fundo que vive enquanto o processo viver, e esperam o resultado.
+# Cada loop tem um único `httpx.AsyncClient`, com conexões reaproveitadas.
+# O prazo do rerun (`supabase_prazo`) e a tela das métricas (`supabase_metricas`)
+# acompanham as corrotinas até o loop de fundo.
+
+LIMITE_CONEXOES = 10
+TIMEOUT_SEGUNDOS = 30
+
+_clientes = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+_loop_fundo = None
+_lock = threading.Lock()
+
+
+def _cliente():
+    """Cliente HTTP compartilhado do event loop atual (criado no primeiro uso)."""
+    loop = asyncio.get_running_loop()
+    cliente = _clientes.get(loop)
+    if cliente is None:
+        cliente = httpx.AsyncClient(
+            base_url=f"{SUPABASE_URL}/rest/v1/",
+            headers=HEADERS,
+            limits=httpx.Limits(max_connections=LIMITE_CONEXOES, max_keepalive_connections=LIMITE_CONEXOES),
+            timeout=TIMEOUT_SEGUNDOS,
+        )
+        _clientes[loop] = cliente
+    return cliente
+
+
+def _obter_loop_fundo():
+    """Event loop da thread de fundo usada pela fachada síncrona (iniciado no primeiro uso)."""
+    global _loop_fundo
+    with _lock:
+        if _loop_fundo is None:
+            _loop_fundo = asyncio.new_event_loop()
+            threading.Thread(target=_loop_fundo.run_forever, name="supabase_async", daemon=True).start()
+        return _loop_fundo
+
+
+def executar(corrotina, timeout=None):
+    """
+    Executa uma corrotina deste módulo a partir de código síncrono (ex: script
+    do Streamlit) e devolve o resultado.
+
+    Parâmetros:
+    - corrotina: Ex: `carregar_meses_async([(4, 2025), (3, 2025)])`.
+    - timeout (float, opcional): Segundos máximos de espera.
+    """
+    estado, tela = estado_prazo(), tela_atual()
+
+    async def _no_prazo_de_quem_chamou():
+        usar_prazo(estado)
+        definir_tela(tela)
+        return await corrotina
+
+    return asyncio.run_coroutine_threadsafe(_no_prazo_de_quem_chamou(), _obter_loop_fundo()).result(timeout)
+
+
+def executar_em_paralelo(*corrotinas, timeout=None):
+    """
+    Executa várias corrotinas ao mesmo tempo e devolve os resultados na mesma ordem.
+
+    Exemplo:
+        (anos, meses), contas = executar_em_paralelo(
+            get_anos_meses_disponiveis_async(), get_nomes_conta_unicos_async(),
+        )
+    """
+    async def _reunir():
+        return await asyncio.gather(*corrotinas)
+
+    return executar(_reunir(), timeout=timeout)
+
+
+async def _requisitar(metodo, descricao, **kwargs):
+    """Requisição com o timeout limitado ao prazo atual (PrazoEsgotado se ele acabar)."""
+    conexao, leitura = timeout_requisicao(descricao)
+    inicio = time.perf_counter()
+    status, tamanho = None, 0
+    try:
+        response = await _cliente().request(metodo, TABELA, timeout=httpx.Timeout(leitura, connect=conexao), **kwargs)
+        status, tamanho = response.status_code, len(response.content)
+        return response
+    except httpx.TimeoutException as e:
+        if tempo_restante() is None:
+            raise
+        raise prazo_esgotado(descricao) from e
+    finally:
+        registrar_requisicao(
+            metodo, chave_endpoint(TABELA, kwargs.get("params")), time.perf_counter() - inicio, status, tamanho,
+        )
+
+
+# ==============================
+# 📑 LEITURA PAGINADA
+# ==============================
+
+async def _paginas_async(params, decodificar, headers=None, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """Equivalente assíncrono de `supabase_utils._paginas` (keyset por id)."""
+    params = dict(params or {})
+    colunas = params.get("select", "*")
+    if colunas != "*" and "id" not in colunas.split(","):
+        params["select"] = f"{colunas},id"
+    params.update({"order": "id.asc", "limit": linhas_por_pagina})
+
+    ultimo_id = 0
+    while True:
+        params_pagina = {**params, "id": f"gt.{ultimo_id}"}
+        response = await _requisitar("GET", f"página após o id {ultimo_id}", params=params_pagina, headers=headers)
+        if response.status_code != 200:
+            print(f"Erro ao carregar página após o id {ultimo_id}: {response.status_code} | {response.text}")
+            response.raise_for_status()
+
+        pagina = decodificar(response)
+        registrar_linhas("GET", chave_endpoint(TABELA, params_pagina), len(pagina))
+        if len(pagina):
+            yield pagina
+        if _leitura_terminou(len(pagina), linhas_por_pagina):
+            return
+        ultimo_id = int(pagina["id"].iloc[-1]) if isinstance(pagina, pd.DataFrame) else pagina[-1]["id"]
+
+
+async def _carregar_todas_paginas_async(params, descricao):
+    """DataFrame com todas as páginas, vazio se não houver linhas ou None em caso de erro."""
+    formato = FORMATO_TRANSPORTE
+    partes = []
+    try:
+        async for df in _paginas_async(
+            params, lambda response: decodificar_dataframe(response, formato), cabecalhos_formato({}, formato),
+        ):
+            partes.append(adicionar_coluna_centavos(df))
+    except (httpx.HTTPError, PrazoEsgotado) as e:
+        print(f"Erro ao carregar {descricao}: {e}")
+        return None
+    if not partes:
+        return pd.DataFrame()
+    return partes[0] if len(partes) == 1 else pd.concat(partes, ignore_index=True)
+
+
+# ==============================
+# 📥 CARREGAMENTO DE DADOS
+# ==============================
+
+async def carregar_tabela_async(mes, ano):
+    """
+    Versão assíncrona de `carregar_tabela`: usa o mesmo cache de meses e
+    aproveita buscas já em andamento no prefetch.
+
+    Retorno:
+    - pd.DataFrame: Contas do mês (vazio se não houver; em caso de erro, a
+      versão em cache mesmo expirada, se houver).
+    """
+    df = obter_mes_cache(mes, ano)
+    if df is not None:
+        registrar_cache("meses", acerto=True)
+        return df
+
+    futuro = obter_mes_em_andamento(mes, ano)
+    if futuro is not None:
+        try:
+            df = await asyncio.wait_for(asyncio.wrap_future(futuro), tempo_restante())
+        except Exception:
+            df = None  # não terminou a tempo
+        if df is not None:
+            registrar_cache("meses", acerto=True)
+            return df.copy()
+        # falhou em segundo plano (None) ou não terminou → busca abaixo
+
+    registrar_cache("meses", acerto=False)
+
+    geracao = geracao_mes(mes, ano)
+    df = await _carregar_todas_paginas_async({"mes": f"eq.{mes}", "ano": f"eq.{ano}", "select": "*"}, f"mês {mes}/{ano}")
+    if df is None:
+        return _mes_desatualizado(mes, ano)
+    _guardar_mes(mes, ano, df, geracao)
+    return df
+
+
+async def carregar_mes_referente_async(mes, ano, delta_meses=0, delta_anos=0):
+    """Versão assíncrona de `carregar_mes_referente`."""
+    data_destino = datetime(ano, mes, 1) + relativedelta(months=delta_meses, years=delta_anos)
+    return await carregar_tabela_async(data_destino.month, data_destino.year)
+
+
+async def carregar_meses_async(meses):
+    """
+    Carrega vários meses ao mesmo tempo (uma requisição por mês fora do
+    cache, todas em paralelo) e devolve as contas concatenadas.
+
+    Parâmetros:
+    - meses (iterable): Pares (mes, ano).
+
+    Retorno:
+    - pd.DataFrame: Contas de todos os meses (vazio se não houver nenhuma).
+    """
+    pares = list(dict.fromkeys((int(m), int(a)) for m, a in meses))
+    partes = await asyncio.gather(*(carregar_tabela_async(mes, ano) for mes, ano in pares))
+    partes = [df for df in partes if not df.empty]
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes, ignore_index=True)
+
+
+async def get_nomes_conta_unicos_async():
+    """Versão assíncrona de `get_nomes_conta_unicos`."""
+    nomes = set()
+    try:
+        async for pagina in _paginas_async({"select": "nome_da_conta,instancia"}, decodificar_linhas):
+            nomes.update(_nomes_da_pagina(pagina))
+    except (httpx.HTTPError, PrazoEsgotado) as e:
+        print(f"Erro ao carregar nomes de contas: {e}")
+        return list(_ultimos_resultados.get("nomes_conta", []))
+    _ultimos_resultados["nomes_conta"] = sorted(nomes)
+    return sorted(nomes)
+
+
+async def get_anos_meses_disponiveis_async():
+    """Versão assíncrona de `get_anos_meses_disponiveis`."""
+    try:
+        response = await _requisitar("GET", "anos disponíveis", params={"select": "ano", "order": "ano.asc", "limit": 1})
+        if response.status_code == 200:
+            _ultimos_resultados["anos_meses"] = _anos_meses_a_partir_de(response.json())
+            return _ultimos_resultados["anos_meses"]
+        print(f"Erro ao montar intervalo de anos: {response.status_code} | {response.text}")
+    except (httpx.HTTPError, PrazoEsgotado) as e:
+        print(f"Erro ao montar intervalo de anos: {e}")
+    return _ultimos_resultados.get("anos_meses", ([], []))
+
+
+# ==============================
+# ✍️ INSERÇÃO, EDIÇÃO E EXCLUSÃO
+# ==============================
+
+async def inserir_nova_conta_async(dados_dict):
+    """Versão assíncrona de `inserir_nova_conta`."""
+    dados_dict = remover_colunas_derivadas(dados_dict)
+    try:
+        response = await _requisitar(
+            "POST", "inserção", content=json.dumps([dados_dict]), headers={"Prefer": "return=representation"},
+        )
+    except (httpx.TimeoutException, PrazoEsgotado) as e:
+        return _escrita_sem_resposta(e, dados_dict.get("mes"), dados_dict.get("ano"))
+    return _registrar_insercao(dados_dict, response)
+
+
+async def editar_conta_async(id_conta, dados_dict):
+    """Versão assíncrona de `editar_conta`."""
+    dados_dict.pop("id", None)
+    dados_dict = remover_colunas_derivadas(dados_dict)
+
+    # Versão anterior da conta, para retirar dos agregados
+    anterior = _conta_anterior_em_cache(id_conta, dados_dict.get("mes"), dados_dict.get("ano"))
+    if anterior is None:
+        try:
+            response = await _requisitar("GET", f"conta {id_conta}", params={"id": f"eq.{id_conta}", "select": "*"})
+            if response.status_code == 200 and response.json():
+                anterior = response.json()[0]
+        except (httpx.HTTPError, PrazoEsgotado) as e:
+            print(f"Erro ao buscar a conta {id_conta}: {e}")
+
+    try:
+        response = await _requisitar(
+            "PATCH", "edição", params={"id": f"eq.{id_conta}"}, content=json.dumps(dados_dict),
+            headers={"Prefer": "return=representation"},
+        )
+    except (httpx.TimeoutException, PrazoEsgotado) as e:
+        if anterior is not None:
+            invalidar_cache_meses(anterior.get("mes"), anterior.get("ano"))
+        return _escrita_sem_resposta(e, dados_dict.get("mes"), dados_dict.get("ano"))
+    return _registrar_edicao(dados_dict, anterior, response)
+
+
+async def excluir_conta_async(id_conta):
+    """Versão assíncrona de `excluir_conta`."""
+    try:
+        response = await _requisitar(
+            "DELETE", "exclusão", params={"id": f"eq.{id_conta}"}, headers={"Prefer": "return=representation"},
+        )
+    except (httpx.TimeoutException, PrazoEsgotado) as e:
+        return _escrita_sem_resposta(e)
+    print(f"🔁 DELETE {TABELA}?id=eq.{id_conta} | Status: {response.status_code} | Response: {response.text}")
+    return _registrar_exclusao(response)
+
+
+async def salvar_conta_async(dados_dict):
+    """Versão assíncrona de `salvar_conta` (insere sem 'id', edita com 'id')."""
+    if isinstance(dados_dict.get("data_de_pagamento"), (datetime, date)):
+        dados_dict["data_de_pagamento"] = dados_dict["data_de_pagamento"].isoformat()
+
+    if dados_dict.get("id"):
+        return await editar_conta_async(dados_dict["id"], dados_dict)
+    return await inserir_nova_conta_async(dados_dict)
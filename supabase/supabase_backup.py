@@ -0,0 +1,169 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+import gzip
+import json
+import os
+
+import requests
+
+from .supabase_agregados import descartar_agregados
+from .supabase_cache import invalidar_cache_meses
+from .supabase_config import HEADERS, SUPABASE_URL, TABELA
+from .supabase_dinheiro import remover_colunas_derivadas
+from .supabase_metricas import chave_endpoint, medir
+from .supabase_prazo import timeout_requisicao
+from .supabase_utils import LINHAS_POR_PAGINA, iterar_paginas
+
+
+# ==============================
+# 💾 BACKUP EM NDJSON COMPACTADO
+# ==============================
+
+# Uma conta por linha (JSON), em um arquivo .ndjson.gz. A tabela é lida em
+# páginas ordenadas por id (`iterar_paginas`), e cada página é gravada como
+# um membro gzip independente; a memória usada não depende do tamanho da tabela.
+#
+# Depois de cada página, o checkpoint (<arquivo>.checkpoint) guarda o último id e
+# o tamanho do arquivo. Um backup interrompido é retomado de onde parou: o
+# arquivo é truncado no último ponto consistente e a leitura continua do id salvo.
+
+ARQUIVO_BACKUP = "backup_contas.ndjson.gz"
+LINHAS_POR_LOTE_RESTAURACAO = 500
+
+
+def _caminho_checkpoint(arquivo):
+    return f"{arquivo}.checkpoint"
+
+
+def _ler_checkpoint(arquivo):
+    try:
+        with open(_caminho_checkpoint(arquivo), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _gravar_checkpoint(arquivo, checkpoint):
+    # Grava em um arquivo temporário e substitui: o checkpoint nunca fica pela metade
+    temporario = _caminho_checkpoint(arquivo) + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(temporario, _caminho_checkpoint(arquivo))
+
+
+def fazer_backup(arquivo=ARQUIVO_BACKUP, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """
+    Copia a tabela de contas para um arquivo NDJSON compactado (gzip).
+
+    Se existir um checkpoint de um backup não concluído, continua a partir dele;
+    caso contrário, começa um backup novo (sobrescrevendo `arquivo`).
+
+    Parâmetros:
+    - arquivo (str): Caminho do backup (ex: "backup_contas.ndjson.gz").
+    - linhas_por_pagina (int): Linhas por requisição (acima do `max-rows` do
+      PostgREST, cada página vem com só `max-rows` linhas; nada se perde).
+
+    Retorno:
+    - int | None: Total de linhas no backup, ou None se for interrompido por erro
+      (o checkpoint permite retomar).
+    """
+    checkpoint = _ler_checkpoint(arquivo)
+    if checkpoint and not checkpoint.get("concluido") and os.path.exists(arquivo):
+        print(f"Retomando o backup após o id {checkpoint['ultimo_id']} ({checkpoint['linhas']} linhas já salvas).")
+        # Descarta o que foi gravado depois do último checkpoint (ex: página pela metade)
+        with open(arquivo, "r+b") as f:
+            f.truncate(checkpoint["bytes"])
+    else:
+        checkpoint = {"ultimo_id": 0, "linhas": 0, "bytes": 0, "concluido": False}
+        open(arquivo, "wb").close()
+        _gravar_checkpoint(arquivo, checkpoint)
+
+    paginas = iterar_paginas({"select": "*"}, linhas_por_pagina, apos_id=checkpoint["ultimo_id"])
+    while True:
+        try:
+            pagina = next(paginas, None)
+        except requests.RequestException as e:
+            print(f"Backup interrompido após o id {checkpoint['ultimo_id']}: {e}")
+            return None
+        if pagina is None:
+            break
+
+        with open(arquivo, "ab") as destino, gzip.GzipFile(fileobj=destino, mode="wb") as saida:
+            for linha in pagina:
+                saida.write(json.dumps(linha, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        checkpoint["ultimo_id"] = max(linha["id"] for linha in pagina)
+        checkpoint["linhas"] += len(pagina)
+        checkpoint["bytes"] = os.path.getsize(arquivo)
+        _gravar_checkpoint(arquivo, checkpoint)
+
+    checkpoint["concluido"] = True
+    _gravar_checkpoint(arquivo, checkpoint)
+    return checkpoint["linhas"]
+
+
+# ==============================
+# ♻️ RESTAURAÇÃO
+# ==============================
+
+def _enviar_lote(lote):
+    """Insere (ou atualiza, se o id já existir) um lote de contas. Retorna True se deu certo."""
+    url = f"{SUPABASE_URL}/rest/v1/{TABELA}"
+    headers = {**HEADERS, "Prefer": "resolution=merge-duplicates,return=minimal"}
+    try:
+        params = {"on_conflict": "id"}
+        response = medir(
+            "POST", chave_endpoint(url, params), requests.post,
+            url, headers=headers, params=params, data=json.dumps(lote), timeout=timeout_requisicao("restauração"),
+        )
+    except requests.RequestException as e:
+        print(f"Erro ao restaurar lote (ids {lote[0].get('id')}–{lote[-1].get('id')}): {e}")
+        return False
+    if response.status_code not in (200, 201, 204):
+        print(f"Erro ao restaurar lote (ids {lote[0].get('id')}–{lote[-1].get('id')}): {response.status_code} | {response.text}")
+        return False
+    return True
+
+
+def restaurar_backup(arquivo=ARQUIVO_BACKUP, linhas_por_lote=LINHAS_POR_LOTE_RESTAURACAO):
+    """
+    Restaura um backup gerado por `fazer_backup`, lendo o arquivo em fluxo e
+    enviando as contas em lotes (`POST` com vários registros).
+
+    Os ids do backup são mantidos e linhas já existentes são atualizadas
+    (upsert por id), então restaurar de novo o mesmo arquivo, ou retomar uma
+    restauração interrompida, não duplica contas.
+
+    Parâmetros:
+    - arquivo (str): Caminho do backup.
+    - linhas_por_lote (int): Contas por requisição.
+
+    Retorno:
+    - int | None: Linhas restauradas, ou None se algum lote falhar.
+    """
+    restauradas = 0
+    lote = []
+    try:
+        with gzip.open(arquivo, "rt", encoding="utf-8") as origem:
+            for texto in origem:
+                if not texto.strip():
+                    continue
+                lote.append(remover_colunas_derivadas(json.loads(texto)))
+                if len(lote) >= linhas_por_lote:
+                    if not _enviar_lote(lote):
+                        return None
+                    restauradas += len(lote)
+                    lote = []
+        if lote:
+            if not _enviar_lote(lote):
+                return None
+            restauradas += len(lote)
+    finally:
+        # As contas mudaram por fora do fluxo normal de escrita
+        if restauradas:
+            invalidar_cache_meses()
+            descartar_agregados()
+
+    return restauradas
@@ -0,0 +1,145 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+import threading
+import time
+
+
+# ==============================
+# 🗃️ CACHE DE MESES CARREGADOS
+# ==============================
+
+# Tempo (em segundos) que um mês carregado permanece válido no cache.
+# O cache é compartilhado por todas as sessões do processo Streamlit, então
+# alterações feitas fora do app (ex: painel do Supabase) aparecem após esse prazo.
+TTL_CACHE_SEGUNDOS = 300
+
+_cache_meses = {}        # (mes, ano) -> (instante, DataFrame)
+_meses_em_andamento = {}  # (mes, ano) -> Future da busca em segundo plano
+_lock = threading.Lock()
+
+# Geração de cada mês: muda a cada invalidação. Uma busca iniciada antes de uma
+# escrita termina depois dela com as linhas antigas; comparando a geração do
+# início da busca com a atual, esse resultado é descartado em vez de guardado.
+_geracoes = {}        # (mes, ano) -> int
+_geracao_global = 0   # incrementada quando o cache inteiro é invalidado
+
+
+def geracao_mes(mes, ano):
+    """
+    Geração atual do mês, a ser lida antes de buscá-lo e repassada a
+    `guardar_mes_cache` (ex: `geracao = geracao_mes(4, 2025)`).
+    """
+    with _lock:
+        return (_geracao_global, _geracoes.get((int(mes), int(ano)), 0))
+
+
+def obter_mes_cache(mes, ano, aceitar_expirado=False):
+    """
+    Retorna uma cópia do DataFrame do mês se ele estiver no cache e ainda válido.
+
+    Meses expirados continuam guardados (até serem recarregados ou invalidados)
+    para servirem de reserva quando o Supabase não responde a tempo.
+
+    Parâmetros:
+    - mes (int): Mês desejado (1 a 12)
+    - ano (int): Ano desejado (ex: 2025)
+    - aceitar_expirado (bool): Devolve o mês mesmo depois do TTL.
+
+    Retorno:
+    - pd.DataFrame | None: Cópia dos dados em cache ou None se ausente/expirado.
+    """
+    chave = (int(mes), int(ano))
+    with _lock:
+        item = _cache_meses.get(chave)
+        if item is None:
+            return None
+        instante, df = item
+        if not aceitar_expirado and time.monotonic() - instante > TTL_CACHE_SEGUNDOS:
+            return None
+    # Cópia para que quem chama possa alterar o DataFrame sem afetar o cache
+    return df.copy()
+
+
+def guardar_mes_cache(mes, ano, df, geracao=None):
+    """
+    Armazena o DataFrame de um mês no cache.
+
+    Parâmetros:
+    - mes (int): Mês (1 a 12)
+    - ano (int): Ano (ex: 2025)
+    - df (pd.DataFrame): Dados carregados do Supabase.
+    - geracao (tuple, opcional): `geracao_mes` lida antes da busca. Se o mês foi
+      invalidado desde então (ex: uma escrita), o resultado não é guardado.
+
+    Retorno:
+    - bool: True se o mês foi guardado.
+    """
+    chave = (int(mes), int(ano))
+    with _lock:
+        if geracao is not None and geracao != (_geracao_global, _geracoes.get(chave, 0)):
+            return False
+        _cache_meses[chave] = (time.monotonic(), df.copy())
+    return True
+
+
+def invalidar_cache_meses(mes=None, ano=None):
+    """
+    Remove meses do cache. Sem parâmetros, limpa o cache inteiro.
+
+    Buscas em segundo plano já iniciadas deixam de ser reaproveitadas e, ao
+    terminar, não guardam o resultado (podem ter lido o mês antes da escrita).
+
+    Parâmetros:
+    - mes (int, opcional): Mês a remover.
+    - ano (int, opcional): Ano a remover.
+    """
+    global _geracao_global
+    with _lock:
+        if mes is None or ano is None:
+            _cache_meses.clear()
+            _meses_em_andamento.clear()
+            _geracao_global += 1
+        else:
+            chave = (int(mes), int(ano))
+            _cache_meses.pop(chave, None)
+            _meses_em_andamento.pop(chave, None)
+            _geracoes[chave] = _geracoes.get(chave, 0) + 1
+
+
+def mes_em_cache_ou_andamento(mes, ano):
+    """
+    Indica se o mês já está no cache (válido) ou sendo buscado em segundo plano.
+    """
+    chave = (int(mes), int(ano))
+    with _lock:
+        item = _cache_meses.get(chave)
+        if item is not None and time.monotonic() - item[0] <= TTL_CACHE_SEGUNDOS:
+            return True
+        futuro = _meses_em_andamento.get(chave)
+        return futuro is not None and not futuro.done()
+
+
+def registrar_mes_em_andamento(mes, ano, futuro):
+    """
+    Registra a busca em segundo plano de um mês, removendo-a ao terminar.
+    """
+    chave = (int(mes), int(ano))
+    with _lock:
+        _meses_em_andamento[chave] = futuro
+
+    def _remover(_):
+        with _lock:
+            if _meses_em_andamento.get(chave) is futuro:
+                del _meses_em_andamento[chave]
+
+    futuro.add_done_callback(_remover)
+
+
+def obter_mes_em_andamento(mes, ano):
+    """
+    Retorna o Future da busca em segundo plano do mês, se houver uma em curso.
+    """
+    with _lock:
+        return _meses_em_andamento.get((int(mes), int(ano)))
@@ -2,18 +2,29 @@
 # 📦 IMPORTAÇÕES (em ordem alfabética)
 # ====================================
 
-import streamlit as st
+import os
 
 
 # ========================
 # 🔗 CONFIGURAÇÃO SUPABASE
 # ========================
 
-# Esses valores são lidos de .streamlit/secrets.toml no ambiente local
-# ou de variáveis de ambiente no Streamlit Cloud
+# Os valores são lidos primeiro de variáveis de ambiente (ex: linha de comando,
+# `python -m relatorio`) e, na falta delas, de st.secrets
+# (.streamlit/secrets.toml no ambiente local ou segredos do Streamlit Cloud).
+# O Streamlit só é importado quando precisa ser consultado.
 
-SUPABASE_URL = st.secrets["SUPABASE_URL"]
-SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
+def _ler_configuracao(chave):
+    valor = os.environ.get(chave)
+    if valor:
+        return valor
+
+    import streamlit as st
+    return st.secrets[chave]
+
+
+SUPABASE_URL = _ler_configuracao("SUPABASE_URL")
+SUPABASE_KEY = _ler_configuracao("SUPABASE_KEY")
 TABELA = "controle_contas"
 
 HEADERS = {
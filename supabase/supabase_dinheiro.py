@@ -0,0 +1,97 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+import numpy as np
+import pandas as pd
+
+
+# ==============================
+# 💵 VALORES EM CENTAVOS (int64)
+# ==============================
+
+# Coluna derivada, acrescentada aos DataFrames carregados do Supabase.
+# Não existe na tabela: é removida antes de qualquer escrita.
+COLUNA_CENTAVOS = "valor_centavos"
+
+
+def reais_para_centavos(valores):
+    """
+    Converte valores em reais (float, str ou None) para centavos inteiros.
+
+    O arredondamento acontece uma única vez, aqui; somas e divisões feitas
+    depois sobre os centavos são exatas.
+
+    Parâmetros:
+    - valores (pd.Series | array-like): Valores em reais.
+
+    Retorno:
+    - np.ndarray: Centavos em int64 (valores ausentes ou inválidos viram 0).
+    """
+    numeros = pd.to_numeric(pd.Series(valores), errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    return np.rint(numeros * 100).astype(np.int64)
+
+
+def centavos_para_reais(centavos):
+    """
+    Converte centavos inteiros (escalar, array ou Series) para reais em float.
+    Usada só na borda: gráficos, campos de formulário e textos.
+    """
+    return centavos / 100
+
+
+def adicionar_coluna_centavos(df):
+    """
+    Acrescenta `valor_centavos` (int64) ao DataFrame e normaliza `valor`
+    para o mesmo valor, já arredondado ao centavo.
+
+    Parâmetros:
+    - df (pd.DataFrame): Contas com a coluna 'valor' (como vem do JSON).
+
+    Retorno:
+    - pd.DataFrame: O próprio DataFrame, alterado no lugar.
+    """
+    if df.empty or "valor" not in df.columns:
+        return df
+
+    centavos = reais_para_centavos(df["valor"])
+    df[COLUNA_CENTAVOS] = centavos
+    df["valor"] = centavos_para_reais(centavos)
+    return df
+
+
+def centavos_do_df(df):
+    """
+    Retorna os centavos das contas, usando `valor_centavos` se já existir
+    ou convertendo `valor` caso contrário (ex: DataFrames montados à mão).
+
+    Retorno:
+    - np.ndarray: Centavos em int64, na ordem das linhas de `df`.
+    """
+    if COLUNA_CENTAVOS in df.columns:
+        return df[COLUNA_CENTAVOS].to_numpy(dtype=np.int64)
+    return reais_para_centavos(df["valor"] if "valor" in df.columns else np.zeros(len(df)))
+
+
+def somar_valores_por(df, coluna):
+    """
+    Soma os valores das contas agrupando por `coluna`, de forma exata em
+    centavos, e devolve o resultado em reais.
+
+    Parâmetros:
+    - df (pd.DataFrame): Contas com 'valor' e/ou 'valor_centavos'.
+    - coluna (str | list): Coluna(s) de agrupamento (ex: 'nome_da_conta').
+
+    Retorno:
+    - pd.Series: Totais em reais (float), indexados por `coluna`.
+    """
+    centavos = pd.Series(centavos_do_df(df), index=df.index, name="valor")
+    return centavos_para_reais(centavos.groupby([df[c] for c in np.atleast_1d(coluna)]).sum())
+
+
+def remover_colunas_derivadas(dados_dict):
+    """
+    Retorna uma cópia do dicionário da conta sem as colunas que não existem
+    na tabela (ex: `valor_centavos`), pronta para ser enviada ao Supabase.
+    """
+    return {chave: valor for chave, valor in dados_dict.items() if chave != COLUNA_CENTAVOS}
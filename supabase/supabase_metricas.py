@@ -0,0 +1,243 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+from contextvars import ContextVar
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlparse
+
+
+# ==============================
+# 📈 MÉTRICAS DAS REQUISIÇÕES
+# ==============================
+
+# Contadores em memória, compartilhados pelo processo, de tudo o que o pacote
+# pede ao Supabase: chamadas, erros, histograma de latência, bytes e linhas
+# recebidos por endpoint, além de acertos/faltas dos caches. Tudo é separado
+# pela tela do app que fez a chamada (`definir_tela`, no começo de cada rerun).
+# Leitura com `metricas()` (dicts) ou `metricas_prometheus()` (formato texto
+# do Prometheus).
+
+# Limites (em segundos) das faixas do histograma de latência
+LIMITES_LATENCIA = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+TELA_PADRAO = "sem_tela"
+
+_tela = ContextVar("tela_metricas", default=TELA_PADRAO)
+
+_requisicoes = {}  # (tela, metodo, endpoint) -> contadores (ver _novos_contadores)
+_caches = {}       # (tela, cache) -> {"acertos": int, "faltas": int}
+_lock = threading.Lock()
+
+
+def definir_tela(tela):
+    """Tela do app à qual as próximas chamadas deste contexto serão atribuídas (ex: 'mes_vigente')."""
+    _tela.set(str(tela or TELA_PADRAO))
+
+
+def tela_atual():
+    return _tela.get()
+
+
+def manter_tela(funcao):
+    """
+    Envolve `funcao` para rodar, em outra thread, atribuída à tela de quem a
+    agendou (ex: `_executor_prefetch.submit(manter_tela(_buscar_mes), mes, ano)`).
+    """
+    tela = _tela.get()
+
+    def _na_tela(*args, **kwargs):
+        _tela.set(tela)
+        return funcao(*args, **kwargs)
+
+    return _na_tela
+
+
+def chave_endpoint(url, params=None):
+    """Endpoint sem os valores dos filtros: tabela + nomes dos parâmetros (ex: 'controle_contas?id,select')."""
+    partes = urlparse(url)
+    nomes = {nome for nome, _ in parse_qsl(partes.query)} | set(params or {})
+    tabela = partes.path.rsplit("/", 1)[-1]
+    return f"{tabela}?{','.join(sorted(nomes))}" if nomes else tabela
+
+
+def _novos_contadores():
+    return {
+        "chamadas": 0,
+        "erros": 0,
+        "segundos": 0.0,
+        "histograma": [0] * (len(LIMITES_LATENCIA) + 1),  # última faixa: acima do maior limite
+        "bytes": 0,
+        "linhas": 0,
+    }
+
+
+# ==============================
+# ✍️ REGISTRO
+# ==============================
+
+def registrar_requisicao(metodo, endpoint, segundos, status=None, bytes_resposta=0, tela=None):
+    """
+    Registra uma requisição concluída. `status` None (exceção de rede,
+    timeout) ou >= 400 conta como erro.
+    """
+    faixa = next((i for i, limite in enumerate(LIMITES_LATENCIA) if segundos <= limite), len(LIMITES_LATENCIA))
+    with _lock:
+        contadores = _requisicoes.setdefault((tela or _tela.get(), metodo, endpoint), _novos_contadores())
+        contadores["chamadas"] += 1
+        contadores["erros"] += status is None or status >= 400
+        contadores["segundos"] += segundos
+        contadores["histograma"][faixa] += 1
+        contadores["bytes"] += bytes_resposta
+
+
+def registrar_linhas(metodo, endpoint, linhas):
+    """Soma as linhas decodificadas de uma resposta ao endpoint."""
+    with _lock:
+        _requisicoes.setdefault((_tela.get(), metodo, endpoint), _novos_contadores())["linhas"] += linhas
+
+
+def registrar_cache(cache, acerto, quantidade=1):
+    """Registra acertos (`acerto=True`) ou faltas de um cache ('meses', 'agregados')."""
+    with _lock:
+        contadores = _caches.setdefault((_tela.get(), cache), {"acertos": 0, "faltas": 0})
+        contadores["acertos" if acerto else "faltas"] += quantidade
+
+
+def medir(metodo, endpoint, funcao, *args, **kwargs):
+    """
+    Chama `funcao(*args, **kwargs)` (ex: `requests.post`) e registra a
+    requisição, inclusive quando ela levanta exceção.
+    """
+    inicio = time.perf_counter()
+    status, tamanho = None, 0
+    try:
+        response = funcao(*args, **kwargs)
+        status, tamanho = response.status_code, len(response.content or b"")
+        return response
+    finally:
+        registrar_requisicao(metodo, endpoint, time.perf_counter() - inicio, status, tamanho)
+
+
+def zerar_metricas():
+    """Descarta todas as métricas acumuladas."""
+    with _lock:
+        _requisicoes.clear()
+        _caches.clear()
+
+
+# ==============================
+# 📤 LEITURA
+# ==============================
+
+def metricas():
+    """
+    Cópia das métricas acumuladas.
+
+    Retorno:
+    - dict: {"requisicoes": [...], "caches": [...]}. Cada requisição traz tela,
+      metodo, endpoint, chamadas, erros, segundos, media_ms, bytes, linhas e
+      histograma ({"0.05": n, ..., "+Inf": n}, não acumulado); cada cache traz
+      tela, cache, acertos e faltas. Cabe direto em `pd.DataFrame(...)`.
+    """
+    with _lock:
+        requisicoes = [
+            {
+                "tela": tela,
+                "metodo": metodo,
+                "endpoint": endpoint,
+                "chamadas": c["chamadas"],
+                "erros": c["erros"],
+                "segundos": c["segundos"],
+                "media_ms": 1000 * c["segundos"] / c["chamadas"] if c["chamadas"] else 0.0,
+                "bytes": c["bytes"],
+                "linhas": c["linhas"],
+                "histograma": dict(zip([str(limite) for limite in LIMITES_LATENCIA] + ["+Inf"], c["histograma"])),
+            }
+            for (tela, metodo, endpoint), c in sorted(_requisicoes.items())
+        ]
+        caches = [
+            {"tela": tela, "cache": cache, **contadores}
+            for (tela, cache), contadores in sorted(_caches.items())
+        ]
+    return {"requisicoes": requisicoes, "caches": caches}
+
+
+def _rotulos(**rotulos):
+    def _escapar(valor):
+        return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos.items()) + "}"
+
+
+def metricas_prometheus():
+    """
+    Métricas no formato texto do Prometheus (ex: para o textfile collector do
+    node_exporter ou para depuração).
+
+    Retorno:
+    - str: Histograma `supabase_requisicao_segundos` e contadores de chamadas,
+      erros, bytes, linhas e caches, rotulados por tela, método e endpoint.
+    """
+    dados = metricas()
+    linhas = [
+        "# HELP supabase_requisicao_segundos Latência das requisições ao Supabase.",
+        "# TYPE supabase_requisicao_segundos histogram",
+    ]
+    for item in dados["requisicoes"]:
+        rotulos = {"tela": item["tela"], "metodo": item["metodo"], "endpoint": item["endpoint"]}
+        acumulado = 0
+        for limite, quantidade in item["histograma"].items():
+            acumulado += quantidade
+            linhas.append(f"supabase_requisicao_segundos_bucket{_rotulos(**rotulos, le=limite)} {acumulado}")
+        linhas.append(f"supabase_requisicao_segundos_sum{_rotulos(**rotulos)} {item['segundos']:.6f}")
+        linhas.append(f"supabase_requisicao_segundos_count{_rotulos(**rotulos)} {item['chamadas']}")
+
+    contadores = [
+        ("supabase_requisicoes_total", "Requisições ao Supabase.", "chamadas"),
+        ("supabase_requisicoes_erros_total", "Requisições com erro (status >= 400, rede ou timeout).", "erros"),
+        ("supabase_resposta_bytes_total", "Bytes recebidos nas respostas.", "bytes"),
+        ("supabase_linhas_total", "Linhas decodificadas das respostas.", "linhas"),
+    ]
+    for nome, descricao, campo in contadores:
+        linhas += [f"# HELP {nome} {descricao}", f"# TYPE {nome} counter"]
+        for item in dados["requisicoes"]:
+            rotulos = _rotulos(tela=item["tela"], metodo=item["metodo"], endpoint=item["endpoint"])
+            linhas.append(f"{nome}{rotulos} {item[campo]}")
+
+    linhas += [
+        "# HELP supabase_cache_total Consultas aos caches de meses e agregados.",
+        "# TYPE supabase_cache_total counter",
+    ]
+    for item in dados["caches"]:
+        for resultado, campo in (("acerto", "acertos"), ("falta", "faltas")):
+            rotulos = _rotulos(tela=item["tela"], cache=item["cache"], resultado=resultado)
+            linhas.append(f"supabase_cache_total{rotulos} {item[campo]}")
+
+    return "\n".join(linhas) + "\n"
+
+
+def gravar_metricas_prometheus(arquivo=None):
+    """
+    Grava `metricas_prometheus()` em `arquivo` (padrão: variável de ambiente
+    SUPABASE_METRICAS_PROMETHEUS). Sem arquivo definido, não faz nada.
+
+    A escrita é atômica (arquivo temporário + os.replace), como pede o textfile collector.
+
+    Retorno:
+    - bool: True se o arquivo foi gravado.
+    """
+    arquivo = arquivo or os.environ.get("SUPABASE_METRICAS_PROMETHEUS")
+    if not arquivo:
+        return False
+    temporario = f"{arquivo}.tmp"
+    try:
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(metricas_prometheus())
+        os.replace(temporario, arquivo)
+    except OSError as e:
+        print(f"Erro ao gravar as métricas em {arquivo}: {e}")
+        return False
+    return True
@@ -0,0 +1,213 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
+import requests
+
+from .supabase_metricas import chave_endpoint, registrar_requisicao, tela_atual
+
+
+# ==============================
+# ⏱️ PRAZO DAS REQUISIÇÕES
+# ==============================
+
+# Cada rerun do Streamlit tem um orçamento de tempo (`iniciar_prazo()` no começo
+# do script). Toda requisição ao Supabase usa como timeout o que resta desse
+# orçamento; quando ele acaba, a chamada levanta `PrazoEsgotado` em vez de
+# segurar a tela, e os carregadores devolvem a última versão em cache (mesmo
+# expirada), se houver. Fora de um prazo (linha de comando, prefetch em segundo
+# plano), vale TIMEOUT_PADRAO por requisição.
+
+PRAZO_RERUN_SEGUNDOS = 15
+# Exportações (resumo do período, planilha) leem vários blocos de meses: têm um
+# prazo próprio, maior, e não geram arquivo se ele acabar (ver app.py)
+PRAZO_EXPORTACAO_SEGUNDOS = 120
+TIMEOUT_CONEXAO = 3.05
+TIMEOUT_PADRAO = (TIMEOUT_CONEXAO, 30)  # (conexão, leitura)
+
+# Prazo em vigor no contexto atual: {"limite": instante (monotonic), "esgotados": [PrazoEsgotado, ...]}
+_prazo_atual = ContextVar("prazo_supabase", default=None)
+
+
+class PrazoEsgotado(requests.Timeout):
+    """
+    Requisição interrompida porque o prazo do rerun acabou.
+
+    É um `requests.Timeout`, então os tratamentos de erro existentes continuam
+    valendo; as ocorrências do prazo atual ficam em `prazos_esgotados()` para a
+    interface avisar que os dados podem estar desatualizados.
+    """
+
+    def __init__(self, descricao):
+        super().__init__(f"Prazo esgotado: {descricao}")
+        self.descricao = descricao
+
+
+def iniciar_prazo(segundos=PRAZO_RERUN_SEGUNDOS):
+    """
+    Inicia o orçamento de tempo das requisições do contexto atual
+    (no app, uma vez no começo de cada rerun).
+
+    Retorno:
+    - dict: Estado do prazo (ver `usar_prazo`).
+    """
+    estado = {"limite": time.monotonic() + segundos, "esgotados": []}
+    _prazo_atual.set(estado)
+    return estado
+
+
+@contextmanager
+def prazo(segundos=PRAZO_RERUN_SEGUNDOS):
+    """Orçamento de tempo só para um bloco: `with prazo(5): carregar_tabela(4, 2025)`."""
+    token = _prazo_atual.set({"limite": time.monotonic() + segundos, "esgotados": []})
+    try:
+        yield _prazo_atual.get()
+    finally:
+        _prazo_atual.reset(token)
+
+
+def estado_prazo():
+    """Estado do prazo em vigor (None se não houver), para repassar a outra thread."""
+    return _prazo_atual.get()
+
+
+def usar_prazo(estado):
+    """Adota em outra thread ou event loop o prazo capturado com `estado_prazo()`."""
+    _prazo_atual.set(estado)
+
+
+def tempo_restante():
+    """Segundos que restam do prazo atual (None se não houver prazo)."""
+    estado = _prazo_atual.get()
+    if estado is None:
+        return None
+    return estado["limite"] - time.monotonic()
+
+
+def prazo_esgotado(descricao):
+    """Cria e registra no prazo atual um `PrazoEsgotado` (para ser levantado por quem chama)."""
+    erro = PrazoEsgotado(descricao)
+    estado = _prazo_atual.get()
+    if estado is not None:
+        estado["esgotados"].append(erro)
+    print(f"⏱️ {erro}")
+    return erro
+
+
+def prazos_esgotados():
+    """Requisições interrompidas pelo prazo atual (lista vazia se nenhuma)."""
+    estado = _prazo_atual.get()
+    return list(estado["esgotados"]) if estado is not None else []
+
+
+def timeout_requisicao(descricao="requisição"):
+    """
+    Timeout (conexão, leitura) de uma requisição, limitado ao que resta do prazo.
+
+    Erros:
+    - PrazoEsgotado: Se o prazo já acabou.
+    """
+    restante = tempo_restante()
+    if restante is None:
+        return TIMEOUT_PADRAO
+    if restante <= 0:
+        raise prazo_esgotado(descricao)
+    return (min(TIMEOUT_CONEXAO, restante), restante)
+
+
+# ==============================
+# 🪞 LEITURAS COM HEDGE
+# ==============================
+
+# Uma leitura que passa do p95 de latência do seu endpoint provavelmente
+# pegou uma conexão ou réplica lenta: uma cópia da mesma requisição é
+# disparada e vale a primeira que responder. Só para GET (sem efeito colateral).
+
+AMOSTRAS_LATENCIA = 100       # últimas latências guardadas por endpoint
+AMOSTRAS_MINIMAS_HEDGE = 20   # sem histórico suficiente, não há hedge
+
+_latencias = {}  # endpoint -> deque de segundos
+_lock = threading.Lock()
+_executor_hedge = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge_supabase")
+
+
+def _registrar_latencia(endpoint, segundos):
+    with _lock:
+        _latencias.setdefault(endpoint, deque(maxlen=AMOSTRAS_LATENCIA)).append(segundos)
+
+
+def latencia_p95(endpoint):
+    """p95 das latências recentes do endpoint, ou None sem amostras suficientes."""
+    with _lock:
+        amostras = sorted(_latencias.get(endpoint, ()))
+    if len(amostras) < AMOSTRAS_MINIMAS_HEDGE:
+        return None
+    return amostras[int(0.95 * (len(amostras) - 1))]
+
+
+def _get(url, headers, params, timeout, endpoint, tela):
+    inicio = time.monotonic()
+    status, tamanho = None, 0
+    try:
+        response = requests.get(url, headers=headers, params=params, timeout=timeout)
+        status, tamanho = response.status_code, len(response.content or b"")
+    finally:
+        # Também no hedge, que roda em outra thread: a tela vem de quem chamou
+        registrar_requisicao("GET", endpoint, time.monotonic() - inicio, status, tamanho, tela=tela)
+    _registrar_latencia(endpoint, time.monotonic() - inicio)
+    return response
+
+
+def get_com_prazo(url, headers=None, params=None):
+    """
+    GET dentro do prazo atual, com hedge se passar do p95 do endpoint.
+
+    Retorno:
+    - requests.Response: A primeira resposta que chegar.
+
+    Erros:
+    - PrazoEsgotado: Se o prazo acabar antes de alguma resposta.
+    - requests.RequestException: Outras falhas de rede.
+    """
+    endpoint = chave_endpoint(url, params)
+    timeout = timeout_requisicao(endpoint)
+    limite_hedge = latencia_p95(endpoint)
+    tela = tela_atual()
+
+    try:
+        if limite_hedge is None or limite_hedge >= timeout[1]:
+            return _get(url, headers, params, timeout, endpoint, tela)
+
+        principal = _executor_hedge.submit(_get, url, headers, params, timeout, endpoint, tela)
+        prontas, _ = wait([principal], timeout=limite_hedge)
+        if prontas:
+            return principal.result()
+
+        print(f"🪞 Hedge: {endpoint} passou do p95 ({limite_hedge * 1000:.0f} ms)")
+        copia = _executor_hedge.submit(_get, url, headers, params, timeout_requisicao(endpoint), endpoint, tela)
+        pendentes, erro = {principal, copia}, None
+        while pendentes:
+            restante = tempo_restante()
+            prontas, pendentes = wait(
+                pendentes, timeout=timeout[1] if restante is None else max(restante, 0), return_when=FIRST_COMPLETED,
+            )
+            if not prontas:
+                raise prazo_esgotado(endpoint)
+            for futuro in prontas:
+                if futuro.exception() is None:
+                    return futuro.result()
+                erro = futuro.exception()
+        raise erro
+    except PrazoEsgotado:
+        raise
+    except requests.Timeout as e:
+        if tempo_restante() is None:
+            raise
+        raise prazo_esgotado(endpoint) from e
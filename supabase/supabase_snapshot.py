@@ -0,0 +1,262 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+import pyarrow.parquet as pq
+import requests
+
+from .supabase_config import HEADERS, SUPABASE_URL, TABELA
+from .supabase_dinheiro import COLUNA_CENTAVOS, reais_para_centavos
+from .supabase_prazo import get_com_prazo
+from .supabase_utils import _carregar_todas_paginas, _params_intervalo
+
+
+# ==============================
+# 🗄️ SNAPSHOT EM PARQUET
+# ==============================
+
+# Cópia local da tabela inteira em arquivos Parquet particionados por ano e mês
+# (<pasta>/ano=2025/mes=4/contas-0.parquet), para análises sem passar pela API.
+# As leituras usam o Arrow com memory-map e só abrem as partições do período pedido.
+
+PASTA_SNAPSHOT = "snapshot"
+
+# Meses buscados por requisição ao exportar
+MESES_POR_BLOCO_SNAPSHOT = 12
+
+ESQUEMA_PARTICOES = pa.schema([("ano", pa.int16()), ("mes", pa.int8())])
+
+ESQUEMA_SNAPSHOT = pa.schema([
+    ("id", pa.int64()),
+    ("nome_da_conta", pa.string()),
+    ("valor", pa.float64()),
+    (COLUNA_CENTAVOS, pa.int64()),
+    ("data_de_pagamento", pa.date32()),
+    ("instancia", pa.string()),
+    ("quem_pagou", pa.string()),
+    ("dividida", pa.bool_()),
+    ("link_boleto", pa.string()),
+    ("link_comprovante", pa.string()),
+]).append(ESQUEMA_PARTICOES.field("ano")).append(ESQUEMA_PARTICOES.field("mes"))
+
+
+def _tabela_arrow(df):
+    """Converte as contas (como vêm do Supabase) para uma tabela com ESQUEMA_SNAPSHOT."""
+    colunas = {}
+    for campo in ESQUEMA_SNAPSHOT:
+        if campo.name == COLUNA_CENTAVOS:
+            valores = reais_para_centavos(df["valor"] if "valor" in df.columns else [None] * len(df))
+        elif campo.name not in df.columns:
+            valores = [None] * len(df)
+        elif campo.name == "data_de_pagamento":
+            valores = pd.to_datetime(df[campo.name], errors="coerce").dt.date
+        elif campo.name == "dividida":
+            # Mesmo critério dos relatórios: vazio conta como False
+            valores = df[campo.name] == True
+        elif pa.types.is_string(campo.type):
+            valores = df[campo.name].astype(object).where(df[campo.name].notna(), None)
+        else:
+            valores = df[campo.name]
+        colunas[campo.name] = pa.array(valores, type=campo.type, from_pandas=True)
+    return pa.table(colunas, schema=ESQUEMA_SNAPSHOT)
+
+
+def _mes_extremo(ordem):
+    """Primeiro (ordem='asc') ou último (ordem='desc') (mes, ano) da tabela; () se vazia, None em caso de erro."""
+    url = f"{SUPABASE_URL}/rest/v1/{TABELA}"
+    params = {"select": "ano,mes", "order": f"ano.{ordem},mes.{ordem}", "limit": 1}
+    try:
+        response = get_com_prazo(url, HEADERS, params)
+    except requests.RequestException as e:
+        print(f"Erro ao consultar os meses da tabela: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"Erro ao consultar os meses da tabela: {response.status_code} | {response.text}")
+        return None
+    dados = response.json()
+    return (int(dados[0]["mes"]), int(dados[0]["ano"])) if dados else ()
+
+
+def meses_no_snapshot(pasta=PASTA_SNAPSHOT):
+    """
+    Lista os meses presentes no snapshot, lendo só os nomes das partições.
+
+    Retorno:
+    - list: Pares (mes, ano) em ordem cronológica (vazia se o snapshot não existir).
+    """
+    meses = []
+    if not os.path.isdir(pasta):
+        return meses
+    for nome_ano in os.listdir(pasta):
+        if not nome_ano.startswith("ano="):
+            continue
+        for nome_mes in os.listdir(os.path.join(pasta, nome_ano)):
+            if nome_mes.startswith("mes="):
+                meses.append((int(nome_mes[4:]), int(nome_ano[4:])))
+    return sorted(meses, key=lambda par: (par[1], par[0]))
+
+
+# ==============================
+# 📤 EXPORTAÇÃO
+# ==============================
+
+def exportar_snapshot(pasta=PASTA_SNAPSHOT, completo=False):
+    """
+    Grava (ou atualiza) o snapshot em Parquet da tabela de contas.
+
+    No modo incremental (padrão), só são buscados o último mês já presente no
+    snapshot (que pode ter recebido contas depois da última exportação) e os
+    meses seguintes; as partições desses meses são regravadas e as demais
+    ficam como estão. Com `completo=True`, a tabela inteira é exportada.
+
+    Se alguma leitura falhar (erro HTTP, rede, prazo esgotado), a exportação é
+    interrompida sem remover nenhuma partição: um mês só sai do snapshot quando
+    uma leitura bem-sucedida confirma que ele ficou sem contas. Os blocos já
+    gravados continuam válidos; basta repetir o comando.
+
+    Parâmetros:
+    - pasta (str): Pasta do snapshot (criada se não existir).
+    - completo (bool): Regrava todos os meses.
+
+    Retorno:
+    - list | None: Pares (mes, ano) gravados (vazia se não houver nada a exportar)
+      ou None em caso de erro.
+    """
+    ultimo = _mes_extremo("desc")
+    if not ultimo:
+        return ultimo if ultimo is None else []
+
+    existentes = [] if completo else meses_no_snapshot(pasta)
+    inicio = existentes[-1] if existentes else _mes_extremo("asc")
+    if not inicio:
+        return inicio if inicio is None else []
+
+    # Meses do intervalo, em blocos de MESES_POR_BLOCO_SNAPSHOT por requisição
+    meses = []
+    mes, ano = inicio
+    while (ano, mes) <= (ultimo[1], ultimo[0]):
+        meses.append((mes, ano))
+        mes, ano = (1, ano + 1) if mes == 12 else (mes + 1, ano)
+
+    gravados = []
+    os.makedirs(pasta, exist_ok=True)
+    for posicao in range(0, len(meses), MESES_POR_BLOCO_SNAPSHOT):
+        bloco = meses[posicao:posicao + MESES_POR_BLOCO_SNAPSHOT]
+        df = _carregar_todas_paginas(_params_intervalo(*bloco[0], *bloco[-1]), f"meses {bloco[0]} a {bloco[-1]}")
+        if df is None:
+            print("Exportação interrompida: nenhuma partição deste bloco foi alterada.")
+            return None
+
+        # Meses do snapshot que ficaram sem contas (ex: excluídas) são removidos
+        presentes = set() if df.empty else {(int(m), int(a)) for m, a in zip(df["mes"], df["ano"])}
+        for mes, ano in set(bloco) - presentes:
+            shutil.rmtree(os.path.join(pasta, f"ano={ano}", f"mes={mes}"), ignore_errors=True)
+        if df.empty:
+            continue
+
+        # Só as partições presentes no bloco são substituídas
+        pq.write_to_dataset(
+            _tabela_arrow(df),
+            root_path=pasta,
+            partitioning=ds.partitioning(ESQUEMA_PARTICOES, flavor="hive"),
+            existing_data_behavior="delete_matching",
+            basename_template="contas-{i}.parquet",
+        )
+        gravados.extend(sorted(presentes, key=lambda par: (par[1], par[0])))
+
+    return gravados
+
+
+# ==============================
+# 📥 LEITURA
+# ==============================
+
+def _ler_snapshot(pasta, filtro, colunas="*"):
+    """
+    Lê as contas do snapshot que atendem a `filtro`, no mesmo formato dos
+    DataFrames carregados do Supabase (datas como 'AAAA-MM-DD', `valor_centavos`).
+    """
+    if not os.path.isdir(pasta):
+        print(f"Snapshot não encontrado em {pasta!r}.")
+        return pd.DataFrame()
+
+    dataset = ds.dataset(
+        pasta,
+        schema=ESQUEMA_SNAPSHOT,
+        format="parquet",
+        partitioning=ds.partitioning(ESQUEMA_PARTICOES, flavor="hive"),
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+    nomes = None
+    if colunas != "*":
+        nomes = [nome.strip() for nome in colunas.split(",")]
+        if "valor" in nomes and COLUNA_CENTAVOS not in nomes:
+            nomes.append(COLUNA_CENTAVOS)
+
+    df = dataset.to_table(columns=nomes, filter=filtro).to_pandas()
+    if df.empty:
+        return pd.DataFrame()
+
+    for coluna in ("ano", "mes"):
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype("int64")
+    if "data_de_pagamento" in df.columns:
+        df["data_de_pagamento"] = pd.to_datetime(df["data_de_pagamento"]).dt.strftime("%Y-%m-%d")
+    return df
+
+
+def carregar_snapshot_meses(meses, pasta=PASTA_SNAPSHOT):
+    """
+    Equivalente a `carregar_meses`, lido do snapshot.
+
+    Parâmetros:
+    - meses (iterable): Pares (mes, ano).
+    - pasta (str): Pasta do snapshot.
+
+    Retorno:
+    - pd.DataFrame: Contas dos meses pedidos (vazio se não houver).
+    """
+    filtro = None
+    for mes, ano in dict.fromkeys((int(m), int(a)) for m, a in meses):
+        condicao = (ds.field("ano") == ano) & (ds.field("mes") == mes)
+        filtro = condicao if filtro is None else filtro | condicao
+    if filtro is None:
+        return pd.DataFrame()
+    return _ler_snapshot(pasta, filtro)
+
+
+def carregar_snapshot_intervalo(
+    mes_inicio, ano_inicio, mes_fim, ano_fim, contas=None, colunas="*", pasta=PASTA_SNAPSHOT,
+):
+    """
+    Equivalente a `carregar_intervalo`, lido do snapshot.
+
+    Parâmetros:
+    - mes_inicio, ano_inicio (int): Início do intervalo (inclusive).
+    - mes_fim, ano_fim (int): Fim do intervalo (inclusive).
+    - contas (list, opcional): Nomes das contas; None traz todas.
+    - colunas (str): Colunas separadas por vírgula, como no `select` (ex: "ano,mes,nome_da_conta,valor").
+    - pasta (str): Pasta do snapshot.
+
+    Retorno:
+    - pd.DataFrame: Contas encontradas (vazio se não houver).
+    """
+    if (ano_inicio, mes_inicio) > (ano_fim, mes_fim):
+        mes_inicio, ano_inicio, mes_fim, ano_fim = mes_fim, ano_fim, mes_inicio, ano_inicio
+
+    ano, mes = ds.field("ano"), ds.field("mes")
+    filtro = (
+        ((ano > ano_inicio) | ((ano == ano_inicio) & (mes >= mes_inicio)))
+        & ((ano < ano_fim) | ((ano == ano_fim) & (mes <= mes_fim)))
+    )
+    if contas is not None:
+        filtro = filtro & ds.field("nome_da_conta").isin(list(contas))
+    return _ler_snapshot(pasta, filtro, colunas)
@@ -0,0 +1,109 @@
+# ====================================
+# 📦 IMPORTAÇÕES (em ordem alfabética)
+# ====================================
+
+from io import BytesIO
+import json
+import os
+
+import pandas as pd
+
+try:
+    import orjson  # opcional: decodifica JSON mais rápido que o módulo padrão
+except ImportError:
+    orjson = None
+
+
+# ==============================
+# 🚚 FORMATO DAS RESPOSTAS
+# ==============================
+
+# Como as páginas lidas em DataFrame (`carregar_paginado`) são pedidas ao PostgREST:
+# - "json": resposta JSON padrão (decodificada com orjson, se instalado)
+# - "csv": `Accept: text/csv`, lida com `pd.read_csv` já com os tipos das colunas —
+#   menos bytes e sem montar um dict por linha (ver `python -m supabase benchmark`)
+# Pode ser trocado pela variável de ambiente SUPABASE_FORMATO.
+FORMATOS = ("json", "csv")
+FORMATO_TRANSPORTE = os.environ.get("SUPABASE_FORMATO", "json").lower()
+if FORMATO_TRANSPORTE not in FORMATOS:
+    FORMATO_TRANSPORTE = "json"
+
+# Tipos das colunas da tabela na leitura em CSV. Os textos ficam como objeto
+# (vazio em vez de None) e as datas como 'AAAA-MM-DD', como no JSON.
+TIPOS_CSV = {
+    "id": "int64",
+    "mes": "int64",
+    "ano": "int64",
+    "valor": "float64",
+    "nome_da_conta": object,
+    "data_de_pagamento": object,
+    "instancia": object,
+    "quem_pagou": object,
+    "link_boleto": object,
+    "link_comprovante": object,
+}
+# Colunas em que o campo vazio do CSV significa NULL
+VAZIO_E_NULO = {"valor": [""], "dividida": [""]}
+
+
+def cabecalhos_formato(headers, formato):
+    """Cabeçalhos da requisição para o formato pedido (acrescenta `Accept: text/csv`)."""
+    return {**headers, "Accept": "text/csv"} if formato == "csv" else headers
+
+
+def decodificar_linhas(response):
+    """Corpo JSON da resposta como lista de dicts (com orjson, se disponível)."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def decodificar_dataframe(response, formato):
+    """
+    Corpo da resposta (JSON ou CSV) como DataFrame, no mesmo formato nos dois casos.
+
+    No CSV do PostgREST, booleanos vêm como 't'/'f' e NULL como campo vazio.
+    """
+    if formato != "csv":
+        return pd.DataFrame.from_records(decodificar_linhas(response))
+
+    if not response.content.strip():
+        return pd.DataFrame()
+    df = pd.read_csv(
+        BytesIO(response.content),
+        dtype=TIPOS_CSV,
+        true_values=["t", "true"],
+        false_values=["f", "false"],
+        keep_default_na=False,
+        na_values=VAZIO_E_NULO,
+    )
+    # 'dividida' NULL vem como NaN, que `astype(bool)` tomaria por True: None, como no JSON
+    if "dividida" in df.columns and df["dividida"].isna().any():
+        df["dividida"] = df["dividida"].astype(object).where(df["dividida"].notna(), None)
+    return df
+
+
+def diferencas_formatos(df_json, df_csv):
+    """
+    Colunas em que as mesmas linhas lidas em JSON e em CSV não ficaram iguais
+    (mesmos valores, tipos e NULLs). A única diferença aceita é a dos textos
+    NULL, que no CSV chegam como '' (ver TIPOS_CSV).
+
+    Retorno:
+    - list: Nomes das colunas diferentes (vazia se os formatos coincidem).
+    """
+    if list(df_json.columns) != list(df_csv.columns) or len(df_json) != len(df_csv):
+        return sorted(set(df_json.columns) ^ set(df_csv.columns)) or ["(linhas)"]
+
+    df_json = df_json.sort_values("id", ignore_index=True) if "id" in df_json.columns else df_json
+    df_csv = df_csv.sort_values("id", ignore_index=True) if "id" in df_csv.columns else df_csv
+    diferentes = []
+    for coluna in df_json.columns:
+        a, b = df_json[coluna], df_csv[coluna]
+        if TIPOS_CSV.get(coluna) is object:
+            a, b = a.where(a.notna(), ""), b
+        try:
+            pd.testing.assert_series_equal(a, b, check_names=False)
+        except AssertionError:
+            diferentes.append(coluna)
+    return diferentes
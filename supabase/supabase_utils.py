@@ -3,6 +3,7 @@
 # ====================================
 
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 import json
@@ -10,7 +11,162 @@ import json
 import pandas as pd
 import requests
 
+from .supabase_cache import (
+    geracao_mes,
+    guardar_mes_cache,
+    invalidar_cache_meses,
+    mes_em_cache_ou_andamento,
+    obter_mes_cache,
+    obter_mes_em_andamento,
+    registrar_mes_em_andamento,
+)
+from .supabase_agregados import (
+    aplicar_delta_agregados,
+    calcular_agregados,
+    descartar_agregados,
+    guardar_agregados_mes,
+    obter_agregados,
+)
+from .supabase_dinheiro import adicionar_coluna_centavos, remover_colunas_derivadas
 from .supabase_config import SUPABASE_URL, SUPABASE_KEY, TABELA, HEADERS
+from .supabase_metricas import chave_endpoint, manter_tela, medir, registrar_cache, registrar_linhas
+from .supabase_prazo import get_com_prazo, tempo_restante, timeout_requisicao
+from .supabase_transporte import (
+    FORMATO_TRANSPORTE,
+    cabecalhos_formato,
+    decodificar_dataframe,
+    decodificar_linhas,
+)
+
+# Pool compartilhado pelo processo para aquecer o cache de meses em segundo plano
+_executor_prefetch = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch_meses")
+
+# Último resultado bem-sucedido de consultas sem cache próprio (anos disponíveis,
+# nomes de contas), devolvido quando a consulta falha ou o prazo do rerun acaba
+_ultimos_resultados = {}
+
+# ==============================
+# 📑 LEITURA PAGINADA (KEYSET POR ID)
+# ==============================
+
+# O PostgREST corta silenciosamente qualquer resposta acima do `max-rows` do
+# projeto (1000 no Supabase). Toda leitura em massa passa por aqui: as linhas são
+# pedidas em páginas ordenadas por id, cada uma começando depois do último id da
+# anterior (`id=gt.<último>`), então nada é cortado e só uma página fica em memória.
+#
+# Uma página menor que o pedido não prova que a leitura terminou: pode ser o
+# `max-rows` cortando a página. Ela só encerra a leitura quando o servidor já
+# entregou uma página completa daquele tamanho (então o `max-rows` comporta o
+# pedido); até lá, a leitura segue até uma página vazia. Na prática, depois da
+# primeira leitura grande do processo um mês pequeno volta a custar uma requisição.
+
+LINHAS_POR_PAGINA = 1000
+
+# Maior `limit` já atendido por inteiro pelo servidor (ver `_leitura_terminou`)
+_maior_pagina_completa = 0
+
+
+def _leitura_terminou(tamanho, linhas_por_pagina):
+    """Indica se uma página com `tamanho` linhas (de `linhas_por_pagina` pedidas) encerra a leitura."""
+    global _maior_pagina_completa
+    if tamanho >= linhas_por_pagina:
+        _maior_pagina_completa = max(_maior_pagina_completa, linhas_por_pagina)
+        return False
+    return tamanho == 0 or linhas_por_pagina <= _maior_pagina_completa
+
+
+def _paginas(params, linhas_por_pagina, apos_id, decodificar, headers=HEADERS):
+    """Laço da paginação por id; `decodificar(response)` devolve a página (lista ou DataFrame)."""
+    params = dict(params or {})
+    colunas = params.get("select", "*")
+    if colunas != "*" and "id" not in colunas.split(","):
+        params["select"] = f"{colunas},id"
+    params.update({"order": "id.asc", "limit": linhas_por_pagina})
+
+    url = f"{SUPABASE_URL}/rest/v1/{TABELA}"
+    ultimo_id = apos_id
+    while True:
+        params_pagina = {**params, "id": f"gt.{ultimo_id}"}
+        response = get_com_prazo(url, headers, params_pagina)
+        if response.status_code != 200:
+            print(f"Erro ao carregar página após o id {ultimo_id}: {response.status_code} | {response.text}")
+            response.raise_for_status()
+
+        pagina = decodificar(response)
+        registrar_linhas("GET", chave_endpoint(url, params_pagina), len(pagina))
+        if len(pagina):
+            yield pagina
+        if _leitura_terminou(len(pagina), linhas_por_pagina):
+            return
+        ultimo_id = int(pagina["id"].iloc[-1]) if isinstance(pagina, pd.DataFrame) else pagina[-1]["id"]
+
+
+def iterar_paginas(params=None, linhas_por_pagina=LINHAS_POR_PAGINA, apos_id=0):
+    """
+    Percorre a tabela em páginas ordenadas por id, como vêm da API (JSON).
+
+    Parâmetros:
+    - params (dict, opcional): Filtros e `select` do PostgREST (ex: {"or": "(...)", "select": "*"}).
+      O `id` é acrescentado ao `select` se faltar (é a chave da paginação).
+    - linhas_por_pagina (int): Linhas por requisição. Acima do `max-rows` do
+      PostgREST nada se perde, mas cada página vem com só `max-rows` linhas.
+    - apos_id (int): Começa depois deste id (ex: para retomar uma leitura).
+
+    Retorno:
+    - generator: Uma lista de dicts por página.
+
+    Erros:
+    - requests.HTTPError: Se alguma página falhar (nada é devolvido pela metade em silêncio).
+    - PrazoEsgotado: Se o prazo do rerun acabar (ver `supabase_prazo`).
+    """
+    return _paginas(params, linhas_por_pagina, apos_id, decodificar_linhas)
+
+
+def carregar_paginado(params=None, linhas_por_pagina=LINHAS_POR_PAGINA, formato=None):
+    """
+    Versão de `iterar_paginas` que devolve cada página como DataFrame
+    (com `valor_centavos`, se `valor` estiver no select).
+
+    Parâmetros:
+    - params (dict, opcional): Filtros e `select` do PostgREST.
+    - linhas_por_pagina (int): Linhas por requisição.
+    - formato (str, opcional): "json" ou "csv" (padrão: FORMATO_TRANSPORTE).
+
+    Retorno:
+    - generator: Um pd.DataFrame por página, só com as colunas do `select`.
+
+    Erros:
+    - requests.HTTPError: Se alguma página falhar.
+    """
+    formato = formato or FORMATO_TRANSPORTE
+    colunas = (params or {}).get("select", "*")
+    sem_id = colunas != "*" and "id" not in colunas.split(",")
+    paginas = _paginas(
+        params, linhas_por_pagina, 0,
+        lambda response: decodificar_dataframe(response, formato),
+        headers=cabecalhos_formato(HEADERS, formato),
+    )
+    for df in paginas:
+        df = adicionar_coluna_centavos(df)
+        yield df.drop(columns="id") if sem_id else df
+
+
+def _carregar_todas_paginas(params, descricao):
+    """
+    Junta todas as páginas de `carregar_paginado` em um DataFrame.
+
+    Retorno:
+    - pd.DataFrame | None: Linhas encontradas (vazio se não houver) ou None em caso de erro.
+    """
+    try:
+        partes = list(carregar_paginado(params))
+    except requests.RequestException as e:
+        print(f"Erro ao carregar {descricao}: {e}")
+        return None
+    if not partes:
+        return pd.DataFrame()
+    return partes[0] if len(partes) == 1 else pd.concat(partes, ignore_index=True)
+
 
 # ==============================
 # 📥 CARREGAMENTO DE DADOS
@@ -27,14 +183,234 @@ def carregar_tabela(mes: int, ano: int):
     Retorno:
     - pd.DataFrame: DataFrame com os dados da tabela 'controle_contas' filtrados
     """
-    url = f"{SUPABASE_URL}/rest/v1/{TABELA}?mes=eq.{mes}&ano=eq.{ano}&select=*"
-    response = requests.get(url, headers=HEADERS)
+    df = obter_mes_cache(mes, ano)
+    if df is not None:
+        registrar_cache("meses", acerto=True)
+        return df
+
+    # Se o mês já está sendo buscado em segundo plano, aproveita a mesma requisição
+    # (esperando no máximo o que resta do prazo do rerun)
+    futuro = obter_mes_em_andamento(mes, ano)
+    if futuro is not None:
+        try:
+            df = futuro.result(timeout=tempo_restante())
+        except Exception:
+            df = None  # não terminou a tempo
+        if df is not None:
+            registrar_cache("meses", acerto=True)
+            return df.copy()
+        # falhou em segundo plano (None) ou não terminou → tenta novamente abaixo
+
+    registrar_cache("meses", acerto=False)
+    return _buscar_mes(mes, ano)
+
+
+def _buscar_mes(mes, ano, estrito=False):
+    """
+    Busca um mês diretamente no Supabase e guarda o resultado no cache.
+    Respostas com erro não são guardadas.
 
-    if response.status_code == 200:
-        return pd.DataFrame(response.json())
+    O DataFrame já sai com `valor_centavos` (int64) para somas exatas.
+
+    Parâmetros:
+    - estrito (bool): Se True, retorna None em caso de erro em vez da versão
+      desatualizada (usado pelo prefetch, para quem espera buscar de novo).
+    """
+    geracao = geracao_mes(mes, ano)
+    df = _carregar_todas_paginas({"mes": f"eq.{mes}", "ano": f"eq.{ano}", "select": "*"}, f"mês {mes}/{ano}")
+
+    if df is not None:
+        _guardar_mes(mes, ano, df, geracao)
+        return df
+    elif estrito:
+        return None
     else:
-        # Retorna DataFrame vazio em caso de erro
+        # Em caso de erro (ou prazo esgotado), a última versão em cache, mesmo expirada
+        return _mes_desatualizado(mes, ano)
+
+
+def _mes_desatualizado(mes, ano):
+    """Cópia do mês em cache mesmo após o TTL, ou DataFrame vazio se nunca foi carregado."""
+    df = obter_mes_cache(mes, ano, aceitar_expirado=True)
+    if df is None:
         return pd.DataFrame()
+    print(f"Usando o mês {mes}/{ano} do cache (desatualizado).")
+    return df
+
+
+def carregar_meses(meses, estrito=False):
+    """
+    Carrega vários meses de uma vez, com uma única requisição para os meses
+    que não estão no cache.
+
+    Meses já em cache (ou sendo buscados em segundo plano) são reaproveitados;
+    os demais são pedidos juntos com um filtro `or=(and(mes.eq.M,ano.eq.A),...)`
+    e guardados no cache mês a mês, inclusive os que vierem vazios.
+
+    Parâmetros:
+    - meses (iterable): Pares (mes, ano) desejados.
+    - estrito (bool): Se True, retorna None quando a requisição falhar, em vez
+      de completar com as versões desatualizadas do cache (para exportações
+      que não podem sair incompletas).
+
+    Retorno:
+    - pd.DataFrame | None: Contas de todos os meses pedidos, concatenadas
+      (vazio se não houver nenhuma); None em caso de erro com `estrito`.
+    """
+    partes = []
+    faltantes = []
+    for mes, ano in dict.fromkeys((int(m), int(a)) for m, a in meses):
+        df = obter_mes_cache(mes, ano)
+        futuro = obter_mes_em_andamento(mes, ano) if df is None else None
+        if futuro is not None:
+            try:
+                df = futuro.result(timeout=tempo_restante())
+            except Exception:
+                df = None  # não terminou a tempo
+            df = None if df is None else df.copy()  # None: falhou em segundo plano
+        if df is None:
+            faltantes.append((mes, ano))
+        else:
+            partes.append(df)
+    registrar_cache("meses", acerto=True, quantidade=len(partes))
+    registrar_cache("meses", acerto=False, quantidade=len(faltantes))
+
+    if faltantes:
+        filtro = ",".join(f"and(mes.eq.{mes},ano.eq.{ano})" for mes, ano in faltantes)
+        geracoes = {par: geracao_mes(*par) for par in faltantes}
+        df_novos = _carregar_todas_paginas({"or": f"({filtro})", "select": "*"}, f"meses {faltantes}")
+
+        if df_novos is not None:
+            grupos = {} if df_novos.empty else {
+                (int(mes), int(ano)): grupo.reset_index(drop=True)
+                for (mes, ano), grupo in df_novos.groupby(["mes", "ano"], sort=False)
+            }
+            for mes, ano in faltantes:
+                _guardar_mes(mes, ano, grupos.get((mes, ano), pd.DataFrame()), geracoes[(mes, ano)])
+            partes.append(df_novos)
+        elif estrito:
+            return None
+        else:
+            partes.extend(_mes_desatualizado(mes, ano) for mes, ano in faltantes)
+
+    partes = [df for df in partes if not df.empty]
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes, ignore_index=True)
+
+
+def carregar_intervalo(mes_inicio, ano_inicio, mes_fim, ano_fim, contas=None, colunas="*", estrito=False):
+    """
+    Carrega as contas de um intervalo de meses com uma única requisição,
+    opcionalmente só das contas informadas (`nome_da_conta=in.(...)`).
+
+    Não passa pelo cache de meses: é pensada para consultas pontuais de
+    poucas contas em períodos longos, pedindo só as colunas necessárias.
+
+    Parâmetros:
+    - mes_inicio, ano_inicio (int): Início do intervalo (inclusive).
+    - mes_fim, ano_fim (int): Fim do intervalo (inclusive).
+    - contas (list, opcional): Nomes das contas; None traz todas.
+    - colunas (str): Colunas do `select` (ex: "ano,mes,nome_da_conta,valor").
+    - estrito (bool): Se True, retorna None em caso de erro em vez de um
+      DataFrame vazio (para exportações que não podem sair incompletas).
+
+    Retorno:
+    - pd.DataFrame | None: Contas encontradas (com `valor_centavos` se `valor`
+      vier no select); em caso de erro, DataFrame vazio (ou None se `estrito`).
+    """
+    df = _carregar_todas_paginas(_params_intervalo(mes_inicio, ano_inicio, mes_fim, ano_fim, contas, colunas), "intervalo")
+    if df is None and not estrito:
+        return pd.DataFrame()
+    return df
+
+
+def _params_intervalo(mes_inicio, ano_inicio, mes_fim, ano_fim, contas=None, colunas="*"):
+    """Filtros do PostgREST de `carregar_intervalo` (ex: para o snapshot, que lê as páginas direto)."""
+    if (ano_inicio, mes_inicio) > (ano_fim, mes_fim):
+        mes_inicio, ano_inicio, mes_fim, ano_fim = mes_fim, ano_fim, mes_inicio, ano_inicio
+
+    params = {
+        "select": colunas,
+        # (ano, mes) >= início e (ano, mes) <= fim
+        "and": (
+            f"(or(ano.gt.{ano_inicio},and(ano.eq.{ano_inicio},mes.gte.{mes_inicio})),"
+            f"or(ano.lt.{ano_fim},and(ano.eq.{ano_fim},mes.lte.{mes_fim})))"
+        ),
+    }
+    if contas is not None:
+        # Aspas duplas protegem nomes com vírgula, ponto ou parênteses
+        nomes = ",".join('"' + str(nome).replace('"', '\\"') + '"' for nome in contas)
+        params["nome_da_conta"] = f"in.({nomes})"
+    return params
+
+
+def _guardar_mes(mes, ano, df, geracao=None):
+    """
+    Guarda o mês recém-carregado no cache e recalcula seus agregados, a menos
+    que o mês tenha sido invalidado (escrita) desde `geracao` — aí o resultado
+    está velho e os agregados mantidos pelos deltas valem mais.
+    """
+    if guardar_mes_cache(mes, ano, df, geracao):
+        guardar_agregados_mes(mes, ano, df, geracao)
+
+
+def carregar_agregados(meses):
+    """
+    Retorna os agregados mensais (somas em centavos e contagens por conta,
+    pagador e dividida) dos meses pedidos.
+
+    Meses já agregados são lidos da memória sem nenhuma requisição; os demais
+    são carregados juntos com `carregar_meses`, que guarda os agregados dos
+    meses lidos com sucesso. Meses que só puderam ser servidos da reserva
+    (erro ou prazo esgotado) entram no resultado sem serem guardados e são
+    pedidos de novo na próxima chamada.
+
+    Parâmetros:
+    - meses (iterable): Pares (mes, ano).
+
+    Retorno:
+    - pd.DataFrame: Colunas ['ano', 'mes', 'nome_da_conta', 'quem_pagou',
+      'dividida', 'valor_centavos', 'contagem'] — poucas linhas por mês.
+    """
+    meses = list(dict.fromkeys((int(m), int(a)) for m, a in meses))
+    df_agregados, faltantes = obter_agregados(meses)
+    registrar_cache("agregados", acerto=True, quantidade=len(meses) - len(faltantes))
+    registrar_cache("agregados", acerto=False, quantidade=len(faltantes))
+    if not faltantes:
+        return df_agregados
+
+    df_novos = carregar_meses(faltantes)
+
+    df_agregados, sem_agregados = obter_agregados(meses)
+    if sem_agregados and not df_novos.empty:
+        chaves = df_novos["ano"].astype("int64") * 100 + df_novos["mes"].astype("int64")
+        reserva = df_novos[chaves.isin([ano * 100 + mes for mes, ano in sem_agregados])]
+        df_agregados = pd.concat([df_agregados, calcular_agregados(reserva)], ignore_index=True)
+    return df_agregados
+
+
+# ==============================
+# 🔮 PREFETCH DE MESES
+# ==============================
+
+def prefetch_meses(meses):
+    """
+    Agenda, em segundo plano, o carregamento dos meses informados para o cache.
+
+    Meses já em cache ou com busca em andamento são ignorados. A função retorna
+    imediatamente; uma chamada posterior a `carregar_tabela` para esses meses
+    usa o cache (ou aguarda a busca já iniciada, sem repetir a requisição).
+
+    Parâmetros:
+    - meses (iterable): Pares (mes, ano) a serem aquecidos.
+    """
+    for mes, ano in meses:
+        if mes_em_cache_ou_andamento(mes, ano):
+            continue
+        # Em caso de erro o futuro resolve para None, e quem o aguarda busca de novo
+        futuro = _executor_prefetch.submit(manter_tela(_buscar_mes), mes, ano, estrito=True)
+        registrar_mes_em_andamento(mes, ano, futuro)
 
     
 # 📆 CARREGAR MÊS REFERENTE
@@ -78,9 +454,24 @@ def inserir_nova_conta(dados_dict):
     - bool: True se a inserção foi bem-sucedida (status 201), False caso contrário.
     """
     url = f"{SUPABASE_URL}/rest/v1/{TABELA}"
+    dados_dict = remover_colunas_derivadas(dados_dict)
     payload = json.dumps([dados_dict])  # Envia como lista com um dicionário dentro
-    response = requests.post(url, headers=HEADERS, data=payload)
-
+    headers = {**HEADERS, "Prefer": "return=representation"}  # devolve a linha inserida
+    try:
+        response = medir(
+            "POST", chave_endpoint(url), requests.post,
+            url, headers=headers, data=payload, timeout=timeout_requisicao("inserção"),
+        )
+    except requests.Timeout as e:
+        return _escrita_sem_resposta(e, dados_dict.get("mes"), dados_dict.get("ano"))
+    return _registrar_insercao(dados_dict, response)
+
+
+def _registrar_insercao(dados_dict, response):
+    """Atualiza cache e agregados após um POST; retorna True se a inserção deu certo."""
+    if response.status_code == 201:
+        invalidar_cache_meses(dados_dict.get("mes"), dados_dict.get("ano"))
+        _aplicar_deltas(_linhas_da_resposta(response), sinal=1, mes=dados_dict.get("mes"), ano=dados_dict.get("ano"))
     return response.status_code == 201
 
 
@@ -97,17 +488,43 @@ def editar_conta(id_conta, dados_dict):
     - dados_dict (dict): Dicionário com os novos valores dos campos.
 
     Retorno:
-    - bool: True se a atualização foi bem-sucedida (status 204), False caso contrário.
+    - bool: True se a atualização foi bem-sucedida (status 200/204), False caso contrário.
     """
     url = f"{SUPABASE_URL}/rest/v1/{TABELA}?id=eq.{id_conta}"
 
     # Remove o campo 'id' se estiver no dicionário (não pode ser alterado)
     dados_dict.pop("id", None)
+    dados_dict = remover_colunas_derivadas(dados_dict)
 
-    payload = json.dumps(dados_dict)
-    response = requests.patch(url, headers=HEADERS, data=payload)
+    # Versão anterior da conta, para retirar dos agregados
+    anterior = _buscar_conta_anterior(id_conta, dados_dict.get("mes"), dados_dict.get("ano"))
 
-    return response.status_code == 204
+    payload = json.dumps(dados_dict)
+    headers = {**HEADERS, "Prefer": "return=representation"}  # devolve a linha atualizada
+    try:
+        response = medir(
+            "PATCH", chave_endpoint(url), requests.patch,
+            url, headers=headers, data=payload, timeout=timeout_requisicao("edição"),
+        )
+    except requests.Timeout as e:
+        if anterior is not None:
+            invalidar_cache_meses(anterior.get("mes"), anterior.get("ano"))
+        return _escrita_sem_resposta(e, dados_dict.get("mes"), dados_dict.get("ano"))
+    return _registrar_edicao(dados_dict, anterior, response)
+
+
+def _registrar_edicao(dados_dict, anterior, response):
+    """Atualiza cache e agregados após um PATCH; retorna True se a edição deu certo."""
+    if response.status_code in [200, 204]:
+        invalidar_cache_meses(dados_dict.get("mes"), dados_dict.get("ano"))
+        if anterior is None:
+            # Não dá para saber de que mês a conta saiu: recalcula tudo no próximo carregamento
+            descartar_agregados()
+        else:
+            invalidar_cache_meses(anterior.get("mes"), anterior.get("ano"))
+            aplicar_delta_agregados(anterior, -1)
+            _aplicar_deltas(_linhas_da_resposta(response), sinal=1, mes=dados_dict.get("mes"), ano=dados_dict.get("ano"))
+    return response.status_code in [200, 204]
 
 
 # ==============================
@@ -134,13 +551,103 @@ def excluir_conta(id_conta):
         "Prefer": "return=representation"  # Importante para evitar erro de content-type
     }
 
-    response = requests.delete(url, headers=headers)
+    try:
+        response = medir(
+            "DELETE", chave_endpoint(url), requests.delete, url, headers=headers, timeout=timeout_requisicao("exclusão"),
+        )
+    except requests.Timeout as e:
+        return _escrita_sem_resposta(e)
 
     print(f"🔁 DELETE {url} | Status: {response.status_code} | Response: {response.text}")
-
+    return _registrar_exclusao(response)
+
+
+def _registrar_exclusao(response):
+    """Atualiza cache e agregados após um DELETE; retorna True se a exclusão deu certo."""
+    if response.status_code in [200, 204]:
+        # Com "return=representation" a API devolve as linhas removidas (com mes/ano)
+        try:
+            removidas = response.json()
+        except ValueError:
+            removidas = []
+        if removidas:
+            for linha in removidas:
+                invalidar_cache_meses(linha.get("mes"), linha.get("ano"))
+                aplicar_delta_agregados(linha, -1)
+        else:
+            invalidar_cache_meses()
+            descartar_agregados()
     return response.status_code in [200, 204]
 
 
+def _escrita_sem_resposta(erro, mes=None, ano=None):
+    """
+    Escrita que estourou o timeout: pode ter sido aplicada ou não no banco,
+    então o mês (ou, sem mês, tudo) sai do cache e dos agregados. Retorna False.
+    """
+    print(f"Escrita sem resposta do Supabase: {erro}")
+    invalidar_cache_meses(mes, ano)
+    descartar_agregados(mes, ano)
+    return False
+
+
+# ==============================
+# 🧮 DELTAS DOS AGREGADOS
+# ==============================
+
+def _linhas_da_resposta(response):
+    """Linhas devolvidas pela API com "return=representation" (lista vazia se não houver)."""
+    try:
+        linhas = response.json()
+    except ValueError:
+        return []
+    return linhas if isinstance(linhas, list) else [linhas]
+
+
+def _aplicar_deltas(linhas, sinal, mes=None, ano=None):
+    """
+    Aplica as linhas devolvidas pela API aos agregados. Sem linhas (ex: API
+    sem "return=representation"), descarta os agregados do mês afetado.
+    """
+    if not linhas:
+        descartar_agregados(mes, ano)
+        return
+    for linha in linhas:
+        aplicar_delta_agregados(linha, sinal)
+
+
+def _conta_anterior_em_cache(id_conta, mes=None, ano=None):
+    """Procura a conta no cache do mês (dict) ou retorna None."""
+    if mes is None or ano is None:
+        return None
+    df = obter_mes_cache(mes, ano)
+    if df is not None and not df.empty and "id" in df.columns:
+        encontradas = df[df["id"] == id_conta]
+        if not encontradas.empty:
+            return encontradas.iloc[0].to_dict()
+    return None
+
+
+def _buscar_conta_anterior(id_conta, mes=None, ano=None):
+    """
+    Retorna a conta como está hoje no banco (dict) antes de uma edição:
+    procura primeiro no cache do mês e, se não estiver lá, busca só essa linha.
+    """
+    anterior = _conta_anterior_em_cache(id_conta, mes, ano)
+    if anterior is not None:
+        return anterior
+
+    url = f"{SUPABASE_URL}/rest/v1/{TABELA}"
+    try:
+        response = get_com_prazo(url, HEADERS, {"id": f"eq.{id_conta}", "select": "*"})
+    except requests.RequestException as e:
+        print(f"Erro ao buscar a conta {id_conta}: {e}")
+        return None
+    if response.status_code == 200 and response.json():
+        return response.json()[0]
+    return None
+
+
 # ==============================
 # 💾 SALVAR CONTA (INSERIR OU EDITAR)
 # ==============================
@@ -173,6 +680,17 @@ def salvar_conta(dados_dict):
 # 📋 NOMES ÚNICOS DE CONTAS
 # ==============================
 
+def _nomes_da_pagina(pagina):
+    """Nomes de conta válidos de uma página (sem 'solar' e sem instância 'legado')."""
+    return {
+        item["nome_da_conta"].strip()
+        for item in pagina
+        if item.get("nome_da_conta")
+        and item["nome_da_conta"].strip().lower() != "solar"
+        and (item.get("instancia") or "").lower() != "legado"
+    }
+
+
 def get_nomes_conta_unicos():
     """
     Retorna uma lista ordenada com os nomes únicos da coluna 'nome_da_conta',
@@ -182,23 +700,19 @@ def get_nomes_conta_unicos():
 
     Retorno:
     - list: Lista de strings com nomes de contas únicas (sem repetições).
+      Em caso de erro, a última lista obtida (ou vazia).
     """
-    url = f"{SUPABASE_URL}/rest/v1/{TABELA}?select=nome_da_conta,instancia"
-    response = requests.get(url, headers=HEADERS)
-
-    if response.status_code == 200:
-        dados = response.json()
-
-        nomes = list({
-            item["nome_da_conta"].strip()
-            for item in dados
-            if item.get("nome_da_conta")
-            and item["nome_da_conta"].strip().lower() != "solar"
-            and item.get("instancia", "").lower() != "legado"
-        })
-        return sorted(nomes)
+    nomes = set()
+    try:
+        # Página a página: só os nomes distintos ficam em memória
+        for pagina in iterar_paginas({"select": "nome_da_conta,instancia"}):
+            nomes.update(_nomes_da_pagina(pagina))
+    except requests.RequestException as e:
+        print(f"Erro ao carregar nomes de contas: {e}")
+        return list(_ultimos_resultados.get("nomes_conta", []))
 
-    return []
+    _ultimos_resultados["nomes_conta"] = sorted(nomes)
+    return sorted(nomes)
 
 
 # ==============================
@@ -206,35 +720,44 @@ def get_nomes_conta_unicos():
 # ==============================
 
 
+def _anos_meses_a_partir_de(dados):
+    """Monta (anos, meses) a partir das linhas com o primeiro ano da tabela."""
+    anos_extraidos = [
+        int(item["ano"]) for item in dados
+        if "ano" in item and str(item["ano"]).isdigit()
+    ]
+
+    if not anos_extraidos:
+        return [], []
+
+    primeiro_ano = min(anos_extraidos)
+    ano_atual = datetime.now().year
+
+    anos = list(range(ano_atual, primeiro_ano - 1, -1))  # mais recente primeiro
+    meses = list(range(1, 13))
+
+    return anos, meses
+
+
 def get_anos_meses_disponiveis():
     """
     Retorna os anos de primeiro registro até o ano atual, e os meses de 1 a 12.
 
     Retorno:
-    - tuple: (lista de anos, lista de meses)
+    - tuple: (lista de anos, lista de meses). Em caso de erro, o último
+      resultado obtido (ou duas listas vazias) — nunca None.
     """
     try:
-        url = f"{SUPABASE_URL}/rest/v1/{TABELA}?select=ano&order=ano.asc&limit=10000"
-        response = requests.get(url, headers=HEADERS)
+        # Só o primeiro ano interessa: uma linha basta
+        url = f"{SUPABASE_URL}/rest/v1/{TABELA}"
+        response = get_com_prazo(url, HEADERS, {"select": "ano", "order": "ano.asc", "limit": 1})
 
         if response.status_code == 200:
-            dados = response.json()
-            anos_extraidos = [
-                int(item["ano"]) for item in dados
-                if "ano" in item and str(item["ano"]).isdigit()
-            ]
-
-            if not anos_extraidos:
-                return [], []
-
-            primeiro_ano = min(anos_extraidos)
-            ano_atual = datetime.now().year
-
-            anos = list(range(ano_atual, primeiro_ano - 1, -1))  # mais recente primeiro
-            meses = list(range(1, 13))
+            _ultimos_resultados["anos_meses"] = _anos_meses_a_partir_de(response.json())
+            return _ultimos_resultados["anos_meses"]
+        print(f"Erro ao montar intervalo de anos: {response.status_code} | {response.text}")
 
-            return anos, meses
+    except requests.RequestException as e:
+        print(f"Erro ao montar intervalo de anos: {e}")
 
-    except Exception as e:
-        print(f"Erro ao montar intervalo de anos baseados em today: {e}")
-        return [], []
\ No newline at end of file
+    return _ultimos_resultados.get("anos_meses", ([], []))
\ No newline at end of file